@@ -24,26 +24,32 @@ import argparse
 import random
 import os
 import sqlite3
+import sys
 
 import serebo_blackbox as bb
 import serebo_notary_api as notary
 
 
-def initialize(bbpath="serebo_blackbox\\blackbox.sdb"):
+def initialize(bbpath="serebo_blackbox\\blackbox.sdb", storage=1,
+               eventlog=None):
     """!
     Function to initialize SEREBO blackbox.
 
     Usage:
 
-        python serebo.py init --bbpath=<path to SEREBO black box>
+        python serebo.py init --bbpath=<path to SEREBO black box> --storage=<storage version> --eventlog=<event log mode>
 
     For example:
 
-        python serebo.py init --bbpath="serebo_blackbox\\blackbox.sdb"
+        python serebo.py init --bbpath="serebo_blackbox\\blackbox.sdb" --storage=2
+
+        python serebo.py init --bbpath="serebo_blackbox\\blackbox.sdb" --storage=1 --eventlog="lean"
 
     @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
+    @param storage Integer: Storage version of a new SEREBO black box - 1 (text) or 2 (compact). Default = 1.
+    @param eventlog String: Event log mode of a new SEREBO black box - "full" or "lean" (only IDs and event type are recorded for each event, and the full event log is reconstructed from data log and blockchain). Default = None ("lean" for storage version 2 and "full" for storage version 1).
     """
-    db = bb.connectDB(bbpath)
+    db = bb.connectDB(bbpath, storage=storage, eventlog=eventlog)
     try:
         sqlstmt = """insert into metadata (key, value) values ("serebo_blackbox_path", "%s");""" % (str(db.path))
         db.cur.execute(sqlstmt)
@@ -51,7 +57,9 @@ def initialize(bbpath="serebo_blackbox\\blackbox.sdb"):
     except sqlite3.IntegrityError: pass
     print("")
     rdat = {"SEREBO Black Box": db,
-            "Black Box Path": str(db.path)}
+            "Black Box Path": str(db.path),
+            "Storage Version": str(db.storage),
+            "Event Log Mode": str(db.eventlog)}
     return rdat
 
 def insertText(message, description="NA", 
@@ -83,25 +91,66 @@ def insertText(message, description="NA",
             "Data Hash": str(rdata["DataHash"])}
     return rdat
 
-def logFile(filepath, description="NA",
+def _hashCache(trust_cache, rehash, hash_cache, bbpath):
+    """!
+    Private function - opens the file hash cache (see serebo_blackbox.hashcache) if it is to be used (trust_cache or rehash is True, or hash_cache is given), at hash_cache or the default path for the SEREBO black box at bbpath.
+    """
+    if not (trust_cache or rehash or hash_cache):
+        return None
+    if hash_cache is None:
+        hash_cache = bb.hashcache.defaultCachePath(bbpath)
+    return bb.HashCache(hash_cache)
+
+def _hashCacheStats(cache):
+    """!
+    Private function - statistics of the file hash cache for display.
+    """
+    if cache is None:
+        return {}
+    stats = cache.stats()
+    return {"Hash Cache": stats["Path"],
+            "Hash Cache Hits": str(stats["Hits"]),
+            "Hash Cache Misses": str(stats["Misses"]),
+            "Hash Cache Bytes Skipped": str(stats["BytesSkipped"])}
+
+def logFile(filepath, description="NA", hash_backend=None,
+            trust_cache=False, rehash=False, hash_cache=None,
+            chunk_size=None, workers=None, append=False,
             bbpath="serebo_blackbox\\blackbox.sdb"):
     """!
     Function to log a file into SEREBO blackbox.
 
     Usage:
 
-        python serebo.py logfile --filepath=<path of file to log> --description=<explanatory description for this insertion> --bbpath=<path to SEREBO black box>
+        python serebo.py logfile --filepath=<path of file to log> --description=<explanatory description for this insertion> --hash-backend=<hash backend> --trust-cache --rehash --hash-cache=<path to file hash cache> --chunk-size=<chunk size> --workers=<number of hashing threads> --append --bbpath=<path to SEREBO black box>
 
     For example:
 
         python serebo.py logfile --filepath=doxygen_serebo  --description="Doxygen file for SEREBO" --bbpath="serebo_blackbox\\blackbox.sdb"
 
+        python serebo.py logfile --filepath=doxygen_serebo  --description="Doxygen file for SEREBO" --hash-backend="blake3" --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py logfile --filepath=doxygen_serebo  --description="Doxygen file for SEREBO" --trust-cache --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py logfile --filepath=instrument.raw  --description="Raw instrument data" --hash-backend="blake2b" --chunk-size="64M" --workers=8 --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py logfile --filepath=instrument.log  --description="Instrument log" --append --bbpath="serebo_blackbox\\blackbox.sdb"
+
     @param fileapth String: Path of file to log in SEREBO black box.
     @param description String: Explanation string for this entry event. Default = NA.
+    @param hash_backend String: Name of hash backend - serebo12 (12 hashes), blake2b, blake3 (requires blake3 package) or xxh3_128 (requires xxhash package; not cryptographic). The hash backend is recorded in the description and as the prefix of file hash. Default = None (serebo12).
+    @param trust_cache Boolean: Flag to use the file hash cache - the cached file hash is used if the file had not changed (same device, inode, size and modification time) since it was hashed. Default = False.
+    @param rehash Boolean: Flag to hash the file even if it is in the file hash cache, and to refresh the cache. Default = False.
+    @param hash_cache String: Path to file hash cache (implies trust_cache). Default = None (SEREBO black box path suffixed with "-hashcache").
+    @param chunk_size String: Chunk size for chunked hashing, in bytes or with K, M or G suffix (such as "64M") - the file is hashed in chunks (in parallel), the file hash is the Merkle root of chunk hashes, and the chunk hashes are kept in SEREBO black box so that verifyfile can locate the first changed chunk. The file hash cache is not used in chunked hashing. Default = None (not chunked).
+    @param workers Integer: Number of threads for chunked hashing. Default = None (Python default).
+    @param append Boolean: Flag for append mode (for files which only grow, such as instrument logs) - the file is hashed in chunks, and only the bytes appended since the file was last logged (and the last chunk logged then) are hashed. The new record is described as extending the previous record. Default = False.
     @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
     """
     db = bb.connectDB(bbpath)
-    rdata = bb.logFile(db, filepath, description)
+    cache = _hashCache(trust_cache, rehash, hash_cache, bbpath)
+    if chunk_size is not None: chunk_size = bb.chunks.parseSize(chunk_size)
+    rdata = bb.logFile(db, filepath, description, hash_backend, cache, rehash, chunk_size, workers, append)
     print("")
     print("File Logging Status ...")
     rdat = {"SEREBO Black Box": db,
@@ -110,6 +159,50 @@ def logFile(filepath, description="NA",
             "File Hash": str(rdata["Data"]),
             "Description": str(rdata["UserDescription"]),
             "Data Hash": str(rdata["DataHash"])}
+    if rdata["Extends"] is not None:
+        rdat["Extends Record ID"] = str(rdata["Extends"])
+    rdat.update(_hashCacheStats(cache))
+    return rdat
+
+def logStream(filepath=None, description="NA", hash_backend=None,
+              output=None, bbpath="serebo_blackbox\\blackbox.sdb"):
+    """!
+    Function to log the data from standard input or a named pipe into SEREBO blackbox - the data is hashed as it flows through (without being written to disk and read again), and can be written to an output file at the same time. If an output file is given, it is logged as a file (its file hash is the hash of the data), and can be searched or verified as a logged file.
+
+    Usage:
+
+        <command> | python serebo.py logstream --description=<explanatory description for this insertion> --hash-backend=<hash backend> --output=<path of output file> --bbpath=<path to SEREBO black box>
+
+        python serebo.py logstream --filepath=<path of named pipe> --description=<explanatory description for this insertion> --hash-backend=<hash backend> --output=<path of output file> --bbpath=<path to SEREBO black box>
+
+    For example:
+
+        instrument_reader | python serebo.py logstream --description="Instrument stream" --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py logstream --filepath=instrument.fifo --output=instrument.dat --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    @param filepath String: Path of named pipe (or file) to read from. Default = None (standard input; also for "-").
+    @param description String: Explanation string for this entry event. Default = NA.
+    @param hash_backend String: Name of hash backend (see logFile). Default = None (serebo12).
+    @param output String: Path of output file to write the data to. Default = None (data is not written).
+    @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
+    """
+    db = bb.connectDB(bbpath)
+    if filepath in (None, "-"):
+        rdata = bb.logStream(db, sys.stdin.buffer, description, hash_backend, output, "stdin")
+    else:
+        with open(filepath, "rb") as stream:
+            rdata = bb.logStream(db, stream, description, hash_backend, output, bb.absolutePath(filepath))
+    print("")
+    print("Stream Logging Status ...")
+    rdat = {"SEREBO Black Box": db,
+            "Black Box Path": str(db.path),
+            "Date Time Stamp": str(rdata["DateTimeStamp"]),
+            "Bytes": str(rdata["Bytes"]),
+            "Output File": str(rdata["OutputPath"]),
+            "Stream Hash": str(rdata["Data"]),
+            "Description": str(rdata["UserDescription"]),
+            "Data Hash": str(rdata["DataHash"])}
     return rdat
 
 def systemData():
@@ -210,24 +303,42 @@ def systemRecord(bbpath="serebo_blackbox\\blackbox.sdb"):
             "hash_blake2s": str(data["hash_blake2s"])}
     return rdat
 
-def fileHash(filepath):
+def fileHash(filepath, hash_backend=None, trust_cache=False, rehash=False,
+             hash_cache=None, chunk_size=None, workers=None,
+             bbpath="serebo_blackbox\\blackbox.sdb"):
     """!
     Function to generate and print out hash of a file.
 
     Usage:
 
-        python serebo.py fhash --filepath=<path of file to hash>
+        python serebo.py fhash --filepath=<path of file to hash> --hash-backend=<hash backend> --trust-cache --rehash --hash-cache=<path to file hash cache> --chunk-size=<chunk size> --workers=<number of hashing threads> --bbpath=<path to SEREBO black box>
 
     For example:
 
         python serebo.py fhash --filepath=doxygen_serebo
 
+        python serebo.py fhash --filepath=doxygen_serebo --hash-backend="blake2b"
+
+        python serebo.py fhash --filepath=doxygen_serebo --trust-cache --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py fhash --filepath=doxygen_serebo --hash-backend="blake2b" --chunk-size="16M"
+
     @param fileapth String: Path of file to process.
+    @param hash_backend String: Name of hash backend (see logFile). Default = None (serebo12).
+    @param trust_cache Boolean: Flag to use the file hash cache (see logFile). Default = False.
+    @param rehash Boolean: Flag to hash the file even if it is in the file hash cache, and to refresh the cache. Default = False.
+    @param hash_cache String: Path to file hash cache (implies trust_cache). Default = None (SEREBO black box path suffixed with "-hashcache").
+    @param chunk_size String: Chunk size for chunked hashing (see logFile). Default = None (not chunked).
+    @param workers Integer: Number of threads for chunked hashing. Default = None (Python default).
+    @param bbpath String: Path to SEREBO black box, which is only used to locate the default file hash cache. Default = "serebo_blackbox\\blackbox.sdb".
     """
-    fHash = bb.fileHash(filepath)
+    cache = _hashCache(trust_cache, rehash, hash_cache, bbpath)
+    if chunk_size is not None: chunk_size = bb.chunks.parseSize(chunk_size)
+    fHash = bb.fileHash(filepath, hash_backend, cache, rehash, chunk_size, workers)
     print("")
     rdat = {"File Path": str(filepath),
             "File Hash": str(fHash)}
+    rdat.update(_hashCacheStats(cache))
     return rdat
 
 def localCode(length, description=None, 
@@ -331,6 +442,34 @@ def selfSign(bbpath="serebo_blackbox\\blackbox.sdb"):
             "Random String": str(rstring)}
     return rdat
 
+def status(bbpath="serebo_blackbox\\blackbox.sdb"):
+    """!
+    Function to view the status of SEREBO Black Box - numbers of records and the latest block (tip) of blockchain, from the statistics table which is updated with every record inserted. Hence, this does not read data log or blockchain, and does not insert a record into SEREBO Black Box.
+
+    Usage:
+
+        python serebo.py status --bbpath=<path to SEREBO black box>
+
+    For example:
+
+        python serebo.py status --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
+    """
+    db = bb.connectDB(bbpath)
+    stats = db.stats()
+    return {"Black Box Path": str(bbpath),
+            "Storage Version": str(db.storage),
+            "Records in Data Log": stats["datalog"]["Records"],
+            "First Data Log ID": stats["datalog"]["FirstID"],
+            "Last Data Log ID": stats["datalog"]["LastID"],
+            "Last Data Log Date Time Stamp": stats["datalog"]["LastDateTimeStamp"],
+            "Blocks in Blockchain": stats["blockchain"]["Records"],
+            "Tip Block ID": stats["blockchain"]["LastID"],
+            "Tip Block Date Time Stamp": stats["blockchain"]["LastDateTimeStamp"],
+            "Tip Block Hash": stats["blockchain"]["LastHash"],
+            "Events in Event Log": stats["eventlog"]["Records"]}
+
 def viewSelfNotarizations(bbpath="serebo_blackbox\\blackbox.sdb"):
     """!
     Function to view all self notarizations for this SEREBO Black Box - This does not insert a record into SEREBO Black Box.
@@ -358,302 +497,692 @@ def viewSelfNotarizations(bbpath="serebo_blackbox\\blackbox.sdb"):
         rdat.append(tempD)
     return rdat
 
-def searchMessage(message, mode="like",
+## Display names of datalog fields in search results
+searchLabels = {"ID": "Record ID",
+                "dtstamp": "Date Time Stamp",
+                "hash": "Hash",
+                "data": "Message",
+                "description": "Description"}
+
+def _searchResults(bbpath, message, field, mode, since, until, after_id, limit, fields, count):
+    """!
+    Private function - searches datalog for searchMessage and searchDescription functions, and returns either the number of matching records (if count is True) or a generator of matching records (with only the given fields).
+    """
+    db = bb.connectDB(bbpath)
+    mode = str(mode)
+    if message is not None: message = str(message)
+    if count:
+        return {"Count": bb.searchDatalog(db, message, field, mode, since, until, after_id, limit, count=True)}
+    if fields is None: fields = "ID,dtstamp,data,description"
+    if isinstance(fields, str): fields = fields.split(",")
+    fields = [str(f).strip() for f in fields]
+    result = bb.streamDatalog(db, message, field, mode, since, until, after_id, limit, fields=fields)
+    return ({searchLabels[f]: str(row[i]) for (i, f) in enumerate(fields)} for row in result)
+
+def searchMessage(message, mode="like", since=None, until=None,
+                  after_id=None, limit=None, fields=None, count=False,
                   bbpath="serebo_blackbox\\blackbox.sdb"):
     """!
     Function to search SEREBO Black Box for a message - This does not insert a record into SEREBO Black Box.
 
     Usage: 
 
-        python serebo.py searchmsg --mode=<search mode> --message=<search message> --bbpath=<path to SEREBO black box>
+        python serebo.py searchmsg --mode=<search mode> --message=<search message> --since=<earliest time> --until=<latest time> --after-id=<last record ID displayed> --limit=<number of records> --fields=<fields to display> --count --bbpath=<path to SEREBO black box>
 
     For example:
 
-        python serebo.py searchmsg --mode="like" --message="Self%" --bbpath="serebo_blackbox\\blackbox.sdb"
+        python serebo.py searchmsg --mode="like" --message="Self%" --since="2026-10-18" --until="2026-10-19" --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py searchmsg --mode="like" --message="%NA%" --fields="ID,dtstamp" --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py searchmsg --mode="like" --message="%NA%" --count --bbpath="serebo_blackbox\\blackbox.sdb"
 
     @param message String: Case sensitive search message.
     @param mode String: Mode of search. Allowable modes are "like" and "exact". If mode is "like", wildcards such as "_" (matches any single character) and "%" (matches any number of characters). Default = "like".
+    @param since String: Earliest time (inclusive) of records to search - ISO 8601 date time (UTC if time zone is not given), SEREBO date time stamp, or seconds since epoch. Default = None.
+    @param until String: Latest time (exclusive) of records to search. Default = None.
+    @param after_id Integer: Search only records with ID larger than after_id (use the last Record ID displayed to get the next page of results). Default = None.
+    @param limit Integer: Maximum number of records to display. Default = None (no limit).
+    @param fields String: Comma-separated datalog fields to display - ID, dtstamp, hash, data (Message) and description. Only these fields are read from SEREBO Black Box. Default = None (ID, dtstamp, data and description).
+    @param count Boolean: Flag to display only the number of matching records. Default = False.
     @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
     """
-    db = bb.connectDB(bbpath)
-    mode = str(mode)
-    message = str(message)
-    result = bb.searchDatalog(db, message, "data", mode)
-    rdat = []
-    for row in result:
-        tempD = {"Date Time Stamp": str(row[1]),
-                 "Message": str(row[3]),
-                 "Description": str(row[4])}
-        rdat.append(tempD)
-    return rdat
+    return _searchResults(bbpath, message, "data", mode, since, until, after_id, limit, fields, count)
 
-def searchDescription(message, mode="like",
+def searchDescription(message, mode="like", since=None, until=None,
+                      after_id=None, limit=None, fields=None, count=False,
                       bbpath="serebo_blackbox\\blackbox.sdb"):
     """!
     Function to search SEREBO Black Box for a description - This does not insert a record into SEREBO Black Box.
 
     Usage: 
 
-        python serebo.py searchdesc --mode=<search mode> --message=<search term> --bbpath=<path to SEREBO black box>
+        python serebo.py searchdesc --mode=<search mode> --message=<search term> --since=<earliest time> --until=<latest time> --after-id=<last record ID displayed> --limit=<number of records> --fields=<fields to display> --count --bbpath=<path to SEREBO black box>
 
     For example:
 
-        python serebo.py searchdesc --mode="like" --message="%NA%" --bbpath="serebo_blackbox\\blackbox.sdb"
+        python serebo.py searchdesc --mode="like" --message="%NA%" --since="2026-10-18T08:00:00" --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py searchdesc --mode="like" --message="%NA%" --after-id=1000 --limit=100 --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py searchdesc --mode="like" --message="%NA%" --fields="ID,dtstamp" --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py searchdesc --mode="like" --message="%NA%" --count --bbpath="serebo_blackbox\\blackbox.sdb"
 
     @param message String: Case sensitive search term.
     @param mode String: Mode of search. Allowable modes are "like" and "exact". If mode is "like", wildcards such as "_" (matches any single character) and "%" (matches any number of characters). Default = "like".
+    @param since String: Earliest time (inclusive) of records to search - ISO 8601 date time (UTC if time zone is not given), SEREBO date time stamp, or seconds since epoch. Default = None.
+    @param until String: Latest time (exclusive) of records to search. Default = None.
+    @param after_id Integer: Search only records with ID larger than after_id (use the last Record ID displayed to get the next page of results). Default = None.
+    @param limit Integer: Maximum number of records to display. Default = None (no limit).
+    @param fields String: Comma-separated datalog fields to display - ID, dtstamp, hash, data (Message) and description. Only these fields are read from SEREBO Black Box. Default = None (ID, dtstamp, data and description).
+    @param count Boolean: Flag to display only the number of matching records. Default = False.
     @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
     """
-    db = bb.connectDB(bbpath)
-    mode = str(mode)
-    message = str(message)
-    result = bb.searchDatalog(db, message, "description", mode)
-    rdat = []
-    for row in result:
-        tempD = {"Date Time Stamp": str(row[1]),
-                 "Message": str(row[3]),
-                 "Description": str(row[4])}
-        rdat.append(tempD)
-    return rdat
+    return _searchResults(bbpath, message, "description", mode, since, until, after_id, limit, fields, count)
 
-def searchFile(filepath, bbpath="serebo_blackbox\\blackbox.sdb"):
+def searchFile(filepath, hash_backend=None, trust_cache=False, 
+               rehash=False, hash_cache=None,
+               bbpath="serebo_blackbox\\blackbox.sdb"):
     """!
     Function to search SEREBO Black Box for a file logging event - This does not insert a record into SEREBO Black Box.
 
     Usage: 
 
-        python serebo.py searchfile --filepath=<path to file for searching> --bbpath=<path to SEREBO black box>
+        python serebo.py searchfile --filepath=<path to file for searching> --hash-backend=<hash backend> --trust-cache --rehash --hash-cache=<path to file hash cache> --bbpath=<path to SEREBO black box>
 
     For example:
 
         python serebo.py searchfile --filepath=doxygen_serebo --bbpath="serebo_blackbox\\blackbox.sdb"
 
     @param fileapth String: Path of file to search in SEREBO black box.
+    @param hash_backend String: Name of hash backend which the file was logged with. Default = None (serebo12).
+    @param trust_cache Boolean: Flag to use the file hash cache (see logFile). Default = False.
+    @param rehash Boolean: Flag to hash the file even if it is in the file hash cache, and to refresh the cache. Default = False.
+    @param hash_cache String: Path to file hash cache (implies trust_cache). Default = None (SEREBO black box path suffixed with "-hashcache").
     @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
     """
     db = bb.connectDB(bbpath)
     filepath = str(filepath)
     absPath = bb.absolutePath(filepath)
-    fHash = bb.fileHash(absPath)
-    result = bb.searchDatalog(db, fHash, "data", "exact")
-    rdat = []
-    for row in result:
-        tempD = {"File Path": filepath,
-                 "Absolute File Path": absPath,
-                 "Date Time Stamp": str(row[1]),
-                 "Message": str(row[3]),
-                 "Description": str(row[4])}
-        rdat.append(tempD)
+    cache = _hashCache(trust_cache, rehash, hash_cache, bbpath)
+    fHash = bb.fileHash(absPath, hash_backend, cache, rehash)
+    result = bb.streamDatalog(db, fHash, "data", "exact")
+    print("")
+    print("Search Result (Search by File) ...")
+    stats = _hashCacheStats(cache)
+    if stats: print("")
+    for key in stats:
+        print("%s: %s" % (key, stats[key]))
+    print("")
+    return ({"File Path": filepath,
+             "Absolute File Path": absPath,
+             "Date Time Stamp": str(row[1]),
+             "Message": str(row[3]),
+             "Description": str(row[4])} for row in result)
+
+def verifyFile(ID, filepath=None, workers=None, 
+               bbpath="serebo_blackbox\\blackbox.sdb"):
+    """!
+    Function to verify a file against its file logging record - the file hash is recomputed with the hash backend which the file was logged with, and compared with the recorded file hash. A file logged with chunked hashing is verified chunk by chunk (in parallel), stopping at the first changed chunk. This does not insert a record into SEREBO Black Box.
+
+    Usage:
+
+        python serebo.py verifyfile --id=<data log ID of file logging record> --filepath=<path of file to verify> --workers=<number of hashing threads> --bbpath=<path to SEREBO black box>
+
+    For example:
+
+        python serebo.py verifyfile --id=25 --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py verifyfile --id=25 --filepath=doxygen_serebo --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    @param ID Integer: Data log ID of the file logging record.
+    @param filepath String: Path of file to verify. Default = None (the absolute file path recorded at file logging).
+    @param workers Integer: Number of threads for chunked hashing. Default = None (Python default).
+    @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
+    """
+    db = bb.connectDB(bbpath)
+    result = bb.verifyFile(db, ID, filepath, workers)
+    if result is None:
+        return {"Error": "Record not found",
+                "ID": str(ID)}
+    rdat = {"ID": str(result["ID"]),
+            "File Path": str(result["FilePath"]),
+            "Hash Backend": str(result["HashBackend"]),
+            "Recorded File Hash": str(result["RecordedHash"]),
+            "Current File Hash": str(result["FileHash"]),
+            "Verified": str(result["Verified"])}
+    if result["BadChunk"] is not None:
+        (number, offset, length) = result["BadChunk"]
+        rdat["First Changed Chunk"] = str(number)
+        rdat["First Changed Offset"] = str(offset)
+        rdat["First Changed Length"] = str(length)
     return rdat
 
-def auditCount(bbpath="serebo_blackbox\\blackbox.sdb"):
+def verifyTree(filepath, workers=None, trust_cache=False, rehash=False,
+               hash_cache=None, bbpath="serebo_blackbox\\blackbox.sdb"):
+    """!
+    Function to verify the files under a directory against their latest file logging records in SEREBO Black Box - reports each file as changed, unchanged, unknown (not logged) or missing (logged but no longer exists), followed by the number of files of each status. The latest file logging record of each file is looked up from the file index (see serebo_blackbox.fileindex). A file with the same size and modification time as when it was last verified is unchanged, and a file with a different size is changed, without hashing; other logged files are hashed in parallel. This does not insert a record into SEREBO Black Box.
+
+    Usage:
+
+        python serebo.py verifytree --filepath=<path of directory to verify> --workers=<number of hashing threads> --trust-cache --rehash --hash-cache=<path to file hash cache> --bbpath=<path to SEREBO black box>
+
+    For example:
+
+        python serebo.py verifytree --filepath=data --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py verifytree --filepath=data --workers=8 --rehash --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    @param filepath String: Path of directory to verify.
+    @param workers Integer: Number of threads for file hashing. Default = None (Python default).
+    @param trust_cache Boolean: Flag to use the file hash cache (see logFile). Default = False.
+    @param rehash Boolean: Flag to hash every logged file, without the size and modification time prefilter and the file hash cache. Default = False.
+    @param hash_cache String: Path to file hash cache (implies trust_cache). Default = None (SEREBO black box path suffixed with "-hashcache").
+    @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
+    """
+    db = bb.connectDB(bbpath)
+    cache = _hashCache(trust_cache, False, hash_cache, bbpath)
+    counts = {"changed": 0, "unchanged": 0, "unknown": 0, "missing": 0}
+    for result in bb.verifyTree(db, filepath, workers, cache, rehash):
+        counts[result["Status"]] = counts[result["Status"]] + 1
+        yield {"Status": result["Status"],
+               "Path": result["Path"],
+               "Data Log ID": str(result["ID"]),
+               "Checked By": result["CheckedBy"]}
+    yield {"Changed Files": str(counts["changed"]),
+           "Unchanged Files": str(counts["unchanged"]),
+           "Unknown Files": str(counts["unknown"]),
+           "Missing Files": str(counts["missing"])}
+
+def watch(filepath, description="NA", hash_backend=None, workers=None,
+          debounce=1.0, poll=False, trust_cache=False, hash_cache=None,
+          bbpath="serebo_blackbox\\blackbox.sdb"):
+    """!
+    Function to watch a directory (including its subdirectories) and log new and modified files into SEREBO Black Box as they are written, until interrupted (Ctrl-C). On Linux, file events are received by inotify; otherwise, the directory is scanned every 2 seconds. A file is logged once it is closed after writing and has not changed for debounce seconds; settled files are hashed in parallel and appended to the blockchain in batches (see serebo_blackbox.watcher). Files existing when watching starts are not logged unless they are modified.
+
+    Usage:
+
+        python serebo.py watch --filepath=<path of directory to watch> --description=<explanatory description for the logged files> --hash-backend=<hash backend> --workers=<number of hashing threads> --debounce=<seconds> --poll --trust-cache --hash-cache=<path to file hash cache> --bbpath=<path to SEREBO black box>
+
+    For example:
+
+        python serebo.py watch --filepath=instrument_output --description="Instrument output" --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py watch --filepath=instrument_output --debounce=5 --poll --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    @param filepath String: Path of directory to watch.
+    @param description String: Explanation string for the logged files. Default = NA.
+    @param hash_backend String: Name of hash backend (see logFile). Default = None (serebo12).
+    @param workers Integer: Number of threads for file hashing. Default = None (Python default).
+    @param debounce Float: Number of seconds without change for a file to be logged. Default = 1.0.
+    @param poll Boolean: Flag to scan the directory instead of using inotify. Default = False.
+    @param trust_cache Boolean: Flag to use the file hash cache (see logFile). Default = False.
+    @param hash_cache String: Path to file hash cache (implies trust_cache). Default = None (SEREBO black box path suffixed with "-hashcache").
+    @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
+    """
+    db = bb.connectDB(bbpath)
+    cache = _hashCache(trust_cache, False, hash_cache, bbpath)
+    watcher = bb.DirectoryWatcher(db, filepath, description, hash_backend, cache, workers, debounce, poll=poll)
+    try:
+        for result in watcher.watch():
+            for (absPath, ID) in zip(result["Files"], result["DataID"]):
+                yield {"Date Time Stamp": str(result["DateTimeStamp"]),
+                       "File Path": absPath,
+                       "Data Log ID": str(ID),
+                       "Block ID": str(result["BlockID"])}
+    except KeyboardInterrupt:
+        pass
+
+def hashCacheStatus(prune=False, hash_cache=None, bbpath="serebo_blackbox\\blackbox.sdb"):
     """!
-    Function to check for equal numbers of records in data log and blockchain in SEREBO Black Box - should have the same number of records. This does not insert a record into SEREBO Black Box.
+    Function to view the status of the file hash cache, and to remove the cached hashes of files which had been deleted or changed - This does not read or insert a record into SEREBO Black Box.
+
+    Usage:
+
+        python serebo.py cachestatus --hash-cache=<path to file hash cache> --bbpath=<path to SEREBO black box>
+
+        python serebo.py prunecache --hash-cache=<path to file hash cache> --bbpath=<path to SEREBO black box>
+
+    For example:
+
+        python serebo.py cachestatus --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py prunecache --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    @param prune Boolean: Flag to remove the cached hashes of files which had been deleted or changed. Default = False.
+    @param hash_cache String: Path to file hash cache. Default = None (SEREBO black box path suffixed with "-hashcache").
+    @param bbpath String: Path to SEREBO black box, which is only used to locate the default file hash cache. Default = "serebo_blackbox\\blackbox.sdb".
+    """
+    cache = _hashCache(True, False, hash_cache, bbpath)
+    rdat = {}
+    if prune:
+        rdat["Cached Hashes Removed"] = str(cache.prune())
+    stats = cache.stats()
+    rdat.update({"Hash Cache": stats["Path"],
+                 "Cached Hashes": str(stats["Entries"]),
+                 "Bytes of Cached Files": str(stats["CachedBytes"])})
+    cache.close()
+    return rdat
+
+def _auditCountQuick(db, from_id, to_id, since, until):
+    """!
+    Private function - checks for equal numbers of records in data log and blockchain by counting (without reading the records) and, if the whole SEREBO Black Box is audited, against the statistics table.
+    """
+    result = bb.audit.countRecords(db, from_id, to_id, since, until)
+    (countA, countB) = (result["Datalog"], result["Blockchain"])
+    print("")
+    print("Audit SEREBO Black Box Data Count ...")
+    print("")
+    print("Number of records in datalog: %s" % str(countA))
+    print("Number of records in blockchain: %s (in %s blocks)" % (str(countB), str(result["Blocks"])))
+    if countA == countB:
+        print("Number of records in datalog matches the number of records in blockchain")
+    elif countA > countB:
+        print("Number of records in datalog MORE than the number of records in blockchain")
+    else:
+        print("Number of records in datalog LESS than the number of records in blockchain")
+    if result["StatsDatalog"] is not None:
+        for (table, count, records) in (("datalog", countA, result["StatsDatalog"]), ("blockchain", result["Blocks"], result["StatsBlockchain"])):
+            if records == count:
+                print("Number of records in %s matches the statistics table" % table)
+            else:
+                print("Number of records in %s does NOT match the statistics table (%s records)" % (table, str(records)))
+    return {}
+
+def auditCount(from_id=None, to_id=None, since=None, until=None,
+               full=False, bbpath="serebo_blackbox\\blackbox.sdb"):
+    """!
+    Function to check for equal numbers of records in data log and blockchain in SEREBO Black Box - should have the same number of records, where a Merkle batch block counts for all the records in its batch. This does not insert a record into SEREBO Black Box.
 
     Usage: 
 
-        python serebo.py audit_count --bbpath=<path to SEREBO black box>
+        python serebo.py audit_count --from-id=<first record ID> --to-id=<last record ID> --since=<earliest time> --until=<latest time> --full --bbpath=<path to SEREBO black box>
 
     For example:
 
         python serebo.py audit_count --bbpath="serebo_blackbox\\blackbox.sdb"
 
+    To audit only a range of records:
+
+        python serebo.py audit_count --from-id=4000000 --to-id=4050000 --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py audit_count --since="2026-10-18" --until="2026-10-19" --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    To compare the date time stamps of each record in data log and blockchain:
+
+        python serebo.py audit_count --full --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    @param from_id Integer: First record ID (inclusive) to audit. Default = None.
+    @param to_id Integer: Last record ID (inclusive) to audit. Default = None.
+    @param since String: Earliest time (inclusive) of records to audit - ISO 8601 date time (UTC if time zone is not given), SEREBO date time stamp, or seconds since epoch. Default = None.
+    @param until String: Latest time (exclusive) of records to audit. Default = None.
+    @param full Boolean: Flag to compare the date time stamp of each record in data log and blockchain. Otherwise, only the numbers of records are counted (by SEREBO database) and, for the whole SEREBO Black Box, compared with the statistics table. Default = False.
     @param bbpath String: Path to SEREBO black box. Default = 
     "serebo_blackbox\\blackbox.sdb".
     """
     db = bb.connectDB(bbpath)
-    sqlstmtA = "select ID, dtstamp from datalog"
-    sqlresultA = {}
-    for row in db.cur.execute(sqlstmtA):
-        sqlresultA[row[0]] = row[1]
-    sqlstmtB = "select c_ID, c_dtstamp from blockchain"
-    sqlresultB = {}
-    for row in db.cur.execute(sqlstmtB):
-        sqlresultB[row[0]] = row[1]
+    if not full: return _auditCountQuick(db, from_id, to_id, since, until)
+    result = bb.audit.countRecords(db, from_id, to_id, since, until)
     print("")
     print("Audit SEREBO Black Box Data Count ...")
     print("")
-    if len(sqlresultA) == len(sqlresultB):
-        for k in sqlresultA:
-            if sqlresultA[k] != sqlresultB[k]:
+    if result["Datalog"] == result["Blockchain"]:
+        for record in bb.audit.auditTimestamps(db, from_id, to_id, since, until):
+            if not record["Verified"]:
                 print("Date time stamp mismatch")
-                print("Datalog record number %s" % str(k))
-                print("Datalog date time stamp: %s" % \
-                    str(sqlresultA[k]))
-                print("Blockchain date time stamp: %s" % \
-                    str(sqlresultB[k]))
+                print("Datalog record number %s" % str(record["ID"]))
+                print("Datalog date time stamp: %s" % record["DatalogDateTimeStamp"])
+                print("Blockchain date time stamp: %s" % str(record["BlockDateTimeStamp"]))
             else:
-                print("Date time stamp match - Record %s" % str(k))
+                print("Date time stamp match - Record %s" % str(record["ID"]))
         print("Number of records in datalog matches the number of records in blockchain")
+    elif result["Datalog"] > result["Blockchain"]:
+        print("Number of records in datalog MORE than the number of records in blockchain")
     else:
-        if len(sqlresultA) > len(sqlresultB):
-            print("Number of records in datalog MORE than the number of records in blockchain")
-        elif len(sqlresultA) < len(sqlresultB):
-            print("Number of records in datalog LESS than the number of records in blockchain")
+        print("Number of records in datalog LESS than the number of records in blockchain")
     return {}
 
-def auditDatahash(bbpath="serebo_blackbox\\blackbox.sdb"):
+def auditDatahash(from_id=None, to_id=None, since=None, until=None,
+                  bbpath="serebo_blackbox\\blackbox.sdb"):
     """!
     Function to check for accuracy of hash generations in data log within SEREBO Black Box - recorded hash in data log and computed hash should be identical. This does not insert a record into SEREBO Black Box.
 
     Usage: 
 
-        python serebo.py audit_datahash --bbpath=<path to SEREBO black box>
+        python serebo.py audit_datahash --from-id=<first record ID> --to-id=<last record ID> --since=<earliest time> --until=<latest time> --bbpath=<path to SEREBO black box>
 
     For example:
 
         python serebo.py audit_datahash --bbpath="serebo_blackbox\\blackbox.sdb"
 
+    To audit only a range of records:
+
+        python serebo.py audit_datahash --from-id=4000000 --to-id=4050000 --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py audit_datahash --since="2026-10-18" --until="2026-10-19" --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    @param from_id Integer: First record ID (inclusive) to audit. Default = None.
+    @param to_id Integer: Last record ID (inclusive) to audit. Default = None.
+    @param since String: Earliest time (inclusive) of records to audit - ISO 8601 date time (UTC if time zone is not given), SEREBO date time stamp, or seconds since epoch. Default = None.
+    @param until String: Latest time (exclusive) of records to audit. Default = None.
     @param bbpath String: Path to SEREBO black box. Default = 
     "serebo_blackbox\\blackbox.sdb".
     """
     db = bb.connectDB(bbpath)
-    sqlstmt = """select ID, dtstamp, data, description, hash from datalog"""
     print("")
     print("Audit SEREBO Black Box Data Log Records ...")
     print("")
-    for row in db.cur.execute(sqlstmt):
-        ID = str(row[0])
-        dtstamp = str(row[1])
-        data = str(row[2])
-        description = str(row[3])
-        rHash = str(row[4])
-        dhash = bytes(dtstamp, "utf-8") + bytes(data, "utf-8") + bytes(description, "utf-8")
-        tHash = db.hash(dhash)
-        if tHash == rHash:
-            print("Verified record %s in data log" % ID)
+    for result in bb.audit.auditDatahash(db, from_id, to_id, since, until):
+        if result["Verified"]:
+            print("Verified record %s in data log" % str(result["ID"]))
         else:
-            print("ERROR in record %s in data log" % ID)
-            print("Hash in record: %s" % rHash)
-            print("Computed hash: %s" % tHash)
+            print("ERROR in record %s in data log" % str(result["ID"]))
+            print("Hash in record: %s" % result["RecordedHash"])
+            print("Computed hash: %s" % result["ComputedHash"])
     return {}
 
-def auditDataBlockchain(bbpath="serebo_blackbox\\blackbox.sdb"):
+def auditDataBlockchain(from_id=None, to_id=None, since=None, until=None,
+                        bbpath="serebo_blackbox\\blackbox.sdb"):
     """!
     Function to check for accuracy in data log and blockchain mapping in SEREBO Black Box - recorded hash in data log and data in 
-    blockchain should be identical. This does not insert a record into SEREBO Black Box.
+    blockchain should be identical; for records in a Merkle batch, the Merkle root recomputed from the hashes in data log and data in the batch block should be identical. This does not insert a record into SEREBO Black Box.
 
     Usage: 
 
-        python serebo.py audit_data_blockchain --bbpath=<path to SEREBO black box>
+        python serebo.py audit_data_blockchain --from-id=<first record ID> --to-id=<last record ID> --since=<earliest time> --until=<latest time> --bbpath=<path to SEREBO black box>
 
     For example:
 
         python serebo.py audit_data_blockchain --bbpath="serebo_blackbox\\blackbox.sdb"
 
+    To audit only a range of records:
+
+        python serebo.py audit_data_blockchain --from-id=4000000 --to-id=4050000 --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py audit_data_blockchain --since="2026-10-18" --until="2026-10-19" --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    @param from_id Integer: First record ID (inclusive) to audit. Default = None.
+    @param to_id Integer: Last record ID (inclusive) to audit. Default = None.
+    @param since String: Earliest time (inclusive) of records to audit - ISO 8601 date time (UTC if time zone is not given), SEREBO date time stamp, or seconds since epoch. Default = None.
+    @param until String: Latest time (exclusive) of records to audit. Default = None.
     @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
     """
     db = bb.connectDB(bbpath)
-    sqlstmt = """select datalog.ID, datalog.dtstamp, datalog.hash, blockchain.c_dtstamp, blockchain.data from datalog inner join blockchain where datalog.ID=blockchain.c_ID and datalog.dtstamp=blockchain.c_dtstamp"""
     print("")
     print("Audit SEREBO Black Box - Accuracy in Data Log to Blockchain Mapping...")
     print("")
-    for row in db.cur.execute(sqlstmt):
-        dID = str(row[0])
-        ddtstamp = str(row[1])
-        dhash = str(row[2])
-        bdtstamp = str(row[3])
-        bhash = str(row[4])
-        if dhash == bhash:
-            print("Verified record %s mapping" % dID)
+    for result in bb.audit.auditDataBlockchain(db, from_id, to_id, since, until):
+        if result["Verified"]:
+            if result["MerkleRoot"] is None:
+                print("Verified record %s mapping" % str(result["ID"]))
+            else:
+                print("Verified record %s mapping (Merkle batch block %s)" % (str(result["ID"]), str(result["BlockID"])))
         else:
-            print("ERROR in record %s mapping" % dID)
-            print("Hash in Data Log: %s" % dHash)
-            print("Data in Blockchain: %s" % bHash)
+            print("ERROR in record %s mapping" % str(result["ID"]))
+            print("Hash in Data Log: %s" % result["DataHash"])
+            if result["MerkleRoot"] is not None:
+                print("Computed Merkle root of batch: %s" % result["MerkleRoot"])
+            print("Data in Blockchain: %s" % result["BlockData"])
     return {}
 
-def auditBlockchainHash(bbpath="serebo_blackbox\\blackbox.sdb"):
+def auditBlockchainHash(from_id=None, to_id=None, since=None, until=None,
+                        bbpath="serebo_blackbox\\blackbox.sdb"):
     """!
     Function to check for accuracy in blockchain hash generation within SEREBO Black Box - recorded hash in blockchain and computed hash should be identical. This does not insert a record into SEREBO Black Box.
 
     Usage: 
 
-        python serebo.py audit_blockchainhash --bbpath=<path to SEREBO black box>
+        python serebo.py audit_blockchainhash --from-id=<first record ID> --to-id=<last record ID> --since=<earliest time> --until=<latest time> --bbpath=<path to SEREBO black box>
 
     For example:
 
         python serebo.py audit_blockchainhash --bbpath="serebo_blackbox\\blackbox.sdb"
 
+    To audit only a range of records:
+
+        python serebo.py audit_blockchainhash --from-id=4000000 --to-id=4050000 --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py audit_blockchainhash --since="2026-10-18" --until="2026-10-19" --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    @param from_id Integer: First record ID (inclusive) to audit. Default = None.
+    @param to_id Integer: Last record ID (inclusive) to audit. Default = None.
+    @param since String: Earliest time (inclusive) of records to audit - ISO 8601 date time (UTC if time zone is not given), SEREBO date time stamp, or seconds since epoch. Default = None.
+    @param until String: Latest time (exclusive) of records to audit. Default = None.
     @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
     """
     db = bb.connectDB(bbpath)
-    sqlstmt = """select c_ID, p_dtstamp, p_randomstring, p_hash, data, c_hash from blockchain"""
     print("")
     print("Audit SEREBO Black Box Blockchain hashes ...")
     print("")
-    for row in db.cur.execute(sqlstmt):
-        ID = str(row[0])
-        p_dtstamp = str(row[1])
-        p_randomstring = str(row[2])
-        p_hash = str(row[3])
-        data = str(row[4])
-        c_hash = str(row[5])
-        dhash = "".join([str(p_dtstamp), str(p_randomstring), str(p_hash), str(data)])
-        dhash = bytes(dhash, "utf-8")
-        tHash = db.hash(dhash)
-        if tHash == c_hash:
-            print("Verified record %s in Blockchain" % ID)
+    for result in bb.audit.auditBlockchainHash(db, from_id, to_id, since, until):
+        if result["Verified"]:
+            print("Verified record %s in Blockchain" % str(result["ID"]))
         else:
-            print("ERROR in record %s in Blockchain" % ID)
-            print("Hash in record: %s" % c_hash)
-            print("Computed hash: %s" % tHash)
+            print("ERROR in record %s in Blockchain" % str(result["ID"]))
+            print("Hash in record: %s" % result["RecordedHash"])
+            print("Computed hash: %s" % result["ComputedHash"])
     return {}
 
-def auditBlockchainFlow(bbpath="serebo_blackbox\\blackbox.sdb"):
+def auditBlockchainFlow(from_id=None, to_id=None, since=None, until=None,
+                        bbpath="serebo_blackbox\\blackbox.sdb"):
     """!
     Function to trace the decendancy of blockchain records (also known as blocks) within SEREBO Black Box - decandency from first block should be traceable to the last / latest block. This does not insert a record into SEREBO Black Box.
 
     Usage: 
 
-        python serebo.py audit_blockchainflow --bbpath=<path to SEREBO black box>
+        python serebo.py audit_blockchainflow --from-id=<first record ID> --to-id=<last record ID> --since=<earliest time> --until=<latest time> --bbpath=<path to SEREBO black box>
 
     For example:
 
         python serebo.py audit_blockchainflow --bbpath="serebo_blackbox\\blackbox.sdb"
 
+    To audit only a range of records:
+
+        python serebo.py audit_blockchainflow --from-id=4000000 --to-id=4050000 --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py audit_blockchainflow --since="2026-10-18" --until="2026-10-19" --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    @param from_id Integer: First record ID (inclusive) to audit. Default = None.
+    @param to_id Integer: Last record ID (inclusive) to audit. Default = None.
+    @param since String: Earliest time (inclusive) of records to audit - ISO 8601 date time (UTC if time zone is not given), SEREBO date time stamp, or seconds since epoch. Default = None.
+    @param until String: Latest time (exclusive) of records to audit. Default = None.
     @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
     """
     db = bb.connectDB(bbpath)
-    sqlstmt = """select max(c_ID) from blockchain"""
     print("")
     print("Trace SEREBO Black Box Blockchain's block decendancy ...")
     print("")
-    maxID = [row for row in db.cur.execute(sqlstmt)][0][0]
-    maxID = int(maxID)
-    for i in range(1, maxID, 1):
-        # Get parent data from parent block
-        sqlstmt = """select c_ID, c_dtstamp, c_randomstring, c_hash from blockchain where c_ID=%s""" % str(i)
-        #print(sqlstmt)
-        p_data = [row for row in db.cur.execute(sqlstmt)][0]
-        pc_ID = str(p_data[0])
-        pc_dtstamp = str(p_data[1])
-        pc_randomstring = str(p_data[2])
-        pc_hash = str(p_data[3])
-        # Get parent data from current / child block
-        sqlstmt = """select p_ID, p_dtstamp, p_randomstring, p_hash from blockchain where c_ID=%s""" % str(i+1)
-        #print(sqlstmt)
-        c_data = [row for row in db.cur.execute(sqlstmt)][0]
-        p_ID = str(c_data[0])
-        p_dtstamp = str(c_data[1])
-        p_randomstring = str(c_data[2])
-        p_hash = str(c_data[3])
-        # Compare parental block record and parent data in current record
-        if (p_ID == pc_ID) and \
-            (p_dtstamp == pc_dtstamp) and \
-            (p_randomstring == pc_randomstring) and \
-            (p_hash == pc_hash):
-            print("Verified - Record %s was used as parent record in record %s" % (str(i), str(i+1)))
+    for result in bb.audit.auditBlockchainFlow(db, from_id, to_id, since, until):
+        ID = str(result["ID"])
+        if result["Verified"]:
+            print("Verified - Record %s was used as parent record in record %s" % (result["ParentID"], ID))
         else:
-            print("ERROR in record %s" % str(i+1))
-            print("Parent ID in record %s: %s" % (str(i+1), str(i)))
-            print("Parent date time stamp in record %s: %s" % (str(i+1), p_dtstamp))
-            print("Actual date time stamp in record %s: %s" % (str(i), pc_dtstamp))
-            print("Parent random string in record %s: %s" % (str(i+1), p_randomstring))
-            print("Actual random string in record %s: %s" % (str(i), pc_randomstring))
-            print("Parent hash in record %s: %s" % (str(i+1), p_hash))
-            print("Actual hash in record %s: %s" % (str(i), pc_hash))
+            # Parent data in current / child block, and actual data of parent block
+            (p_ID, p_dtstamp, p_randomstring, p_hash) = result["Parent"]
+            (pc_ID, pc_dtstamp, pc_randomstring, pc_hash) = result["Actual"]
+            print("ERROR in record %s" % ID)
+            print("Parent ID in record %s: %s" % (ID, p_ID))
+            print("Parent date time stamp in record %s: %s" % (ID, p_dtstamp))
+            print("Actual date time stamp in record %s: %s" % (pc_ID, pc_dtstamp))
+            print("Parent random string in record %s: %s" % (ID, p_randomstring))
+            print("Actual random string in record %s: %s" % (pc_ID, pc_randomstring))
+            print("Parent hash in record %s: %s" % (ID, p_hash))
+            print("Actual hash in record %s: %s" % (pc_ID, pc_hash))
     return {}
 
+def auditMerkle(from_id=None, to_id=None, since=None, until=None,
+                bbpath="serebo_blackbox\\blackbox.sdb"):
+    """!
+    Function to check for accuracy of Merkle batch blocks within SEREBO Black Box - the Merkle root computed from the data log hashes of each batch, the recorded Merkle root and the data in blockchain should be identical. This does not insert a record into SEREBO Black Box.
+
+    Usage: 
+
+        python serebo.py audit_merkle --from-id=<first record ID> --to-id=<last record ID> --since=<earliest time> --until=<latest time> --bbpath=<path to SEREBO black box>
+
+    For example:
+
+        python serebo.py audit_merkle --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    To audit only a range of records:
+
+        python serebo.py audit_merkle --from-id=4000000 --to-id=4050000 --bbpath="serebo_blackbox\\blackbox.sdb"
+
+        python serebo.py audit_merkle --since="2026-10-18" --until="2026-10-19" --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    @param from_id Integer: First record ID (inclusive) to audit. Default = None.
+    @param to_id Integer: Last record ID (inclusive) to audit. Default = None.
+    @param since String: Earliest time (inclusive) of records to audit - ISO 8601 date time (UTC if time zone is not given), SEREBO date time stamp, or seconds since epoch. Default = None.
+    @param until String: Latest time (exclusive) of records to audit. Default = None.
+    @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
+    """
+    db = bb.connectDB(bbpath)
+    print("")
+    print("Audit SEREBO Black Box Merkle batch blocks ...")
+    print("")
+    for result in bb.audit.auditMerkle(db, from_id, to_id, since, until):
+        (ID, start, end) = (str(result["ID"]), str(result["StartID"]), str(result["EndID"]))
+        if result["Verified"]:
+            print("Verified Merkle batch block %s (records %s to %s)" % (ID, start, end))
+        else:
+            print("ERROR in Merkle batch block %s (records %s to %s)" % (ID, start, end))
+            print("Computed Merkle root: %s" % str(result["ComputedRoot"]))
+            print("Merkle root in record: %s" % result["RecordedRoot"])
+            print("Data in Blockchain: %s" % result["BlockData"])
+    return {}
+
+def auditCheckpoint(from_id=None, to_id=None, since=None, until=None, bbpath="serebo_blackbox\\blackbox.sdb"):
+    """!
+    Function to check for accuracy of checkpoints within SEREBO Black Box - each checkpoint should be chained to its previous checkpoint, and should record the accumulator (Merkle root) of the block hashes it covers. If a range of blocks is given, the range is verified using the checkpoints; only the blocks at the ends of range and the blocks after the last checkpoint are checked block by block. This does not insert a record into SEREBO Black Box.
+
+    Usage: 
+
+        python serebo.py audit_checkpoint --from-id=<first block ID> --to-id=<last block ID> --since=<earliest time> --until=<latest time> --bbpath=<path to SEREBO black box>
+
+    For example:
+
+        python serebo.py audit_checkpoint --from-id=15000 --to-id=42000 --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    @param from_id Integer: First block ID of range. Default = None (audit all checkpoints if to_id is also None; otherwise, first block).
+    @param to_id Integer: Last block ID of range. Default = None (latest block).
+    @param since String: Earliest time (inclusive) of blocks in range - ISO 8601 date time (UTC if time zone is not given), SEREBO date time stamp, or seconds since epoch. Default = None.
+    @param until String: Latest time (exclusive) of blocks in range. Default = None.
+    @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
+    """
+    db = bb.connectDB(bbpath)
+    if since is not None or until is not None:
+        (clause, sqldata) = bb.scopeClause("c_ID", "c_dtstamp_us", from_id, to_id, since, until)
+        sqlstmt = """select min(c_ID), max(c_ID) from blockchain where %s""" % clause
+        (from_id, to_id) = [row for row in db.cur.execute(sqlstmt, sqldata)][0]
+        if from_id is None:
+            (from_id, to_id) = (0, -1)
+    print("")
+    if from_id is None and to_id is None:
+        print("Audit SEREBO Black Box checkpoints ...")
+        print("")
+        result = bb.checkpoint.auditCheckpoints(db)
+        print("Number of verified checkpoints: %s" % str(result["Verified"]))
+        for ID in result["Errors"]:
+            print("ERROR in checkpoint %s" % str(ID))
+        return {}
+    print("Verify SEREBO Black Box blockchain range using checkpoints ...")
+    print("")
+    result = bb.checkpoint.verifyRange(db, from_id, to_id)
+    for error in result["Errors"]:
+        print("ERROR in %s" % error)
+    rdat = {"SEREBO Black Box": db,
+            "Black Box Path": str(db.path),
+            "From Block ID": str(result["Start"]),
+            "To Block ID": str(result["End"])}
+    if "Checkpoints" in result:
+        rdat["Checkpoints Checked"] = str(result["Checkpoints"])
+        rdat["Checkpoint Chain"] = str(result["CheckpointChain"])
+        rdat["End Accumulators"] = str(result["EndAccumulators"])
+        rdat["End Blocks"] = str(result["EndBlocks"])
+        rdat["Blocks after Last Checkpoint"] = str(result["UncoveredBlocks"])
+        rdat["Flow after Last Checkpoint"] = str(result["UncoveredFlow"])
+    rdat["Verified"] = str(result["Verified"])
+    return rdat
+
+def proveRecord(ID, filepath=None, maxlinks=1000, bbpath="serebo_blackbox\\blackbox.sdb"):
+    """!
+    Function to generate a compact proof that a data log record is recorded in the blockchain of SEREBO Black Box, and write it into a proof file (JSON), which can be verified by verify-proof command without SEREBO Black Box. This does not insert a record into SEREBO Black Box.
+
+    The proof is anchored to the first later notarization (or the latest block) through the links of each later block, up to max-links links. If the anchor is further away, the proof is anchored to the checkpoint covering the block of the record (by a Merkle path of the block hash in the checkpoint), or to the block max-links blocks later if the block is not covered by a checkpoint.
+
+    Usage: 
+
+        python serebo.py prove --id=<data log ID> --filepath=<path of proof file> --max-links=<maximum number of links> --bbpath=<path to SEREBO black box>
+
+    For example:
+
+        python serebo.py prove --id=5 --filepath=record5_proof.json --bbpath="serebo_blackbox\\blackbox.sdb"
+
+    @param ID Integer: Data log ID of record.
+    @param filepath String: Path of proof file. Default = None (proof_<ID>.json).
+    @param maxlinks Integer: Maximum number of links from the block of record to the anchor block. Default = 1000.
+    @param bbpath String: Path to SEREBO black box. Default = "serebo_blackbox\\blackbox.sdb".
+    """
+    db = bb.connectDB(bbpath)
+    if filepath is None: 
+        filepath = "proof_%s.json" % str(ID)
+    proof = bb.proof.generateProof(db, ID, maxlinks)
+    print("")
+    print("Generate Proof of Record ...")
+    if proof is None:
+        return {"SEREBO Black Box": db,
+                "Black Box Path": str(db.path),
+                "Record ID": str(ID),
+                "Error": "Record not found in blockchain"}
+    filepath = bb.proof.writeProof(proof, filepath)
+    rdat = {"SEREBO Black Box": db,
+            "Black Box Path": str(db.path),
+            "Record ID": str(ID),
+            "Block ID": str(proof["Block"]["ID"]),
+            "Merkle Batch": str(proof["Merkle"] is not None),
+            "Anchor Type": proof["Anchor"]["Type"],
+            "Anchor Block ID": str(proof["Anchor"]["BlockID"]),
+            "Anchor Block Hash": proof["Anchor"]["BlockHash"],
+            "Proof File Path": filepath}
+    return rdat
+
+def verifyProof(filepath):
+    """!
+    Function to verify a proof file generated by prove command - This does not require SEREBO Black Box.
+
+    Usage: 
+
+        python serebo.py verify-proof --filepath=<path of proof file>
+
+    For example:
+
+        python serebo.py verify-proof --filepath=record5_proof.json
+
+    @param filepath String: Path of proof file.
+    """
+    proof = bb.proof.readProof(filepath)
+    result = bb.proof.verifyProof(proof)
+    print("")
+    print("Verify Proof of Record ...")
+    rdat = {"Proof File Path": bb.absolutePath(filepath),
+            "Black Box ID": proof["BlackBoxID"],
+            "Record ID": str(proof["Record"]["ID"]),
+            "Date Time Stamp": proof["Record"]["dtstamp"],
+            "Data": proof["Record"]["data"],
+            "Description": proof["Record"]["description"],
+            "Record Hash": str(result["RecordHash"]),
+            "Merkle Inclusion": str(result["MerkleInclusion"]),
+            "Block Hash": str(result["BlockHash"]),
+            "Chain to Anchor": str(result["AnchorChain"]),
+            "Anchor Type": proof["Anchor"]["Type"],
+            "Anchor Block ID": str(proof["Anchor"]["BlockID"]),
+            "Anchor Block Hash": proof["Anchor"]["BlockHash"],
+            "Anchor Record": str(result["AnchorRecord"])}
+    if proof["Anchor"]["Record"] is not None:
+        rdat["Anchor Description"] = proof["Anchor"]["Record"]["description"]
+    rdat["Verified"] = str(result["Verified"])
+    return rdat
+
 def NTPSign(bbpath="serebo_blackbox\\blackbox.sdb"):
     """!
     Function to self-sign (self notarization) SEREBO Black Box using NTP (Network Time Protocol) server.
@@ -887,40 +1416,74 @@ if __name__ == "__main__":
     # Argument Parser
     parser = argparse.ArgumentParser()
     parser.add_argument("command", type=str, help="SEREBO command")
+    parser.add_argument("-ap", "--append", action="store_true", help="Hash only appended bytes of a previously logged file")
+    parser.add_argument("-aid", "--after-id", type=int, default=None, help="Search only records after this ID")
     parser.add_argument("-bb", "--bbpath", type=str, default="serebo_blackbox\\blackbox.sdb", help="Path to SEREBO blackbox")
+    parser.add_argument("-c", "--count", action="store_true", help="Display only the number of matching records")
+    parser.add_argument("-cs", "--chunk-size", type=str, default=None, help="Chunk size for chunked file hashing (such as 64M)")
     parser.add_argument("-d", "--description", type=str, default="NA", help="Explanation string for this entry")
+    parser.add_argument("-db", "--debounce", type=float, default=1.0, help="Seconds without change before a watched file is logged")
     parser.add_argument("-dp", "--dumpfolder", type=str, default=".", help="Folder to dump files")
+    parser.add_argument("-ev", "--eventlog", type=str, default=None, help="Event log mode of new SEREBO blackbox (full or lean)")
+    parser.add_argument("-fi", "--fields", type=str, default=None, help="Comma-separated datalog fields to display")
+    parser.add_argument("-fid", "--from-id", type=int, default=None, help="First record or block ID of range")
     parser.add_argument("-f", "--filepath", type=str, default=None, help="Path of file")
+    parser.add_argument("-fu", "--full", action="store_true", help="Full audit (compare each record)")
+    parser.add_argument("-hc", "--hash-cache", type=str, default=None, help="Path to file hash cache")
+    parser.add_argument("-hb", "--hash-backend", type=str, default=None, help="File hash backend (serebo12, blake2b, blake3 or xxh3_128)")
+    parser.add_argument("-id", "--id", type=int, default=None, help="Data log ID of record")
     parser.add_argument("-l", "--length", type=int, default=10, help="Length of item to generate")
+    parser.add_argument("-li", "--limit", type=int, default=None, help="Maximum number of records to display")
     parser.add_argument("-m", "--message", type=str, help="Text string to be processed")
+    parser.add_argument("-ml", "--max-links", type=int, default=1000, help="Maximum number of links in a record proof")
     parser.add_argument("-mo", "--mode", type=str, default="like", help="Type of processing mode")
+    parser.add_argument("-po", "--poll", action="store_true", help="Scan watched directory instead of using inotify")
+    parser.add_argument("-o", "--output", type=str, default=None, help="Path of output file")
     parser.add_argument("-p", "--prefix", type=str, default="dumpBB", help="Name to prefix output files")
+    parser.add_argument("-rh", "--rehash", action="store_true", help="Hash files even if in file hash cache")
+    parser.add_argument("-si", "--since", type=str, default=None, help="Earliest time (inclusive) of records")
+    parser.add_argument("-st", "--storage", type=int, default=1, help="Storage version of new SEREBO blackbox")
+    parser.add_argument("-tc", "--trust-cache", action="store_true", help="Use file hash cache for unchanged files")
+    parser.add_argument("-tid", "--to-id", type=int, default=None, help="Last record or block ID of range")
+    parser.add_argument("-un", "--until", type=str, default=None, help="Latest time (exclusive) of records")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Number of threads or processes for hashing")
     args = parser.parse_args()
 
     # Command Routers
-    if args.command.lower() == "audit_blockchainflow": result = auditBlockchainFlow(args.bbpath)
-    elif args.command.lower() == "audit_blockchainhash": result = auditBlockchainHash(args.bbpath)
-    elif args.command.lower() == "audit_count": result = auditCount(args.bbpath)
-    elif args.command.lower() == "audit_data_blockchain": result = auditDataBlockchain(args.bbpath)
-    elif args.command.lower() == "audit_datahash": result = auditDatahash(args.bbpath)
+    if args.command.lower() == "audit_blockchainflow": result = auditBlockchainFlow(args.from_id, args.to_id, args.since, args.until, args.bbpath)
+    elif args.command.lower() == "audit_blockchainhash": result = auditBlockchainHash(args.from_id, args.to_id, args.since, args.until, args.bbpath)
+    elif args.command.lower() == "audit_checkpoint": result = auditCheckpoint(args.from_id, args.to_id, args.since, args.until, args.bbpath)
+    elif args.command.lower() == "audit_count": result = auditCount(args.from_id, args.to_id, args.since, args.until, args.full, args.bbpath)
+    elif args.command.lower() == "audit_data_blockchain": result = auditDataBlockchain(args.from_id, args.to_id, args.since, args.until, args.bbpath)
+    elif args.command.lower() == "audit_datahash": result = auditDatahash(args.from_id, args.to_id, args.since, args.until, args.bbpath)
+    elif args.command.lower() == "audit_merkle": result = auditMerkle(args.from_id, args.to_id, args.since, args.until, args.bbpath)
     elif args.command.lower() == "backup": result = backup(args.filepath, args.bbpath)
+    elif args.command.lower() == "cachestatus": result = hashCacheStatus(False, args.hash_cache, args.bbpath)
     elif args.command.lower() == "checkhash": result = checkHash(args.filepath, args.bbpath)
     elif args.command.lower() == "dump": result = dump(args.dumpfolder, args.prefix, args.bbpath)
     elif args.command.lower() == "dumphash": result = dumpHash(args.filepath, args.bbpath)
-    elif args.command.lower() == "fhash": result = fileHash(args.filepath)
-    elif args.command.lower() == "init": result = initialize(args.bbpath)
+    elif args.command.lower() == "fhash": result = fileHash(args.filepath, args.hash_backend, args.trust_cache, args.rehash, args.hash_cache, args.chunk_size, args.workers, args.bbpath)
+    elif args.command.lower() == "init": result = initialize(args.bbpath, args.storage, args.eventlog)
     elif args.command.lower() == "intext": result = insertText(args.message, args.description, args.bbpath)
     elif args.command.lower() == "localcode": result = localCode(args.length, args.description, args.bbpath)
     elif args.command.lower() == "localdts": result = localDTS(args.bbpath)
-    elif args.command.lower() == "logfile": result = logFile(args.filepath, args.description, args.bbpath)
+    elif args.command.lower() == "logfile": result = logFile(args.filepath, args.description, args.hash_backend, args.trust_cache, args.rehash, args.hash_cache, args.chunk_size, args.workers, args.append, args.bbpath)
+    elif args.command.lower() == "logstream": result = logStream(args.filepath, args.description, args.hash_backend, args.output, args.bbpath)
     elif args.command.lower() == "ntpsign": result = NTPSign(args.bbpath)
-    elif args.command.lower() == "searchdesc": result = searchDescription(args.message, args.mode, args.bbpath)
-    elif args.command.lower() == "searchfile": result = searchFile(args.filepath, args.bbpath)
-    elif args.command.lower() == "searchmsg": result = searchMessage(args.message, args.mode, args.bbpath)
+    elif args.command.lower() == "prove": result = proveRecord(args.id, args.filepath, args.max_links, args.bbpath)
+    elif args.command.lower() == "prunecache": result = hashCacheStatus(True, args.hash_cache, args.bbpath)
+    elif args.command.lower() == "searchdesc": result = searchDescription(args.message, args.mode, args.since, args.until, args.after_id, args.limit, args.fields, args.count, args.bbpath)
+    elif args.command.lower() == "searchfile": result = searchFile(args.filepath, args.hash_backend, args.trust_cache, args.rehash, args.hash_cache, args.bbpath)
+    elif args.command.lower() == "searchmsg": result = searchMessage(args.message, args.mode, args.since, args.until, args.after_id, args.limit, args.fields, args.count, args.bbpath)
     elif args.command.lower() == "selfsign": result = selfSign(args.bbpath)
     elif args.command.lower() == "shash": result = stringHash(args.message, args.bbpath)
+    elif args.command.lower() == "status": result = status(args.bbpath)
     elif args.command.lower() == "sysdata": result = systemData()
     elif args.command.lower() == "sysrecord": result = systemRecord(args.bbpath)
+    elif args.command.lower() == "verify-proof": result = verifyProof(args.filepath)
+    elif args.command.lower() == "verifyfile": result = verifyFile(args.id, args.filepath, args.workers, args.bbpath)
+    elif args.command.lower() == "verifytree": result = verifyTree(args.filepath, args.workers, args.trust_cache, args.rehash, args.hash_cache, args.bbpath)
+    elif args.command.lower() == "watch": result = watch(args.filepath, args.description, args.hash_backend, args.workers, args.debounce, args.poll, args.trust_cache, args.hash_cache, args.bbpath)
     elif args.command.lower() == "viewselfnote": result = viewSelfNotarizations(args.bbpath)
     elif args.command.lower() == "viewntpnote": result = viewNTPNotarizations(args.bbpath)
     else: result = {"Error": "Command not recognized",
@@ -933,6 +1496,13 @@ if __name__ == "__main__":
                     "--mode": args.mode}
 
     # Results Display
+    if not isinstance(result, dict):
+        # Rows (such as search results) are displayed as they are fetched
+        for row in result:
+            for k2 in row:
+                print("%s: %s" % (str(k2), str(row[k2])))
+            print("")
+        result = {}
     for key in result: 
         try:
             print("%s: %s" % (str(key), str(result[key])))
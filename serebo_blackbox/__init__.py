@@ -34,19 +34,53 @@ SEREBO (SEcured REcorder BOx) Black Box is inspired by the black boxes (cockpit
 
 SEREBO Black Box aims to address this issue using several approaches. Firstly, the data files can be used to generate a file hash. It is very likely that an edit in the file will result in a different hash. Hence, if a file generates the same hash across two different points in time, it can be safely assumed that the file had not been edited during this time span. Secondly, the file hash has to be securely recorded with amendment protected. SEREBO records the hash and registers the hash into a blockchain. The main concept of blockchain is that the hash of previous (parent) block is concatenated with the data (file hash in this case) of the current block to generate a hash for the current block. Hence, as the blockchain grows, any amendments in earlier blocks can be easily detected - only amendments to the latest block cannot be detected. Therefore, the value of SEREBO lies in its use.'''
 
+from . import aio
+from . import audit
+from . import checkpoint
+from . import chunks
+from . import fileindex
+from . import hashcache
+from . import hashers
+from . import merkle
 from . import ntplib
+from . import proof
 from . import serebo_api
+from . import shard
+from . import storage
+from . import tokens
+from . import watcher
 from .serebo_api import absolutePath
 from .serebo_api import backup
 from .serebo_api import connectDB
+from .serebo_api import countDatalog
 from .serebo_api import dateTime
 from .serebo_api import dumpTable
+from .serebo_api import eventlogEntry
+from .serebo_api import fileDescription
 from .serebo_api import fileHash
+from .serebo_api import fileHashAs
 from .serebo_api import gmtime
+from .serebo_api import insertBatch
 from .serebo_api import insertFText
 from .serebo_api import insertText
 from .serebo_api import logFile
+from .serebo_api import logStream
+from .serebo_api import merkleProof
+from .serebo_api import parseFileDescription
 from .serebo_api import randomString
+from .serebo_api import scopeClause
 from .serebo_api import searchDatalog
+from .serebo_api import streamDatalog
 from .serebo_api import stringHash
 from .serebo_api import systemData
+from .serebo_api import verifyFile
+from .aio import AsyncSerebo
+from .shard import ShardedSerebo
+from .merkle import verifyMerkleProof
+from .checkpoint import auditCheckpoints
+from .checkpoint import verifyRange
+from .tokens import TokenPool
+from .hashcache import HashCache
+from .fileindex import verifyTree
+from .watcher import DirectoryWatcher
+from .sereboDB import hashBatch
@@ -0,0 +1,371 @@
+'''!
+Secured Recorder Box (SEREBO) Asynchronous (asyncio) Interface
+
+Date created: 19th October 2026
+
+License: GNU General Public License version 3 for academic or
+not-for-profit use only
+
+
+SEREBO is free software: you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+'''
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from . import audit
+from . import serebo_api
+
+class AsyncSerebo(object):
+    '''!
+    Class providing awaitable access to SEREBO black box for asyncio
+    applications.
+
+    SQLite connections can only be used by the thread that created
+    them; hence, the black box is opened and used within a single
+    dedicated database thread. All chain appends are passed through
+    a queue to a single writer coroutine, which serialises them into
+    the database thread - concurrent producers await their own
+    results without contending on the database lock. File hashing is
+    carried out in a separate pool of hashing threads so that large
+    files do not hold up the chain appends or the event loop.
+
+    Usage:
+
+        async with AsyncSerebo('blackbox.sdb') as box:
+            rdata = await box.insertText('message', 'description')
+    '''
+    def __init__(self, bbpath='serebo_blackbox\\blackbox.sdb',
+                 hashworkers=None, queuesize=0, hashcache=None):
+        '''!
+        Initiation method. The black box is only opened by open()
+        method or when used as an asynchronous context manager.
+
+        @param bbpath String: Path to SEREBO black box. Default =
+        'serebo_blackbox\\blackbox.sdb'.
+        @param hashworkers Integer: Number of threads for file
+        hashing. Default = None (uses ThreadPoolExecutor default).
+        @param queuesize Integer: Maximum number of pending chain
+        appends before producers are made to wait. Default = 0
+        (unlimited).
+        @param hashcache Object: File hash cache (hashcache.HashCache
+        object) used for file hashing. Default = None (no cache).
+        '''
+        self.bbpath = bbpath
+        self.db = None
+        self.hashworkers = hashworkers
+        self.queuesize = int(queuesize)
+        self.hashcache = hashcache
+        self._dbexecutor = None
+        self._hashexecutor = None
+        self._queue = None
+        self._writer = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        '''!
+        Method to open SEREBO black box in the database thread and
+        to start the writer coroutine.
+
+        @return: SEREBO database object
+        '''
+        loop = asyncio.get_running_loop()
+        self._dbexecutor = ThreadPoolExecutor(max_workers=1)
+        self._hashexecutor = ThreadPoolExecutor(self.hashworkers)
+        self.db = await loop.run_in_executor(self._dbexecutor,
+                                             serebo_api.connectDB,
+                                             self.bbpath)
+        self._queue = asyncio.Queue(self.queuesize)
+        self._writer = asyncio.ensure_future(self._writeLoop())
+        return self.db
+
+    async def close(self):
+        '''!
+        Method to wait for all pending chain appends to complete,
+        stop the writer coroutine and close SEREBO black box.
+        '''
+        if self._writer is None:
+            return
+        await self._queue.put(None)
+        await self._writer
+        self._writer = None
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._dbexecutor,
+                                   self.db.conn.close)
+        self._dbexecutor.shutdown()
+        self._hashexecutor.shutdown()
+
+    async def _writeLoop(self):
+        '''!
+        Private method - the single writer coroutine. Takes pending
+        chain appends from the queue in arrival order and inserts
+        them, one at a time, into SEREBO black box in the database
+        thread.
+        '''
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                break
+            (future, data, description, mode) = item
+            try:
+                rdata = await loop.run_in_executor(
+                    self._dbexecutor, self.db.insertData,
+                    data, description, mode)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(rdata)
+
+    async def _append(self, data, description, mode):
+        '''!
+        Private method - queues a chain append for the writer
+        coroutine and waits for its result.
+        '''
+        if self._writer is None:
+            raise RuntimeError('SEREBO black box is not opened')
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((future, data, description, mode))
+        return await future
+
+    async def _read(self, function, *args):
+        '''!
+        Private method - runs a read-only function on SEREBO
+        black box in the database thread.
+        '''
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._dbexecutor,
+                                          function, self.db, *args)
+
+    async def insertText(self, text, description='NA'):
+        '''!
+        Method to insert text string into SEREBO database, with
+        10-random character string suffixing the description. See
+        serebo_api.insertText() for the returned dictionary.
+
+        @param text String: Text string to be inserted.
+        @param description String: Explanation string for this entry
+        event. Default = NA.
+        @return: Dictionary of data generated from this event.
+        '''
+        return await self._append(text, description, 'text')
+
+    async def insertFText(self, text, description='NA'):
+        '''!
+        Method to insert text string into SEREBO database, without
+        10-random character string suffixing the description. See
+        serebo_api.insertFText() for the returned dictionary.
+
+        @param text String: Text string to be inserted.
+        @param description String: Explanation string for this entry
+        event. Default = NA.
+        @return: Dictionary of data generated from this event.
+        '''
+        return await self._append(text, description, 'ftext')
+
+    async def fileHash(self, filepath, backend=None, rehash=False):
+        '''!
+        Method to generate file hash (see serebo_api.fileHash()) in
+        the hashing threads, using the file hash cache if given.
+
+        @param filepath String: Path of file for hash generation.
+        @param backend String: Name of hash backend. Default = None
+        (serebo12).
+        @param rehash Boolean: Flag to hash the file even if it is in
+        the file hash cache. Default = False.
+        @return: Hash
+        '''
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._hashexecutor,
+                                          serebo_api.fileHash,
+                                          filepath, backend,
+                                          self.hashcache, rehash)
+
+    async def logFile(self, filepath, description='NA', backend=None):
+        '''!
+        Method to log a file into SEREBO database. The file is hashed
+        in the hashing threads before being queued for chain append.
+        See serebo_api.logFile() for the returned dictionary.
+
+        @param filepath String: Path of file to log in SEREBO black
+        box.
+        @param description String: Explanation string for this entry
+        event. Default = NA.
+        @param backend String: Name of hash backend. Default = None
+        (serebo12).
+        @return: Dictionary of data generated from this event.
+        '''
+        description = serebo_api.fileDescription(filepath, description,
+                                                 backend)
+        fHash = await self.fileHash(filepath, backend)
+        return await self._append(fHash, description, 'file')
+
+    async def searchDatalog(self, term, field, mode='like',
+                            since=None, until=None, after_id=None,
+                            limit=None, fields=None, count=False):
+        '''!
+        Method to search datalog table. See
+        serebo_api.searchDatalog() for details.
+
+        @param term String: Case sensitive search term.
+        @param field String: Field name to search.
+        @param mode String: Mode of search. Allowable modes are
+        'like' and 'exact'. Default = 'like'.
+        @param since Object: Earliest time (inclusive) of records to
+        return. Default = None.
+        @param until Object: Latest time (exclusive) of records to
+        return. Default = None.
+        @param after_id Integer: Return only records with ID larger
+        than after_id (for pagination). Default = None.
+        @param limit Integer: Maximum number of records to return.
+        Default = None (no limit).
+        @param fields Object: Fields to return (list or
+        comma-separated string). Default = None (all fields).
+        @param count Boolean: Flag to return only the number of
+        matching records. Default = False.
+        @return: List of datalog rows: [ID, dtstamp, hash, data,
+        description], or the fields given; or number of matching
+        records if count is True.
+        '''
+        return await self._read(serebo_api.searchDatalog,
+                                term, field, mode, since, until,
+                                after_id, limit, fields, count)
+
+    async def searchFile(self, filepath):
+        '''!
+        Method to search datalog table for the logging events of a
+        file, by its file hash.
+
+        @param filepath String: Path of file to search.
+        @return: List of datalog rows: [ID, dtstamp, hash, data,
+        description]
+        '''
+        fHash = await self.fileHash(filepath)
+        return await self._read(serebo_api.searchDatalog,
+                                fHash, 'data', 'exact')
+
+    async def stats(self):
+        '''!
+        Method to get the statistics of SEREBO black box (number of
+        records, first and last IDs, and last date time stamps and
+        hashes of datalog, blockchain and eventlog). See
+        sereboDB.SereboDB.stats() for details.
+
+        @return: Dictionary of statistics.
+        '''
+        return await self._read(_stats)
+
+    async def auditDatahash(self, from_id=None, to_id=None,
+                            since=None, until=None):
+        '''!
+        Method to check for accuracy of hash generations in data log
+        - recorded hash in data log and computed hash should be
+        identical (see audit.auditDatahash()).
+
+        @param from_id Integer: First record ID (inclusive). Default =
+        None.
+        @param to_id Integer: Last record ID (inclusive). Default =
+        None.
+        @param since Object: Earliest time (inclusive) - see
+        serebo_api.scopeClause(). Default = None.
+        @param until Object: Latest time (exclusive). Default = None.
+        @return: Dictionary of audit results - Verified is the number
+        of verified records and Errors is the list of IDs of records
+        failing the audit.
+        '''
+        return await self._read(_audit, audit.auditDatahash, from_id,
+                                to_id, since, until)
+
+    async def auditDataBlockchain(self, from_id=None, to_id=None,
+                                  since=None, until=None):
+        '''!
+        Method to check for accuracy in data log and blockchain
+        mapping - recorded hash in data log and data in blockchain
+        should be identical (see audit.auditDataBlockchain()).
+
+        @param from_id Integer: First record ID (inclusive). Default =
+        None.
+        @param to_id Integer: Last record ID (inclusive). Default =
+        None.
+        @param since Object: Earliest time (inclusive) - see
+        serebo_api.scopeClause(). Default = None.
+        @param until Object: Latest time (exclusive). Default = None.
+        @return: Dictionary of audit results - Verified is the number
+        of verified records and Errors is the list of IDs of records
+        failing the audit.
+        '''
+        return await self._read(_audit, audit.auditDataBlockchain,
+                                from_id, to_id, since, until)
+
+    async def auditBlockchainHash(self, from_id=None, to_id=None,
+                                  since=None, until=None):
+        '''!
+        Method to check for accuracy in blockchain hash generation -
+        recorded hash in blockchain and computed hash should be
+        identical (see audit.auditBlockchainHash()).
+
+        @param from_id Integer: First block ID (inclusive). Default =
+        None.
+        @param to_id Integer: Last block ID (inclusive). Default =
+        None.
+        @param since Object: Earliest time (inclusive) - see
+        serebo_api.scopeClause(). Default = None.
+        @param until Object: Latest time (exclusive). Default = None.
+        @return: Dictionary of audit results - Verified is the number
+        of verified blocks and Errors is the list of IDs of blocks
+        failing the audit.
+        '''
+        return await self._read(_audit, audit.auditBlockchainHash,
+                                from_id, to_id, since, until)
+
+    async def auditBlockchainFlow(self, from_id=None, to_id=None,
+                                  since=None, until=None):
+        '''!
+        Method to trace the decendancy of blocks - decandency from
+        first block should be traceable to the last / latest block
+        (see audit.auditBlockchainFlow()).
+
+        @param from_id Integer: First block ID (inclusive). Default =
+        None.
+        @param to_id Integer: Last block ID (inclusive). Default =
+        None.
+        @param since Object: Earliest time (inclusive) - see
+        serebo_api.scopeClause(). Default = None.
+        @param until Object: Latest time (exclusive). Default = None.
+        @return: Dictionary of audit results - Verified is the number
+        of verified blocks and Errors is the list of IDs of blocks
+        failing the audit.
+        '''
+        return await self._read(_audit, audit.auditBlockchainFlow,
+                                from_id, to_id, since, until)
+
+def _stats(sdb_object):
+    '''!
+    Private function - gets the statistics of SEREBO black box.
+    '''
+    return sdb_object.stats()
+
+def _audit(sdb_object, function, *args):
+    '''!
+    Private function - runs an audit (see audit module) and
+    summarizes its results.
+    '''
+    return audit.summarize(function(sdb_object, *args))
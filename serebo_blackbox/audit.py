@@ -0,0 +1,448 @@
+'''!
+Secured Recorder Box (SEREBO) Audits
+
+Date created: 19th October 2026
+
+License: GNU General Public License version 3 for academic or
+not-for-profit use only
+
+
+SEREBO is free software: you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+Audits of the data log and blockchain of SEREBO black box, used by
+the command line interfaces and by aio.AsyncSerebo. Each audit can be
+scoped to a range of IDs and/or a range of time (see
+serebo_api.scopeClause()), and is a generator of results (one
+dictionary for each record, block or batch audited, with Verified as
+True or False) so that large black boxes can be audited without
+holding the results in memory. summarize() function reduces the
+results of an audit into the number of verified items and the list
+of IDs failing the audit.
+'''
+from . import merkle
+from . import serebo_api
+
+def summarize(results):
+    '''!
+    Function to reduce the results of an audit into a summary.
+
+    @param results Iterable: Results of an audit.
+    @return: Dictionary of audit results - Verified is the number of
+    verified items and Errors is the list of IDs of items failing the
+    audit.
+    '''
+    rdat = {'Verified': 0, 'Errors': []}
+    for result in results:
+        if result['Verified']:
+            rdat['Verified'] = rdat['Verified'] + 1
+        else:
+            rdat['Errors'].append(result['ID'])
+    return rdat
+
+def _stampKey(dtstamp):
+    '''!
+    Private function - converts a SEREBO date time stamp (year, month,
+    day, hour, minute, second and microsecond, separated by colons)
+    into a tuple of integers, for ordering.
+    '''
+    return tuple([int(x) for x in str(dtstamp).split(':')])
+
+def _blockOf(sdb_object, ID):
+    '''!
+    Private function - maps a data log ID to the ID of its block in
+    blockchain (the Merkle batch block if the record is in a Merkle
+    batch; otherwise, each earlier Merkle batch of n records takes up
+    only one block), without reading the blockchain.
+    '''
+    ID = int(ID)
+    sqlstmt = '''select c_ID, end_ID from merkleblock where
+        start_ID <= ? order by start_ID desc limit 1'''
+    result = [row for row in sdb_object.conn.execute(sqlstmt, (ID,))]
+    if result and int(result[0][1]) >= ID:
+        return int(result[0][0])
+    sqlstmt = '''select coalesce(sum(end_ID - start_ID), 0) from
+        merkleblock where end_ID < ?'''
+    offset = [row for row in sdb_object.conn.execute(sqlstmt, (ID,))]
+    return ID - int(offset[0][0])
+
+def _mapRecords(sdb_object, columns, clause, sqldata):
+    '''!
+    Private function - maps each record in data log (in ID order,
+    within the scope clause) to its block in blockchain, in a single
+    pass over data log, merkleblock and blockchain tables. Generates
+    (data log row of ID and the given columns, Merkle batch as (c_ID,
+    start_ID, end_ID, root) or None if the record is not batched,
+    block as (c_ID, c_dtstamp, data) or None if the block is not
+    found).
+    '''
+    sqlstmt = 'select ID, %s from datalog where %s order by ID' % \
+        (columns, clause)
+    batches = None
+    blocks = None
+    for row in sdb_object.conn.execute(sqlstmt, sqldata):
+        ID = int(row[0])
+        if batches is None:
+            sqlstmt = '''select coalesce(sum(end_ID - start_ID), 0)
+                from merkleblock where end_ID < ?'''
+            offset = int([x for x in sdb_object.conn.execute(
+                sqlstmt, (ID,))][0][0])
+            sqlstmt = '''select c_ID, start_ID, end_ID, root from
+                merkleblock where end_ID >= ? order by start_ID'''
+            batches = sdb_object.conn.execute(sqlstmt, (ID,))
+            batch = next(batches, None)
+        while batch is not None and int(batch[2]) < ID:
+            offset = offset + int(batch[2]) - int(batch[1])
+            batch = next(batches, None)
+        if batch is not None and int(batch[1]) <= ID:
+            (c_ID, current) = (int(batch[0]), batch)
+        else:
+            (c_ID, current) = (ID - offset, None)
+        if blocks is None:
+            sqlstmt = '''select c_ID, c_dtstamp, data from blockchain
+                where c_ID >= ? order by c_ID'''
+            blocks = sdb_object.conn.execute(sqlstmt, (c_ID,))
+            block = next(blocks, None)
+        while block is not None and int(block[0]) < c_ID:
+            block = next(blocks, None)
+        if block is not None and int(block[0]) == c_ID:
+            yield (row, current, block)
+        else:
+            yield (row, current, None)
+
+def countRecords(sdb_object, from_id=None, to_id=None, since=None,
+                 until=None):
+    '''!
+    Function to count the records in data log and the records covered
+    by blocks in blockchain (without reading the records) and, if the
+    whole SEREBO black box is counted, the numbers of records in the
+    statistics table. A block covers one record, or all the records
+    of its Merkle batch (see merkleblock table); hence, both counts
+    are equal in a sound black box.
+
+    A dictionary will be returned with the following keys - Datalog
+    (number of records in data log), Blockchain (number of records in
+    data log covered by blocks in blockchain), Blocks (number of
+    blocks), and StatsDatalog and StatsBlockchain (numbers of records
+    in statistics table, to be compared with Datalog and Blocks; None
+    if scoped).
+
+    @param sdb_object Object: SEREBO database object.
+    @param from_id Integer: First record ID (inclusive). Default =
+    None.
+    @param to_id Integer: Last record ID (inclusive). Default = None.
+    @param since Object: Earliest time (inclusive). Default = None.
+    @param until Object: Latest time (exclusive). Default = None.
+    @return: Dictionary of counts.
+    '''
+    (clause, sqldata) = serebo_api.scopeClause('ID', 'dtstamp_us',
+                                               from_id, to_id,
+                                               since, until)
+    sqlstmt = 'select count(*), min(ID), max(ID) from datalog where %s' \
+        % clause
+    (countA, first, last) = [row for row in
+                             sdb_object.conn.execute(sqlstmt,
+                                                     sqldata)][0]
+    if since is None and until is None:
+        # Blocks of missing records at either end of the range are
+        # counted
+        (first, last) = (from_id, to_id)
+        if first is None:
+            first = 1
+    rdat = {'Datalog': int(countA),
+            'Blockchain': 0,
+            'Blocks': 0,
+            'StatsDatalog': None,
+            'StatsBlockchain': None}
+    if first is not None:
+        (first, last) = (int(first), last)
+        bclause = 'c_ID >= ?'
+        bdata = [_blockOf(sdb_object, first)]
+        if last is not None:
+            last = int(last)
+            bclause = bclause + ' and c_ID <= ?'
+            bdata.append(_blockOf(sdb_object, last))
+        sqlstmt = 'select count(*) from blockchain where %s' % bclause
+        countB = [row for row in
+                  sdb_object.conn.execute(sqlstmt, bdata)][0][0]
+        # Records of Merkle batches (clipped to the range) are counted
+        # in place of their blocks
+        end = 'end_ID'
+        if last is not None:
+            end = 'min(end_ID, %s)' % str(last)
+        sqlstmt = '''select count(*), coalesce(sum(%s - max(start_ID,
+            ?) + 1), 0) from merkleblock where %s''' % (end, bclause)
+        (countM, sizeM) = [row for row in
+                           sdb_object.conn.execute(sqlstmt,
+                                                   [first] + bdata)][0]
+        rdat['Blocks'] = int(countB)
+        rdat['Blockchain'] = int(countB) - int(countM) + int(sizeM)
+    if from_id is None and to_id is None and \
+            since is None and until is None:
+        stats = sdb_object.stats()
+        rdat['StatsDatalog'] = stats['datalog']['Records']
+        rdat['StatsBlockchain'] = stats['blockchain']['Records']
+    return rdat
+
+def auditTimestamps(sdb_object, from_id=None, to_id=None, since=None,
+                    until=None):
+    '''!
+    Function to compare the date time stamp of each record in data
+    log with that of its block in blockchain, as a generator of
+    results. The date time stamp of a record which is not batched is
+    the same as that of its block; a record in a Merkle batch is
+    timestamped before its batch block.
+
+    Each result is a dictionary with the following keys - ID (data
+    log ID), BlockID, Verified, DatalogDateTimeStamp and
+    BlockDateTimeStamp (None if the block is not found).
+
+    @param sdb_object Object: SEREBO database object.
+    @param from_id Integer: First record ID (inclusive). Default =
+    None.
+    @param to_id Integer: Last record ID (inclusive). Default = None.
+    @param since Object: Earliest time (inclusive). Default = None.
+    @param until Object: Latest time (exclusive). Default = None.
+    @return: Generator of results.
+    '''
+    (clause, sqldata) = serebo_api.scopeClause('ID', 'dtstamp_us',
+                                               from_id, to_id,
+                                               since, until)
+    for (row, batch, block) in _mapRecords(sdb_object, 'dtstamp',
+                                           clause, sqldata):
+        if block is None:
+            verified = False
+        elif batch is None:
+            verified = str(row[1]) == str(block[1])
+        else:
+            verified = _stampKey(row[1]) <= _stampKey(block[1])
+        yield {'ID': row[0],
+               'BlockID': block[0] if block is not None else None,
+               'Verified': verified,
+               'DatalogDateTimeStamp': str(row[1]),
+               'BlockDateTimeStamp': block[1] if block is not None
+               else None}
+
+def auditDatahash(sdb_object, from_id=None, to_id=None, since=None,
+                  until=None):
+    '''!
+    Function to recompute the hash of each record in data log, as a
+    generator of results.
+
+    Each result is a dictionary with the following keys - ID (data
+    log ID), Verified, RecordedHash and ComputedHash.
+
+    @param sdb_object Object: SEREBO database object.
+    @param from_id Integer: First record ID (inclusive). Default =
+    None.
+    @param to_id Integer: Last record ID (inclusive). Default = None.
+    @param since Object: Earliest time (inclusive). Default = None.
+    @param until Object: Latest time (exclusive). Default = None.
+    @return: Generator of results.
+    '''
+    (clause, sqldata) = serebo_api.scopeClause('ID', 'dtstamp_us',
+                                               from_id, to_id,
+                                               since, until)
+    sqlstmt = '''select ID, dtstamp, data, description, hash from
+        datalog where %s''' % clause
+    for row in sdb_object.conn.execute(sqlstmt, sqldata):
+        dhash = bytes(str(row[1]), 'utf-8') + \
+            bytes(str(row[2]), 'utf-8') + \
+            bytes(str(row[3]), 'utf-8')
+        tHash = sdb_object.hash(dhash)
+        yield {'ID': row[0],
+               'Verified': tHash == str(row[4]),
+               'RecordedHash': str(row[4]),
+               'ComputedHash': tHash}
+
+def auditDataBlockchain(sdb_object, from_id=None, to_id=None,
+                        since=None, until=None):
+    '''!
+    Function to check the mapping of each record in data log to its
+    block in blockchain, as a generator of results. For a record which
+    is not batched, the hash in data log should be identical to the
+    data in its block (with the same date time stamp); for a record in
+    a Merkle batch, the Merkle root recomputed from the hashes of its
+    batch in data log should be identical to the data in its batch
+    block (and the root in merkleblock table).
+
+    Each result is a dictionary with the following keys - ID (data
+    log ID), BlockID (None if the block is not found), Verified,
+    DataHash (hash in data log), MerkleRoot (recomputed Merkle root of
+    the batch; None if not batched) and BlockData (data in blockchain;
+    None if the block is not found).
+
+    @param sdb_object Object: SEREBO database object.
+    @param from_id Integer: First record ID (inclusive). Default =
+    None.
+    @param to_id Integer: Last record ID (inclusive). Default = None.
+    @param since Object: Earliest time (inclusive). Default = None.
+    @param until Object: Latest time (exclusive). Default = None.
+    @return: Generator of results.
+    '''
+    (clause, sqldata) = serebo_api.scopeClause('ID', 'dtstamp_us',
+                                               from_id, to_id,
+                                               since, until)
+    leafstmt = '''select hash from datalog where ID >= ? and ID <= ?
+        order by ID'''
+    roots = {}
+    for (row, batch, block) in _mapRecords(sdb_object, 'dtstamp, hash',
+                                           clause, sqldata):
+        tRoot = None
+        if batch is not None:
+            # The root of each batch is recomputed once
+            if batch[0] not in roots:
+                leaves = [str(x[0]) for x in
+                          sdb_object.conn.execute(leafstmt,
+                                                  (batch[1], batch[2]))]
+                roots.clear()
+                roots[batch[0]] = merkle.merkleRoot(leaves)
+            tRoot = roots[batch[0]]
+        if block is None:
+            verified = False
+        elif batch is None:
+            verified = str(row[2]) == str(block[2]) and \
+                str(row[1]) == str(block[1])
+        else:
+            verified = tRoot == str(batch[3]) and \
+                tRoot == str(block[2])
+        yield {'ID': row[0],
+               'BlockID': block[0] if block is not None else None,
+               'Verified': verified,
+               'DataHash': str(row[2]),
+               'MerkleRoot': tRoot,
+               'BlockData': str(block[2]) if block is not None
+               else None}
+
+def auditBlockchainHash(sdb_object, from_id=None, to_id=None,
+                        since=None, until=None):
+    '''!
+    Function to recompute the hash of each block in blockchain, as a
+    generator of results.
+
+    Each result is a dictionary with the following keys - ID (block
+    ID), Verified, RecordedHash and ComputedHash.
+
+    @param sdb_object Object: SEREBO database object.
+    @param from_id Integer: First block ID (inclusive). Default =
+    None.
+    @param to_id Integer: Last block ID (inclusive). Default = None.
+    @param since Object: Earliest time (inclusive). Default = None.
+    @param until Object: Latest time (exclusive). Default = None.
+    @return: Generator of results.
+    '''
+    (clause, sqldata) = serebo_api.scopeClause('c_ID', 'c_dtstamp_us',
+                                               from_id, to_id,
+                                               since, until)
+    sqlstmt = '''select c_ID, p_dtstamp, p_randomstring, p_hash, data,
+        c_hash from blockchain where %s''' % clause
+    for row in sdb_object.conn.execute(sqlstmt, sqldata):
+        dhash = ''.join([str(row[1]), str(row[2]), str(row[3]),
+                         str(row[4])])
+        tHash = sdb_object.hash(bytes(dhash, 'utf-8'))
+        yield {'ID': row[0],
+               'Verified': tHash == str(row[5]),
+               'RecordedHash': str(row[5]),
+               'ComputedHash': tHash}
+
+def auditBlockchainFlow(sdb_object, from_id=None, to_id=None,
+                        since=None, until=None):
+    '''!
+    Function to compare the parent data in each block with its parent
+    block (the first block in range is compared with the block before
+    the range), in a single pass over the blockchain, as a generator
+    of results.
+
+    Each result is a dictionary with the following keys - ID (block
+    ID), ParentID (ID of the preceding block), Verified, Parent
+    (parent ID, date time stamp, random string and hash recorded in
+    the block) and Actual (ID, date time stamp, random string and
+    hash of the preceding block).
+
+    @param sdb_object Object: SEREBO database object.
+    @param from_id Integer: First block ID (inclusive). Default =
+    None.
+    @param to_id Integer: Last block ID (inclusive). Default = None.
+    @param since Object: Earliest time (inclusive). Default = None.
+    @param until Object: Latest time (exclusive). Default = None.
+    @return: Generator of results.
+    '''
+    (clause, sqldata) = serebo_api.scopeClause('c_ID', 'c_dtstamp_us',
+                                               from_id, to_id,
+                                               since, until)
+    sqlstmt = 'select min(c_ID) from blockchain where %s' % clause
+    minID = [row for row in
+             sdb_object.conn.execute(sqlstmt, sqldata)][0][0]
+    parent = None
+    if minID is not None and int(minID) > 1:
+        # Boundary linkage - the first block in range is traced to its
+        # parent block
+        sqlstmt = '''select c_ID, c_dtstamp, c_randomstring, c_hash
+            from blockchain where c_ID=?'''
+        p_data = [row for row in
+                  sdb_object.conn.execute(sqlstmt, (int(minID) - 1,))]
+        if p_data:
+            parent = tuple(str(x) for x in p_data[0])
+    sqlstmt = '''select c_ID, c_dtstamp, c_randomstring, c_hash, p_ID,
+        p_dtstamp, p_randomstring, p_hash from blockchain where %s
+        order by c_ID''' % clause
+    for row in sdb_object.conn.execute(sqlstmt, sqldata):
+        if parent is not None:
+            recorded = tuple(str(x) for x in row[4:8])
+            yield {'ID': row[0],
+                   'ParentID': parent[0],
+                   'Verified': recorded == parent,
+                   'Parent': recorded,
+                   'Actual': parent}
+        parent = tuple(str(x) for x in row[0:4])
+
+def auditMerkle(sdb_object, from_id=None, to_id=None, since=None,
+                until=None):
+    '''!
+    Function to recompute the Merkle root of each Merkle batch block
+    from the data log hashes of its batch, as a generator of results.
+
+    Each result is a dictionary with the following keys - ID (block
+    ID), StartID and EndID (data log IDs of the batch), Verified,
+    ComputedRoot, RecordedRoot (Merkle root in merkleblock table) and
+    BlockData (data in blockchain).
+
+    @param sdb_object Object: SEREBO database object.
+    @param from_id Integer: First block ID (inclusive). Default =
+    None.
+    @param to_id Integer: Last block ID (inclusive). Default = None.
+    @param since Object: Earliest time (inclusive). Default = None.
+    @param until Object: Latest time (exclusive). Default = None.
+    @return: Generator of results.
+    '''
+    (clause, sqldata) = serebo_api.scopeClause(
+        'merkleblock.c_ID', 'blockchain.c_dtstamp_us', from_id, to_id,
+        since, until)
+    sqlstmt = '''select merkleblock.c_ID, merkleblock.start_ID,
+        merkleblock.end_ID, merkleblock.root, blockchain.data from
+        merkleblock inner join blockchain where
+        merkleblock.c_ID=blockchain.c_ID and %s''' % clause
+    leafstmt = '''select hash from datalog where ID >= ? and ID <= ?
+        order by ID'''
+    for row in sdb_object.conn.execute(sqlstmt, sqldata):
+        leaves = [str(x[0]) for x in
+                  sdb_object.conn.execute(leafstmt, (row[1], row[2]))]
+        tRoot = merkle.merkleRoot(leaves) if leaves else None
+        yield {'ID': row[0],
+               'StartID': row[1],
+               'EndID': row[2],
+               'Verified': tRoot == str(row[3]) and
+               tRoot == str(row[4]),
+               'ComputedRoot': tRoot,
+               'RecordedRoot': str(row[3]),
+               'BlockData': str(row[4])}
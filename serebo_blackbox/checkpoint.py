@@ -0,0 +1,247 @@
+'''!
+Secured Recorder Box (SEREBO) Blockchain Checkpoints
+
+Date created: 19th October 2026
+
+License: GNU General Public License version 3 for academic or
+not-for-profit use only
+
+
+SEREBO is free software: you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+'''
+from . import merkle
+from . import sereboDB
+
+genesisHash = 'TheWord:OmAhHum'
+
+def checkpointHash(p_hash, start_cID, end_cID, accumulator):
+    '''!
+    Function to generate the hash of a checkpoint, which chains the
+    checkpoint to its previous checkpoint.
+
+    @param p_hash String: Hash of previous checkpoint.
+    @param start_cID Integer: First block ID covered by checkpoint.
+    @param end_cID Integer: Last block ID covered by checkpoint.
+    @param accumulator String: Merkle root of the hashes of blocks
+    covered by checkpoint.
+    @return: Hash
+    '''
+    return sereboDB.multiHash('>'.join(['Checkpoint', str(p_hash),
+                                        str(int(start_cID)),
+                                        str(int(end_cID)),
+                                        str(accumulator)]))
+
+def blockHash(p_dtstamp, p_randomstring, p_hash, data):
+    '''!
+    Function to generate the hash of a block from its parent data and
+    its data, as in Step 4 of insert data into SEREBO black box.
+
+    @return: Hash
+    '''
+    hashdata = ''.join([str(p_dtstamp), str(p_randomstring),
+                        str(p_hash), str(data)])
+    return sereboDB.multiHash(bytes(hashdata, 'utf-8'))
+
+def accumulator(sdb_object, start_cID, end_cID):
+    '''!
+    Function to compute the accumulator (Merkle root of block hashes)
+    over a range of blocks from the block hashes in blockchain.
+
+    @param sdb_object Object: SEREBO database object.
+    @param start_cID Integer: First block ID.
+    @param end_cID Integer: Last block ID.
+    @return: Merkle root, or None if any block in the range is
+    missing.
+    '''
+    sqlstmt = '''select c_hash from blockchain where c_ID >= ? and
+        c_ID <= ? order by c_ID'''
+    leaves = [str(row[0]) for row in
+              sdb_object.cur.execute(sqlstmt, (int(start_cID),
+                                               int(end_cID)))]
+    if len(leaves) != int(end_cID) - int(start_cID) + 1:
+        return None
+    return merkle.merkleRoot(leaves)
+
+def _checkpoints(sdb_object, end_cID=None):
+    '''!
+    Private function - gets the checkpoints (ID, start_cID, end_cID,
+    accumulator, p_hash, hash) in order, up to the checkpoint covering
+    the given block ID.
+    '''
+    sqlstmt = '''select ID, start_cID, end_cID, accumulator, p_hash,
+        hash from checkpoint order by ID'''
+    results = []
+    for row in sdb_object.cur.execute(sqlstmt):
+        results.append((int(row[0]), int(row[1]), int(row[2]),
+                        str(row[3]), str(row[4]), str(row[5])))
+        if end_cID is not None and int(row[2]) >= int(end_cID):
+            break
+    return results
+
+def _chainErrors(checkpoints):
+    '''!
+    Private function - checks the chaining of checkpoints (previous
+    hash, contiguous block ranges and checkpoint hash), and returns
+    the list of checkpoint IDs failing the check.
+    '''
+    errors = []
+    p_hash = genesisHash
+    p_end = 0
+    for (ID, start, end, acc, cp_phash, cp_hash) in checkpoints:
+        if (cp_phash != p_hash) or (start != p_end + 1) or \
+            (checkpointHash(cp_phash, start, end, acc) != cp_hash):
+            errors.append(ID)
+        p_hash = cp_hash
+        p_end = end
+    return errors
+
+def _blockErrors(sdb_object, start_cID, end_cID):
+    '''!
+    Private function - recomputes the hash of each block in a range
+    and checks its linkage to its parent block, and returns the list
+    of block IDs failing the check.
+    '''
+    sqlstmt = '''select c_ID, c_dtstamp, c_randomstring, c_hash, p_ID,
+        p_dtstamp, p_randomstring, p_hash, data from blockchain where
+        c_ID >= ? and c_ID <= ? order by c_ID'''
+    start_cID = int(start_cID)
+    parent = None
+    if start_cID > 1:
+        sqlstmt0 = '''select c_ID, c_dtstamp, c_randomstring, c_hash
+            from blockchain where c_ID=?'''
+        result = [row for row in
+                  sdb_object.cur.execute(sqlstmt0, (start_cID - 1,))]
+        if result:
+            parent = tuple([str(x) for x in result[0]])
+    else:
+        parent = ('0', '0', 'GenesisBlock:SEREBO_MauriceHTLing',
+                  genesisHash)
+    errors = []
+    expected = start_cID
+    for row in [row for row in
+                sdb_object.cur.execute(sqlstmt, (start_cID,
+                                                 int(end_cID)))]:
+        row = [str(x) for x in row]
+        while expected < int(row[0]):
+            errors.append(expected)
+            expected = expected + 1
+            parent = None
+        linked = (parent is not None) and \
+                 (tuple(row[4:8]) == parent)
+        if not linked or \
+            blockHash(row[5], row[6], row[7], row[8]) != row[3]:
+            errors.append(int(row[0]))
+        parent = tuple(row[0:4])
+        expected = int(row[0]) + 1
+    while expected <= int(end_cID):
+        errors.append(expected)
+        expected = expected + 1
+    return errors
+
+def auditCheckpoints(sdb_object):
+    '''!
+    Function to audit all checkpoints in SEREBO black box - the
+    chaining of checkpoints and the accumulator of each checkpoint
+    (recomputed from the block hashes in blockchain).
+
+    @param sdb_object Object: SEREBO database object.
+    @return: Dictionary of audit results - Verified is the number of
+    verified checkpoints and Errors is the list of checkpoint IDs
+    failing the audit.
+    '''
+    checkpoints = _checkpoints(sdb_object)
+    errors = _chainErrors(checkpoints)
+    for (ID, start, end, acc, cp_phash, cp_hash) in checkpoints:
+        if ID not in errors and \
+            accumulator(sdb_object, start, end) != acc:
+            errors.append(ID)
+    return {'Verified': len(checkpoints) - len(errors),
+            'Errors': sorted(errors)}
+
+def verifyRange(sdb_object, start_cID=1, end_cID=None):
+    '''!
+    Function to verify a range of blocks in blockchain using the
+    checkpoints, without walking every block in the range. Only (1)
+    the chain of checkpoints up to the end of range, (2) the
+    accumulators of the checkpoints covering the ends of range, (3)
+    the hashes and parent linkage of the blocks at the ends of range,
+    and (4) each block after the last checkpoint (not covered by any
+    checkpoint) are checked. The blocks within the range are covered
+    by the chain of checkpoints, which is recorded incrementally at
+    insertion time; use auditCheckpoints() function to recompute the
+    accumulators of all checkpoints.
+
+    A dictionary of results will be returned with the following keys
+    - Start, End (the range verified), Checkpoints (number of
+    checkpoints checked), CheckpointChain, EndAccumulators, EndBlocks,
+    UncoveredBlocks (number of blocks walked after the last
+    checkpoint), UncoveredFlow, Errors (list of failing checkpoint
+    IDs as 'Checkpoint <ID>' and block IDs as 'Block <ID>') and
+    Verified (True only if all checks are True).
+
+    @param sdb_object Object: SEREBO database object.
+    @param start_cID Integer: First block ID of range. Default = 1.
+    @param end_cID Integer: Last block ID of range. Default = None
+    (latest block).
+    @return: Dictionary of verification results.
+    '''
+    sqlstmt = 'select max(c_ID) from blockchain'
+    max_cID = [row for row in sdb_object.cur.execute(sqlstmt)][0][0]
+    max_cID = int(max_cID or 0)
+    start_cID = max(1, int(start_cID or 1))
+    if end_cID is None:
+        end_cID = max_cID
+    end_cID = min(int(end_cID), max_cID)
+    rdat = {'Start': start_cID, 'End': end_cID, 'Errors': []}
+    if end_cID < start_cID:
+        rdat['Verified'] = False
+        rdat['Errors'].append('Empty range')
+        return rdat
+    checkpoints = _checkpoints(sdb_object, end_cID)
+    rdat['Checkpoints'] = len(checkpoints)
+    errors = _chainErrors(checkpoints)
+    rdat['CheckpointChain'] = len(errors) == 0
+    # Accumulators of checkpoints covering the ends of range
+    covering = [cp for cp in checkpoints
+                if (cp[1] <= start_cID <= cp[2]) or
+                   (cp[1] <= end_cID <= cp[2])]
+    for (ID, start, end, acc, cp_phash, cp_hash) in covering:
+        if accumulator(sdb_object, start, end) != acc:
+            errors.append(ID)
+    rdat['EndAccumulators'] = all([cp[0] not in errors
+                                   for cp in covering])
+    rdat['Errors'] = ['Checkpoint %s' % str(x)
+                      for x in sorted(set(errors))]
+    # Blocks at the ends of range
+    blockerrors = _blockErrors(sdb_object, start_cID, start_cID) + \
+                  _blockErrors(sdb_object, end_cID, end_cID)
+    rdat['EndBlocks'] = len(blockerrors) == 0
+    # Blocks after the last checkpoint
+    covered = 0
+    if checkpoints:
+        covered = checkpoints[-1][2]
+    tail = max(start_cID, covered + 1)
+    tailerrors = []
+    if tail <= end_cID:
+        tailerrors = _blockErrors(sdb_object, tail, end_cID)
+    rdat['UncoveredBlocks'] = max(0, end_cID - tail + 1)
+    rdat['UncoveredFlow'] = len(tailerrors) == 0
+    rdat['Errors'] = rdat['Errors'] + \
+        ['Block %s' % str(x)
+         for x in sorted(set(blockerrors + tailerrors))]
+    rdat['Verified'] = rdat['CheckpointChain'] and \
+                       rdat['EndAccumulators'] and \
+                       rdat['EndBlocks'] and \
+                       rdat['UncoveredFlow']
+    return rdat
@@ -0,0 +1,296 @@
+'''!
+Secured Recorder Box (SEREBO) Chunked File Hashing
+
+Date created: 19th October 2026
+
+License: GNU General Public License version 3 for academic or
+not-for-profit use only
+
+
+SEREBO is free software: you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+In chunked mode, a file is divided into fixed-size chunks (the last
+chunk may be shorter), each chunk is hashed by a hash backend (see
+hashers module), and the file hash is the Merkle root (see merkle
+module) of the chunk digests, in the format of
+chunks:<backend>:<chunk size>:<Merkle root>. The chunks are hashed in
+parallel threads.
+
+The list of chunks (offset, length and digest of each chunk) of a
+logged file is kept in filechunks table, keyed by the file hash -
+the list can be checked against the logged file hash (by its Merkle
+root) before use. Hence, a file can be verified chunk by chunk in
+parallel, stopping at the first changed chunk and giving its
+location; and the chunks of a file which has been appended to can be
+reused when it is hashed again.
+'''
+import os
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from . import hashers
+from . import merkle
+
+## Default chunk size (16 MiB)
+defaultChunkSize = 16777216
+
+## Prefix of chunked file hashes
+prefix = 'chunks'
+
+def parseSize(size):
+    '''!
+    Function to convert a size, as number of bytes or with K, M or G
+    suffix (such as '64M'; binary units), into number of bytes.
+
+    @param size Object: Size.
+    @return: Number of bytes.
+    '''
+    size = str(size).strip().upper()
+    units = {'K': 1024, 'M': 1048576, 'G': 1073741824}
+    if size and size[-1] in units:
+        return int(float(size[:-1]) * units[size[-1]])
+    return int(size)
+
+def isChunked(fHash):
+    '''!
+    Function to check whether a file hash is a chunked file hash.
+
+    @param fHash String: File hash.
+    @return: Boolean
+    '''
+    return str(fHash).startswith(prefix + ':')
+
+def parseChunked(fHash):
+    '''!
+    Function to split a chunked file hash into its hash backend,
+    chunk size and Merkle root.
+
+    @param fHash String: Chunked file hash.
+    @return: (name of hash backend, chunk size, Merkle root)
+    '''
+    parts = str(fHash).split(':', 3)
+    if len(parts) != 4 or parts[0] != prefix:
+        raise ValueError('Not a chunked file hash: %s' %
+                         str(fHash)[:64])
+    return (parts[1], int(parts[2]), parts[3])
+
+def chunkedHash(backend, chunksize, digests):
+    '''!
+    Function to generate the chunked file hash from chunk digests.
+
+    @param backend String: Name of hash backend.
+    @param chunksize Integer: Chunk size.
+    @param digests List: Chunk digests, in the order of chunks.
+    @return: Chunked file hash.
+    '''
+    return '%s:%s:%s:%s' % (prefix, str(backend), str(int(chunksize)),
+                            merkle.merkleRoot(digests))
+
+def chunkDigest(absPath, offset, length, backend=None):
+    '''!
+    Function to hash a chunk of a file.
+
+    @param absPath String: Absolute path of file.
+    @param offset Integer: Offset of chunk.
+    @param length Integer: Length of chunk.
+    @param backend String: Name of hash backend. Default = None
+    (serebo12).
+    @return: Chunk digest.
+    '''
+    hasher = hashers.getBackend(backend)
+    hashobj = hasher.new()
+    buffer = bytearray(min(hasher.blocksize, max(length, 1)))
+    view = memoryview(buffer)
+    remaining = length
+    with open(absPath, 'rb') as f:
+        f.seek(offset)
+        while remaining > 0:
+            count = f.readinto(view[:min(remaining, len(buffer))])
+            if not count:
+                break
+            hashobj.update(view[:count])
+            remaining = remaining - count
+    return hasher.digest(hashobj)
+
+def _chunkRanges(size, chunksize, start=0):
+    '''!
+    Private function - generates (offset, length) of the chunks of a
+    file of the given size, from the given offset.
+    '''
+    ranges = [(offset, min(chunksize, size - offset))
+              for offset in range(start, size, chunksize)]
+    if not ranges and start == 0:
+        # An empty file has one empty chunk
+        ranges = [(0, 0)]
+    return ranges
+
+def chunkFile(filepath, backend=None, chunksize=defaultChunkSize,
+              workers=None, reuse=None):
+    '''!
+    Function to hash a file in chunks (in parallel threads).
+
+    @param filepath String: Path of file.
+    @param backend String: Name of hash backend. Default = None
+    (serebo12).
+    @param chunksize Integer: Chunk size. Default = 16 MiB.
+    @param workers Integer: Number of threads. Default = None (uses
+    ThreadPoolExecutor default).
+    @param reuse List: Chunks of an earlier version of the file
+    (from loadChunks()) with the same hash backend and chunk size -
+    full chunks are reused without hashing (for a file which had only
+    been appended to). Default = None.
+    @return: (chunked file hash, list of (offset, length, digest) of
+    chunks)
+    '''
+    absPath = os.path.abspath(filepath)
+    backend = hashers.getBackend(backend).name
+    chunksize = int(chunksize)
+    if chunksize <= 0:
+        raise ValueError('Chunk size must be positive')
+    size = os.path.getsize(absPath)
+    chunks = []
+    for (offset, length, digest) in (reuse or []):
+        if length != chunksize or offset + length > size or \
+                offset != len(chunks) * chunksize:
+            break
+        chunks.append((offset, length, digest))
+    ranges = _chunkRanges(size, chunksize, len(chunks) * chunksize)
+    with ThreadPoolExecutor(workers) as executor:
+        digests = executor.map(lambda x: chunkDigest(absPath, x[0],
+                                                     x[1], backend),
+                               ranges)
+        chunks = chunks + [(offset, length, digest) for
+                           ((offset, length), digest) in
+                           zip(ranges, digests)]
+    fHash = chunkedHash(backend, chunksize, [x[2] for x in chunks])
+    return (fHash, chunks)
+
+def createTable(sdb_object):
+    '''!
+    Function to create filechunks table (if it does not exist).
+
+    @param sdb_object Object: SEREBO database object.
+    '''
+    sqlstmt = '''
+    create table if not exists filechunks (
+        fhash text not null,
+        seq integer not null,
+        offset integer not null,
+        length integer not null,
+        digest text not null,
+        primary key (fhash, seq)) without rowid;'''
+    sdb_object.cur.execute(sqlstmt)
+    sdb_object.conn.commit()
+
+def storeChunks(sdb_object, fHash, chunks):
+    '''!
+    Function to keep the chunks of a chunked file hash in filechunks
+    table.
+
+    @param sdb_object Object: SEREBO database object.
+    @param fHash String: Chunked file hash.
+    @param chunks List: List of (offset, length, digest) of chunks.
+    '''
+    createTable(sdb_object)
+    sqlstmt = '''insert or ignore into filechunks (fhash, seq, offset,
+        length, digest) values (?,?,?,?,?)'''
+    sdb_object.cur.executemany(sqlstmt,
+                               [(str(fHash), seq) + tuple(chunk)
+                                for (seq, chunk) in enumerate(chunks)])
+    sdb_object.conn.commit()
+
+def loadChunks(sdb_object, fHash):
+    '''!
+    Function to get the chunks of a chunked file hash from
+    filechunks table. The chunks are checked against the file hash
+    (by their Merkle root).
+
+    @param sdb_object Object: SEREBO database object.
+    @param fHash String: Chunked file hash.
+    @return: List of (offset, length, digest) of chunks, or None if
+    the chunks are not found or do not match the file hash.
+    '''
+    createTable(sdb_object)
+    sqlstmt = '''select offset, length, digest from filechunks where
+        fhash=? order by seq'''
+    chunks = [(int(row[0]), int(row[1]), str(row[2]))
+              for row in sdb_object.cur.execute(sqlstmt,
+                                                (str(fHash),))]
+    if not chunks:
+        return None
+    (backend, chunksize, root) = parseChunked(fHash)
+    if chunkedHash(backend, chunksize,
+                   [x[2] for x in chunks]) != str(fHash):
+        return None
+    return chunks
+
+def verifyChunks(filepath, fHash, chunks, workers=None):
+    '''!
+    Function to verify a file chunk by chunk (in parallel threads)
+    against the chunks of its chunked file hash, stopping once the
+    first changed chunk is known (chunks after a changed chunk are
+    not hashed, but chunks before it still are).
+
+    A dictionary will be returned with the following keys - Verified
+    (True if the file is unchanged), Size (file size), ExpectedSize
+    (size from chunks), ChunksChecked (number of chunks hashed) and
+    BadChunk (None, or (number, offset, length) of the first changed
+    chunk; (None, offset, None) if only the size differs).
+
+    @param filepath String: Path of file.
+    @param fHash String: Chunked file hash.
+    @param chunks List: List of (offset, length, digest) of chunks
+    (from loadChunks()).
+    @param workers Integer: Number of threads. Default = None (uses
+    ThreadPoolExecutor default).
+    @return: Dictionary of verification results.
+    '''
+    absPath = os.path.abspath(filepath)
+    (backend, chunksize, root) = parseChunked(fHash)
+    size = os.path.getsize(absPath)
+    expected = sum([x[1] for x in chunks])
+    rdat = {'Verified': False, 'Size': size, 'ExpectedSize': expected,
+            'ChunksChecked': 0, 'BadChunk': None}
+    bad = []
+    with ThreadPoolExecutor(workers) as executor:
+        pending = dict([(executor.submit(chunkDigest, absPath,
+                                         offset, length, backend),
+                         seq)
+                        for (seq, (offset, length, digest))
+                        in enumerate(chunks)
+                        if offset + length <= size])
+        while pending:
+            (done, _) = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                seq = pending.pop(future)
+                rdat['ChunksChecked'] = rdat['ChunksChecked'] + 1
+                if future.result() != chunks[seq][2]:
+                    bad.append(seq)
+            if bad:
+                # Only chunks before the first changed chunk found can
+                # change the result; later chunks not yet started are
+                # not hashed
+                for future in [future for future in pending
+                               if pending[future] > min(bad)]:
+                    future.cancel()
+                    pending.pop(future)
+    if bad:
+        seq = min(bad)
+        rdat['BadChunk'] = (seq, chunks[seq][0], chunks[seq][1])
+    elif size != expected:
+        rdat['BadChunk'] = (None, min(size, expected), None)
+    else:
+        rdat['Verified'] = True
+    return rdat
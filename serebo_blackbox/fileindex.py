@@ -0,0 +1,324 @@
+'''!
+Secured Recorder Box (SEREBO) File Index
+
+Date created: 19th October 2026
+
+License: GNU General Public License version 3 for academic or
+not-for-profit use only
+
+
+SEREBO is free software: you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+The file index (fileindex table) maps the absolute path of each
+logged file (from the description of file logging records in
+datalog) to its latest file logging record and file hash. The file
+index is derived from datalog - it is brought up to date with the
+records added since it was last updated (the last indexed datalog ID
+is kept as fileindex_last_ID in metadata table) before it is used;
+hence, it does not need to be maintained by each data insertion.
+
+When a file is verified to be unchanged, its size, modification time
+(in nanoseconds), inode and device are kept in the file index. A file
+with the same size, modification time, inode and device at the next
+verification is taken to be unchanged without hashing, and a file
+with a different size is taken to be changed without hashing. As
+with the file hash cache (see hashcache module), the stat is only
+kept if the file was not modified shortly before its verification.
+'''
+import os
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import hashers
+from . import serebo_api
+
+## Minimum number of seconds between the modification of a file and
+## its verification for its stat to be kept in file index (a file
+## changed within the same modification time tick as it was verified
+## cannot be detected by its stat)
+racyWindow = 2.0
+
+def createIndex(sdb_object):
+    '''!
+    Function to create fileindex table (if it does not exist).
+
+    @param sdb_object Object: SEREBO database object.
+    '''
+    sqlstmt = '''
+    create table if not exists fileindex (
+        path text primary key,
+        ID integer not null,
+        fhash text not null,
+        size integer,
+        mtime_ns integer,
+        inode integer,
+        device integer);'''
+    sdb_object.cur.execute(sqlstmt)
+    sdb_object.conn.commit()
+
+def updateIndex(sdb_object, pagesize=10000):
+    '''!
+    Function to bring the file index up to date with the file logging
+    records added into datalog since the file index was last updated.
+
+    @param sdb_object Object: SEREBO database object.
+    @param pagesize Integer: Number of datalog records read at a time.
+    Default = 10000.
+    @return: Number of file logging records indexed.
+    '''
+    createIndex(sdb_object)
+    sqlstmt = '''select value from metadata where
+        key='fileindex_last_ID' '''
+    last_ID = [int(row[0]) for row in sdb_object.cur.execute(sqlstmt)]
+    last_ID = last_ID[0] if last_ID else 0
+    sqlstmt = '''select ID, data, description from datalog where
+        ID > ? and description like '%AbsolutePath%' order by ID
+        limit ?'''
+    # A newer record of a path replaces its file hash, and the stat
+    # of its last verification
+    upsert = '''insert into fileindex (path, ID, fhash) values (?,?,?)
+        on conflict(path) do update set ID=excluded.ID,
+        fhash=excluded.fhash, size=null, mtime_ns=null, inode=null,
+        device=null where excluded.ID > fileindex.ID'''
+    count = 0
+    while True:
+        rows = [row for row in sdb_object.cur.execute(sqlstmt,
+                                                      (last_ID,
+                                                       pagesize))]
+        if not rows:
+            break
+        sqldata = []
+        for row in rows:
+            absPath = serebo_api.parseFileDescription(row[2]).get(
+                'AbsolutePath')
+            if absPath:
+                sqldata.append((absPath, int(row[0]), str(row[1])))
+        sdb_object.cur.executemany(upsert, sqldata)
+        count = count + len(sqldata)
+        last_ID = int(rows[-1][0])
+        sdb_object.cur.execute('''insert or replace into metadata
+            (key, value) values ('fileindex_last_ID', ?)''',
+                               (str(last_ID),))
+        sdb_object.conn.commit()
+    return count
+
+def lookupFile(sdb_object, filepath):
+    '''!
+    Function to get the latest file logging record of a file from the
+    file index (the file index is not updated).
+
+    A dictionary will be returned with the following keys - ID
+    (datalog ID of the latest file logging record), FileHash (logged
+    file hash), HashBackend, Size, MTimeNS, Inode and Device (stat of
+    the file when it was last verified to be unchanged; None if not
+    verified).
+
+    @param sdb_object Object: SEREBO database object.
+    @param filepath String: Path of file.
+    @return: Dictionary of file logging record, or None if the file
+    had not been logged.
+    '''
+    sqlstmt = '''select ID, fhash, size, mtime_ns, inode, device from
+        fileindex where path=?'''
+    absPath = serebo_api.absolutePath(filepath)
+    result = [row for row in sdb_object.cur.execute(sqlstmt,
+                                                    (absPath,))]
+    if not result:
+        return None
+    return _entry(result[0])
+
+def _entry(row):
+    '''!
+    Private function - converts a row of fileindex table (from ID
+    column) into a dictionary.
+    '''
+    return {'ID': int(row[0]),
+            'FileHash': str(row[1]),
+            'HashBackend': hashers.backendOf(row[1]),
+            'Size': row[2],
+            'MTimeNS': row[3],
+            'Inode': row[4],
+            'Device': row[5]}
+
+def _indexedUnder(sdb_object, root):
+    '''!
+    Private function - gets the file index entries of the files
+    under a directory, as a dictionary of path to entry.
+    '''
+    prefix = os.path.join(root, '')
+    # Range over the primary key - paths starting with prefix
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    sqlstmt = '''select path, ID, fhash, size, mtime_ns, inode,
+        device from fileindex where path >= ? and path < ?'''
+    return dict([(str(row[0]), _entry(row[1:]))
+                 for row in sdb_object.cur.execute(sqlstmt,
+                                                   (prefix, upper))])
+
+def _walk(root):
+    '''!
+    Private function - generates the absolute paths and stats of
+    regular files under a directory (symbolic links to directories
+    are not followed).
+    '''
+    for (dirpath, dirnames, filenames) in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            absPath = os.path.join(dirpath, filename)
+            try:
+                st = os.stat(absPath)
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                yield (absPath, st)
+
+def _statMatches(entry, st):
+    '''!
+    Private function - checks whether the stat of a file is the same
+    as the stat kept in file index when it was last verified.
+    '''
+    return entry['Size'] == st.st_size and \
+        entry['MTimeNS'] == st.st_mtime_ns and \
+        entry['Inode'] == st.st_ino and \
+        entry['Device'] == st.st_dev
+
+def verifyTree(sdb_object, root, workers=None, cache=None,
+               rehash=False, missing=True, batchsize=256):
+    '''!
+    Function to verify the files under a directory against their
+    latest file logging records, as a generator of results (in the
+    order of directory walk, followed by missing files). The file
+    index is updated before verification.
+
+    Each file is checked in the following order: (1) a file not in
+    the file index is unknown; (2) a file with a different size from
+    its last verification is changed; (3) a file with the same size,
+    modification time, inode and device as its last verification is
+    unchanged; and (4) other files are hashed (in multiple threads,
+    using the file hash cache if given) in the same way as the logged
+    file hash (see serebo_api.fileHashAs()) and compared with the
+    logged file hash.
+
+    Each result is a dictionary with the following keys - Path
+    (absolute path of file), Status ('changed', 'unchanged', 'unknown'
+    or 'missing' (logged file which no longer exists)), ID (datalog ID
+    of the latest file logging record; None for unknown files), and
+    CheckedBy ('index' (no file logging record), 'prefilter' (size
+    and modification time), 'hash' or 'walk' (missing file)).
+
+    @param sdb_object Object: SEREBO database object.
+    @param root String: Path of directory to verify.
+    @param workers Integer: Number of threads for file hashing.
+    Default = None (uses ThreadPoolExecutor default).
+    @param cache Object: File hash cache (hashcache.HashCache object).
+    Default = None (no cache).
+    @param rehash Boolean: Flag to hash every logged file (without
+    the size and modification time prefilter and the file hash
+    cache). Default = False.
+    @param missing Boolean: Flag to report logged files which no
+    longer exist. Default = True.
+    @param batchsize Integer: Number of files to hash in parallel at a
+    time. Default = 256.
+    @return: Generator of results.
+    '''
+    root = serebo_api.absolutePath(root)
+    updateIndex(sdb_object)
+    indexed = _indexedUnder(sdb_object, root)
+    verified = '''update fileindex set size=?, mtime_ns=?, inode=?,
+        device=? where path=? and ID=?'''
+    with ThreadPoolExecutor(workers) as executor:
+        pending = []
+        for (absPath, st) in _walk(root):
+            entry = indexed.pop(absPath, None)
+            if entry is None:
+                result = {'Path': absPath, 'Status': 'unknown',
+                          'ID': None, 'CheckedBy': 'index'}
+            elif rehash or entry['Size'] is None:
+                result = None
+            elif entry['Size'] != st.st_size:
+                result = {'Path': absPath, 'Status': 'changed',
+                          'ID': entry['ID'], 'CheckedBy': 'prefilter'}
+            elif _statMatches(entry, st):
+                result = {'Path': absPath, 'Status': 'unchanged',
+                          'ID': entry['ID'], 'CheckedBy': 'prefilter'}
+            else:
+                result = None
+            if result is None:
+                future = executor.submit(serebo_api.fileHashAs,
+                                         absPath, entry['FileHash'],
+                                         cache, rehash)
+                pending.append((absPath, st, entry, future))
+            elif not pending:
+                yield result
+                continue
+            else:
+                pending.append((absPath, st, entry, result))
+            if len(pending) < batchsize:
+                continue
+            for result in _collect(sdb_object, pending, verified):
+                yield result
+            pending = []
+        for result in _collect(sdb_object, pending, verified):
+            yield result
+    if missing:
+        for absPath in sorted(indexed):
+            yield {'Path': absPath, 'Status': 'missing',
+                   'ID': indexed[absPath]['ID'], 'CheckedBy': 'walk'}
+
+def _stable(absPath, st):
+    '''!
+    Private function - checks that a file had not changed since its
+    stat was taken, and was not modified within racyWindow seconds.
+    '''
+    try:
+        current = os.stat(absPath)
+    except OSError:
+        return False
+    return _statMatches({'Size': st.st_size,
+                         'MTimeNS': st.st_mtime_ns,
+                         'Inode': st.st_ino,
+                         'Device': st.st_dev}, current) and \
+        time.time() - (st.st_mtime_ns / 1e9) >= racyWindow
+
+def _collect(sdb_object, pending, verified):
+    '''!
+    Private function - gets the results of a batch of files (in
+    order) in verifyTree(), and keeps the stat of each file verified
+    to be unchanged by hashing in file index.
+    '''
+    results = []
+    sqldata = []
+    for (absPath, st, entry, item) in pending:
+        if isinstance(item, dict):
+            results.append(item)
+            continue
+        try:
+            fHash = item.result()
+        except OSError:
+            results.append({'Path': absPath, 'Status': 'missing',
+                            'ID': entry['ID'], 'CheckedBy': 'hash'})
+            continue
+        if fHash == entry['FileHash']:
+            status = 'unchanged'
+            if _stable(absPath, st):
+                sqldata.append((st.st_size, st.st_mtime_ns, st.st_ino,
+                                st.st_dev, absPath, entry['ID']))
+        else:
+            status = 'changed'
+        results.append({'Path': absPath, 'Status': status,
+                        'ID': entry['ID'], 'CheckedBy': 'hash'})
+    if sqldata:
+        sdb_object.cur.executemany(verified, sqldata)
+        sdb_object.conn.commit()
+    return results
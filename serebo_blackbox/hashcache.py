@@ -0,0 +1,239 @@
+'''!
+Secured Recorder Box (SEREBO) File Hash Cache
+
+Date created: 19th October 2026
+
+License: GNU General Public License version 3 for academic or
+not-for-profit use only
+
+
+SEREBO is free software: you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+Hashing large files is the main cost of logging and searching files.
+The file hash cache is an optional sidecar SQLite database (kept
+separately from SEREBO black box, which only records what was
+logged) remembering the file hashes already generated, keyed by
+device, inode, size and modification time (in nanoseconds) of the
+file, and the hash backend. A file which has not changed since it
+was last hashed gives the same key; hence, its hash is taken from the
+cache instead of reading the file.
+
+As with other tools trusting file modification times, a file changed
+within the same modification time tick as it was hashed cannot be
+detected. Hence, a file hash is only cached if the file has not
+changed while being hashed and was last modified at least racywindow
+seconds before it was hashed. Files can always be re-hashed (and the
+cache refreshed) with rehash option.
+'''
+import os
+import sqlite3
+import threading
+import time
+
+from . import hashers
+
+def defaultCachePath(bbpath):
+    '''!
+    Function to generate the path of the default file hash cache for
+    a SEREBO black box - the path of black box suffixed with
+    '-hashcache'.
+
+    @param bbpath String: Path to SEREBO black box.
+    @return: Path of file hash cache.
+    '''
+    return os.path.abspath(bbpath) + '-hashcache'
+
+class HashCache(object):
+    '''!
+    Class representing a file hash cache. A cache can be shared by
+    multiple threads.
+
+    Usage:
+
+        cache = HashCache(defaultCachePath('blackbox.sdb'))
+        fHash = cache.fileHash('data.csv')
+    '''
+    def __init__(self, path, racywindow=2.0):
+        '''!
+        Initiation method - opens (or creates) the file hash cache.
+
+        @param path String: Path of file hash cache.
+        @param racywindow Float: Minimum number of seconds between the
+        modification of a file and its hashing for the hash to be
+        cached. Default = 2.0.
+        '''
+        self.path = os.path.abspath(path)
+        self.racywindow = float(racywindow)
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.bytesSkipped = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path,
+                                    check_same_thread=False)
+        self.cur = self.conn.cursor()
+        sqlstmt = '''
+        create table if not exists filehash (
+            device integer not null,
+            inode integer not null,
+            size integer not null,
+            mtime_ns integer not null,
+            backend text not null,
+            fhash text not null,
+            path text not null,
+            hashed real not null,
+            primary key (device, inode, size, mtime_ns, backend))
+            without rowid;'''
+        self.cur.execute(sqlstmt)
+        self.conn.commit()
+
+    def close(self):
+        '''!
+        Method to close the file hash cache.
+        '''
+        with self._lock:
+            self.conn.close()
+
+    def _key(self, st, backend):
+        '''!
+        Private method - generates the cache key of a file from its
+        os.stat() result.
+        '''
+        return (int(st.st_dev), int(st.st_ino), int(st.st_size),
+                int(st.st_mtime_ns), str(backend))
+
+    def lookup(self, filepath, backend=None):
+        '''!
+        Method to get the cached hash of a file, without hashing the
+        file.
+
+        @param filepath String: Path of file.
+        @param backend String: Name of hash backend. Default = None
+        (serebo12).
+        @return: Hash, or None if the file is not in the cache or had
+        changed since it was hashed.
+        '''
+        backend = hashers.getBackend(backend).name
+        st = os.stat(filepath)
+        return self._lookup(self._key(st, backend))
+
+    def _lookup(self, key):
+        '''!
+        Private method - gets the cached hash of a cache key.
+        '''
+        sqlstmt = '''select fhash from filehash where device=? and
+            inode=? and size=? and mtime_ns=? and backend=?'''
+        with self._lock:
+            result = [row[0] for row in self.cur.execute(sqlstmt, key)]
+        if result:
+            return str(result[0])
+        return None
+
+    def fileHash(self, filepath, backend=None, rehash=False):
+        '''!
+        Method to generate the hash of a file (see
+        serebo_api.fileHash()), using the cached hash if the file has
+        not changed since it was hashed.
+
+        @param filepath String: Path of file.
+        @param backend String: Name of hash backend. Default = None
+        (serebo12).
+        @param rehash Boolean: Flag to hash the file even if it is in
+        the cache, and to refresh the cache. Default = False.
+        @return: Hash
+        '''
+        absPath = os.path.abspath(filepath)
+        hasher = hashers.getBackend(backend)
+        st = os.stat(absPath)
+        key = self._key(st, hasher.name)
+        if not rehash:
+            fHash = self._lookup(key)
+            if fHash is not None:
+                with self._lock:
+                    self.hits = self.hits + 1
+                    self.bytesSkipped = self.bytesSkipped + st.st_size
+                return fHash
+        with self._lock:
+            self.misses = self.misses + 1
+        hashed = time.time()
+        fHash = hasher.fileHash(absPath)
+        # Cache only if the file did not change while being hashed
+        # and was not modified just before hashing
+        if self._key(os.stat(absPath), hasher.name) == key and \
+                hashed - (st.st_mtime_ns / 1e9) >= self.racywindow:
+            self._store(key, fHash, absPath, hashed)
+        return fHash
+
+    def _store(self, key, fHash, absPath, hashed):
+        '''!
+        Private method - stores a file hash into the cache.
+        '''
+        sqlstmt = '''insert or replace into filehash (device, inode,
+            size, mtime_ns, backend, fhash, path, hashed) values
+            (?,?,?,?,?,?,?,?)'''
+        with self._lock:
+            self.cur.execute(sqlstmt, key + (fHash, absPath, hashed))
+            self.conn.commit()
+            self.stored = self.stored + 1
+
+    def prune(self):
+        '''!
+        Method to remove cached hashes of files which had been
+        deleted or changed.
+
+        @return: Number of cached hashes removed.
+        '''
+        sqlstmt = '''select device, inode, size, mtime_ns, backend,
+            path from filehash'''
+        with self._lock:
+            entries = [row for row in self.cur.execute(sqlstmt)]
+        stale = []
+        for row in entries:
+            try:
+                current = self._key(os.stat(row[5]), row[4])
+            except OSError:
+                current = None
+            if current != tuple(row[0:5]):
+                stale.append(tuple(row[0:5]))
+        sqlstmt = '''delete from filehash where device=? and inode=?
+            and size=? and mtime_ns=? and backend=?'''
+        with self._lock:
+            self.cur.executemany(sqlstmt, stale)
+            self.conn.commit()
+        return len(stale)
+
+    def stats(self):
+        '''!
+        Method to get the statistics of the file hash cache.
+
+        A dictionary will be returned with the following keys - Path
+        (path of file hash cache), Entries (number of cached hashes),
+        CachedBytes (total size of files with cached hashes), Hits
+        and Misses (numbers of file hashes taken from the cache and
+        generated, since the cache was opened), Stored (number of
+        file hashes cached since the cache was opened), and
+        BytesSkipped (number of bytes not read due to cache hits).
+
+        @return: Dictionary of statistics.
+        '''
+        sqlstmt = 'select count(*), total(size) from filehash'
+        with self._lock:
+            result = [row for row in self.cur.execute(sqlstmt)][0]
+        return {'Path': self.path,
+                'Entries': int(result[0]),
+                'CachedBytes': int(result[1]),
+                'Hits': self.hits,
+                'Misses': self.misses,
+                'Stored': self.stored,
+                'BytesSkipped': self.bytesSkipped}
@@ -0,0 +1,278 @@
+'''!
+Secured Recorder Box (SEREBO) File Hash Backends
+
+Date created: 19th October 2026
+
+License: GNU General Public License version 3 for academic or
+not-for-profit use only
+
+
+SEREBO is free software: you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+The default file hash of SEREBO (serebo12 backend) is a series of 12
+cryptographic hashes. For change detection of very large files, a
+single fast hash may be sufficient; hence, other hash backends can be
+used for file hashing - blake2b (Python standard library), blake3
+(multi-threaded; requires blake3 package) and xxh3_128 (not
+cryptographic; requires xxhash package). New backends can be added
+by registerBackend() function.
+
+File hashes from backends other than serebo12 are prefixed with the
+name of the backend (such as 'blake3:<hexadecimal digest>'); hence,
+the backend used for a file hash recorded in SEREBO black box can be
+identified (see backendOf() function) to recompute the file hash.
+'''
+import hashlib
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+## Name of default hash backend
+defaultBackend = 'serebo12'
+
+## Registered hash backends
+backends = {}
+
+class HashBackend(object):
+    '''!
+    Class representing a file hash backend. A backend generates new
+    hash objects (with update() and hexdigest() methods, as hashlib)
+    by new() method, which are fed with blocks of blocksize bytes of
+    the file.
+    '''
+    ## Name of backend, which is used to prefix the file hashes
+    name = None
+    ## Number of bytes read from the file at a time
+    blocksize = 65536
+    ## Name of package required by backend
+    requires = None
+
+    def available(self):
+        '''!
+        Method to check whether the backend can be used (the package
+        required by the backend is installed).
+
+        @return: Boolean
+        '''
+        return True
+
+    def new(self):
+        '''!
+        Method to generate a new hash object.
+
+        @return: Hash object
+        '''
+        raise NotImplementedError
+
+    def fileHash(self, absPath):
+        '''!
+        Method to generate the hash of a file.
+
+        @param absPath String: Absolute path of file.
+        @return: Hash (prefixed with the name of backend, except for
+        default backend)
+        '''
+        with open(absPath, 'rb') as f:
+            return self.streamHash(f)[0]
+
+    def streamHash(self, stream, tee=None):
+        '''!
+        Method to generate the hash of the data read from a binary
+        stream (such as standard input or a named pipe) until its end,
+        which is the same as the hash of a file of the same data.
+        Data is read into a reused buffer of blocksize bytes.
+
+        @param stream Object: Binary file object to read from.
+        @param tee Object: Binary file object to write the data to, as
+        it is hashed. Default = None.
+        @return: (hash, number of bytes read)
+        '''
+        hasher = self.new()
+        buffer = bytearray(self.blocksize)
+        view = memoryview(buffer)
+        size = 0
+        while True:
+            count = stream.readinto(buffer)
+            if not count:
+                break
+            hasher.update(view[:count])
+            if tee is not None:
+                tee.write(view[:count])
+            size = size + count
+        return (self.digest(hasher), size)
+
+    def digest(self, hasher):
+        '''!
+        Method to get the hash from a hash object of this backend.
+
+        @param hasher Object: Hash object from new() method.
+        @return: Hash (prefixed with the name of backend, except for
+        default backend)
+        '''
+        if self.name == defaultBackend:
+            return hasher.hexdigest()
+        return '%s:%s' % (self.name, hasher.hexdigest())
+
+class _MultiHasher(object):
+    '''!
+    Private class - hash object updating the 12 hashes of SEREBO file
+    hash together.
+    '''
+    def __init__(self):
+        '''!
+        Initiation method - generates the 12 hash objects.
+        '''
+        self.hashers = [hashlib.md5(), hashlib.sha1(),
+                        hashlib.sha224(), hashlib.sha3_224(),
+                        hashlib.sha256(), hashlib.sha3_256(),
+                        hashlib.sha384(), hashlib.sha3_384(),
+                        hashlib.sha512(), hashlib.sha3_512(),
+                        hashlib.blake2b(), hashlib.blake2s()]
+
+    def update(self, data):
+        '''!
+        Method to update the 12 hash objects with a block of data.
+        '''
+        for hasher in self.hashers:
+            hasher.update(data)
+
+    def hexdigest(self):
+        '''!
+        Method to get the 12 hashes joined by ':'.
+        '''
+        return ':'.join([hasher.hexdigest() for hasher in self.hashers])
+
+class Serebo12Backend(HashBackend):
+    '''!
+    Class representing the default hash backend - a series of 12
+    hashes in the format of <MD5>:<SHA1>:<SHA224>:<SHA3 244>:<SHA256>:
+    <SHA3 256>:<SHA384>:<SHA3 384>:<SHA512>:<SHA3 215>:<Blake 2b>:
+    <Blake 2s>.
+    '''
+    name = 'serebo12'
+
+    def new(self):
+        return _MultiHasher()
+
+class Blake2bBackend(HashBackend):
+    '''!
+    Class representing BLAKE2b hash backend (Python standard library).
+    '''
+    name = 'blake2b'
+    blocksize = 1048576
+
+    def new(self):
+        return hashlib.blake2b()
+
+class Blake3Backend(HashBackend):
+    '''!
+    Class representing BLAKE3 hash backend, which hashes each block
+    with multiple threads. Requires blake3 package.
+    '''
+    name = 'blake3'
+    blocksize = 16777216
+    requires = 'blake3'
+
+    def available(self):
+        return blake3 is not None
+
+    def new(self):
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+
+class XXH3Backend(HashBackend):
+    '''!
+    Class representing XXH3 (128-bit) hash backend - very fast but
+    not cryptographic; hence, only for change detection. Requires
+    xxhash package.
+    '''
+    name = 'xxh3_128'
+    blocksize = 1048576
+    requires = 'xxhash'
+
+    def available(self):
+        return xxhash is not None
+
+    def new(self):
+        return xxhash.xxh3_128()
+
+def registerBackend(backend):
+    '''!
+    Function to register a hash backend.
+
+    @param backend Object: HashBackend object.
+    @return: HashBackend object
+    '''
+    name = str(backend.name)
+    if ':' in name:
+        raise ValueError('Name of hash backend cannot contain ":"')
+    backends[name] = backend
+    return backend
+
+def getBackend(name=None):
+    '''!
+    Function to get a registered hash backend by name.
+
+    @param name String: Name of hash backend. Default = None (default
+    backend).
+    @return: HashBackend object
+    '''
+    if name is None:
+        name = defaultBackend
+    name = str(name)
+    if name not in backends:
+        raise ValueError('Unknown hash backend: %s' % name)
+    backend = backends[name]
+    if not backend.available():
+        raise ValueError('Hash backend %s requires %s package' %
+                         (name, str(backend.requires)))
+    return backend
+
+def availableBackends():
+    '''!
+    Function to list the names of hash backends which can be used.
+
+    @return: List of names of hash backends.
+    '''
+    return sorted([name for name in backends
+                   if backends[name].available()])
+
+def backendOf(fHash):
+    '''!
+    Function to identify the hash backend of a file hash - file
+    hashes from backends other than the default backend are prefixed
+    with the name of backend. For chunked file hashes (see chunks
+    module), this is the hash backend of the chunks.
+
+    @param fHash String: File hash.
+    @return: Name of hash backend.
+    '''
+    prefix = str(fHash).split(':')
+    if prefix[0] == 'chunks' and len(prefix) > 1:
+        prefix = prefix[1]
+    else:
+        prefix = prefix[0]
+    if prefix in backends and prefix != defaultBackend:
+        return prefix
+    return defaultBackend
+
+for _backend in (Serebo12Backend(), Blake2bBackend(),
+                 Blake3Backend(), XXH3Backend()):
+    registerBackend(_backend)
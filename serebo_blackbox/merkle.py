@@ -0,0 +1,106 @@
+'''!
+Secured Recorder Box (SEREBO) Merkle Tree Functions
+
+Date created: 19th October 2026
+
+License: GNU General Public License version 3 for academic or
+not-for-profit use only
+
+
+SEREBO is free software: you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+'''
+from . import sereboDB
+
+def nodeHash(left, right):
+    '''!
+    Function to generate the hash of an internal node of Merkle tree
+    from the hashes of its left and right children. The children are
+    prefixed so that an internal node cannot be mistaken for a leaf.
+
+    @param left String: Hash of left child.
+    @param right String: Hash of right child.
+    @return: Hash
+    '''
+    return sereboDB.multiHash('MerkleNode>' + str(left) + '>' + \
+                              str(right))
+
+def _nextLevel(level):
+    '''!
+    Private function - generates the next level of Merkle tree. An
+    unpaired last node is carried up to the next level unchanged.
+    '''
+    nextlevel = [nodeHash(level[i], level[i+1])
+                 for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2 == 1:
+        nextlevel.append(level[-1])
+    return nextlevel
+
+def merkleRoot(leaves):
+    '''!
+    Function to generate the Merkle root of a list of hashes (the
+    leaves of Merkle tree).
+
+    @param leaves List: List of hashes.
+    @return: Merkle root hash
+    '''
+    level = [str(x) for x in leaves]
+    if not level:
+        raise ValueError('Merkle tree requires at least one leaf')
+    while len(level) > 1:
+        level = _nextLevel(level)
+    return level[0]
+
+def merkleProof(leaves, index):
+    '''!
+    Function to generate the inclusion proof of a leaf in Merkle
+    tree - the list of sibling hashes from the leaf up to the root.
+    Each step of the proof is a list of [side, hash], where side is
+    'L' if the sibling is on the left and 'R' if the sibling is on
+    the right. The proof has at most log2(number of leaves) steps.
+
+    @param leaves List: List of hashes.
+    @param index Integer: Position (starting from 0) of the leaf.
+    @return: Inclusion proof
+    '''
+    level = [str(x) for x in leaves]
+    index = int(index)
+    if index < 0 or index >= len(level):
+        raise IndexError('Leaf index out of range of Merkle tree')
+    proof = []
+    while len(level) > 1:
+        if index % 2 == 1:
+            proof.append(['L', level[index-1]])
+        elif index + 1 < len(level):
+            proof.append(['R', level[index+1]])
+        level = _nextLevel(level)
+        index = index // 2
+    return proof
+
+def verifyMerkleProof(leaf, proof, root):
+    '''!
+    Function to verify the inclusion proof of a leaf in Merkle tree.
+
+    @param leaf String: Hash of the leaf.
+    @param proof List: Inclusion proof from merkleProof() function.
+    @param root String: Merkle root hash.
+    @return: True if the leaf is included in Merkle tree of the given
+    root; otherwise, False.
+    '''
+    current = str(leaf)
+    for (side, sibling) in proof:
+        if side == 'L':
+            current = nodeHash(sibling, current)
+        else:
+            current = nodeHash(current, sibling)
+    return current == str(root)
@@ -0,0 +1,318 @@
+'''!
+Secured Recorder Box (SEREBO) Record Proofs
+
+Date created: 19th October 2026
+
+License: GNU General Public License version 3 for academic or
+not-for-profit use only
+
+
+SEREBO is free software: you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+'''
+import json
+
+from . import checkpoint
+from . import merkle
+from . import serebo_api
+from .sereboDB import multiHash
+
+proofFormat = 'SEREBO Record Proof 1'
+
+## Default maximum number of links from the block of a record to the
+## anchor block in a proof
+maxLinks = 1000
+
+notarizationPatterns = ['Notarization with SEREBO Notary%',
+                        'NTP server (self) notarization%',
+                        'Self notarization']
+
+def blockOfRecord(sdb_object, ID):
+    '''!
+    Function to find the block in blockchain which records a datalog
+    record - either the block of the record or the Merkle batch block
+    containing the record.
+
+    @param sdb_object Object: SEREBO database object.
+    @param ID Integer: Datalog ID of the record.
+    @return: Block ID, or None if the record is not found in
+    blockchain.
+    '''
+    ID = int(ID)
+    mproof = serebo_api.merkleProof(sdb_object, ID)
+    if mproof is not None:
+        return mproof['BlockID']
+    sqlstmt = 'select dtstamp, hash from datalog where ID=?'
+    record = [row for row in sdb_object.cur.execute(sqlstmt, (ID,))]
+    if not record:
+        return None
+    # Each earlier Merkle batch of n records takes up only one block
+    sqlstmt = '''select count(*), sum(end_ID - start_ID + 1) from
+        merkleblock where end_ID < ?'''
+    (count, size) = [row for row in
+                     sdb_object.cur.execute(sqlstmt, (ID,))][0]
+    c_ID = ID - (int(size or 0) - int(count))
+    sqlstmt = '''select c_ID from blockchain where c_ID=? and
+        c_dtstamp=? and data=?'''
+    result = [row for row in
+              sdb_object.cur.execute(sqlstmt, (c_ID, record[0][0],
+                                               record[0][1]))]
+    if not result:
+        sqlstmt = '''select c_ID from blockchain where c_dtstamp=? and
+            data=?'''
+        result = [row for row in
+                  sdb_object.cur.execute(sqlstmt, record[0])]
+    if not result:
+        return None
+    return int(result[0][0])
+
+def _anchorBlock(sdb_object, ID, c_ID):
+    '''!
+    Private function - finds the anchor for the proof of a record,
+    which is the block of the first notarization recorded after the
+    record; or the latest block if there is no later notarization.
+    '''
+    clause = ' or '.join(['description like ?'] *
+                         len(notarizationPatterns))
+    sqlstmt = '''select ID, dtstamp, data, description from datalog
+        where ID > ? and (%s) order by ID limit 1''' % clause
+    result = [row for row in
+              sdb_object.cur.execute(sqlstmt, [int(ID)] +
+                                     notarizationPatterns)]
+    if result:
+        a_ID = blockOfRecord(sdb_object, result[0][0])
+        if a_ID is not None and a_ID >= c_ID:
+            return (a_ID, 'Notarization',
+                    {'ID': int(result[0][0]),
+                     'dtstamp': str(result[0][1]),
+                     'data': str(result[0][2]),
+                     'description': str(result[0][3])})
+    sqlstmt = 'select max(c_ID) from blockchain'
+    a_ID = [row for row in sdb_object.cur.execute(sqlstmt)][0][0]
+    return (int(a_ID), 'Tip', None)
+
+def _checkpointAnchor(sdb_object, c_ID):
+    '''!
+    Private function - finds the checkpoint covering a block, with the
+    inclusion proof of the block hash in the accumulator of the
+    checkpoint; or None if the block is not covered by a checkpoint.
+    '''
+    sqlstmt = '''select ID, start_cID, end_cID, accumulator, p_hash,
+        hash from checkpoint where start_cID <= ? and end_cID >= ?
+        order by ID limit 1'''
+    result = [row for row in
+              sdb_object.cur.execute(sqlstmt, (int(c_ID), int(c_ID)))]
+    if not result:
+        return None
+    (cp_ID, start, end, acc, cp_phash, cp_hash) = result[0]
+    sqlstmt = '''select c_hash from blockchain where c_ID >= ? and
+        c_ID <= ? order by c_ID'''
+    leaves = [str(row[0]) for row in
+              sdb_object.cur.execute(sqlstmt, (int(start), int(end)))]
+    if len(leaves) != int(end) - int(start) + 1:
+        return None
+    return {'ID': int(cp_ID),
+            'StartID': int(start),
+            'EndID': int(end),
+            'Accumulator': str(acc),
+            'ParentHash': str(cp_phash),
+            'Hash': str(cp_hash),
+            'Path': merkle.merkleProof(leaves, int(c_ID) - int(start))}
+
+def generateProof(sdb_object, ID, maxlinks=maxLinks):
+    '''!
+    Function to generate a compact proof that a datalog record is
+    recorded in the blockchain of SEREBO black box. The proof
+    consists of (1) the record, (2) its Merkle inclusion proof (if
+    the record is in a Merkle batch block), (3) its block, (4) the
+    links of each later block up to the anchor block, and (5) the
+    anchor block - the block of the first later notarization (with
+    the notarization record, which can be checked with the notary),
+    or the latest block.
+
+    The number of links is capped by maxlinks. If the anchor block is
+    more than maxlinks blocks after the block of the record, the
+    proof is anchored to the checkpoint covering the block instead -
+    the proof carries the inclusion proof of the block hash in the
+    accumulator of the checkpoint (at most log2(checkpoint_interval)
+    steps) in place of the links, and the anchor is the checkpoint
+    hash (with BlockID as the last block covered by the checkpoint).
+    If the block is not covered by a checkpoint, the anchor is the
+    block maxlinks blocks after the block of the record. Checkpoint
+    and block anchors are checked against SEREBO black box (see
+    checkpoint.verifyRange() function).
+
+    @param sdb_object Object: SEREBO database object.
+    @param ID Integer: Datalog ID of the record.
+    @param maxlinks Integer: Maximum number of links in the proof.
+    Default = 1000 (None for no maximum).
+    @return: Dictionary of proof, or None if the record is not found
+    in blockchain.
+    '''
+    ID = int(ID)
+    c_ID = blockOfRecord(sdb_object, ID)
+    if c_ID is None:
+        return None
+    sqlstmt = '''select ID, dtstamp, data, description, hash from
+        datalog where ID=?'''
+    row = [row for row in sdb_object.cur.execute(sqlstmt, (ID,))][0]
+    record = {'ID': int(row[0]),
+              'dtstamp': str(row[1]),
+              'data': str(row[2]),
+              'description': str(row[3]),
+              'hash': str(row[4])}
+    mproof = serebo_api.merkleProof(sdb_object, ID)
+    if mproof is not None:
+        mproof = {'Root': mproof['MerkleRoot'],
+                  'Proof': mproof['Proof']}
+    sqlstmt = '''select c_ID, p_dtstamp, p_randomstring, p_hash, data,
+        c_hash from blockchain where c_ID=?'''
+    row = [row for row in sdb_object.cur.execute(sqlstmt, (c_ID,))][0]
+    block = {'ID': int(row[0]),
+             'p_dtstamp': str(row[1]),
+             'p_randomstring': str(row[2]),
+             'p_hash': str(row[3]),
+             'data': str(row[4]),
+             'hash': str(row[5])}
+    (a_ID, a_type, a_record) = _anchorBlock(sdb_object, ID, c_ID)
+    a_checkpoint = None
+    if maxlinks is not None and a_ID - c_ID > int(maxlinks):
+        a_checkpoint = _checkpointAnchor(sdb_object, c_ID)
+        if a_checkpoint is not None:
+            (a_ID, a_type, a_record) = (a_checkpoint['EndID'],
+                                        'Checkpoint', None)
+        else:
+            (a_ID, a_type, a_record) = (c_ID + int(maxlinks), 'Block',
+                                        None)
+    sqlstmt = '''select c_ID, p_dtstamp, p_randomstring, data, c_hash
+        from blockchain where c_ID > ? and c_ID <= ? order by c_ID'''
+    links = []
+    a_hash = block['hash']
+    if a_checkpoint is not None:
+        a_hash = a_checkpoint.pop('Hash')
+    else:
+        for row in sdb_object.cur.execute(sqlstmt, (c_ID, a_ID)):
+            links.append([int(row[0]), str(row[1]), str(row[2]),
+                          str(row[3])])
+            a_hash = str(row[4])
+    sqlstmt = "select value from metadata where key='blackboxID'"
+    blackboxID = [row for row in sdb_object.cur.execute(sqlstmt)][0][0]
+    return {'Format': proofFormat,
+            'BlackBoxID': str(blackboxID),
+            'Record': record,
+            'Merkle': mproof,
+            'Block': block,
+            'Links': links,
+            'Anchor': {'Type': a_type,
+                       'BlockID': a_ID,
+                       'BlockHash': a_hash,
+                       'Record': a_record,
+                       'Checkpoint': a_checkpoint}}
+
+def verifyProof(proof):
+    '''!
+    Function to verify a proof from generateProof() function without
+    SEREBO black box - (1) the hash of the record, (2) the inclusion
+    of the record hash in the Merkle root (for Merkle batch blocks),
+    (3) the hash of the block, (4) the hash of each later block up to
+    the anchor block (or, for a checkpoint anchor, the inclusion of
+    the block hash in the accumulator of the checkpoint and the
+    checkpoint hash), and (5) the anchor notarization record (if any)
+    are recomputed.
+
+    A dictionary of results will be returned with the following keys
+    - RecordHash, MerkleInclusion, BlockHash, AnchorChain,
+    AnchorRecord (each True, False or None if not applicable) and
+    Verified (True only if all applicable checks are True).
+
+    @param proof Dictionary: Proof from generateProof() function.
+    @return: Dictionary of verification results.
+    '''
+    record = proof['Record']
+    block = proof['Block']
+    anchor = proof['Anchor']
+    rdat = {}
+    rdat['RecordHash'] = multiHash(bytes(record['dtstamp'], 'utf-8') +
+                                   bytes(record['data'], 'utf-8') +
+                                   bytes(record['description'],
+                                         'utf-8')) == record['hash']
+    if proof['Merkle'] is None:
+        rdat['MerkleInclusion'] = None
+        blockdata = record['hash']
+    else:
+        rdat['MerkleInclusion'] = merkle.verifyMerkleProof(
+            record['hash'], proof['Merkle']['Proof'],
+            proof['Merkle']['Root'])
+        blockdata = proof['Merkle']['Root']
+    hashdata = ''.join([block['p_dtstamp'], block['p_randomstring'],
+                        block['p_hash'], blockdata])
+    current = multiHash(bytes(hashdata, 'utf-8'))
+    rdat['BlockHash'] = (blockdata == block['data']) and \
+                        (current == block['hash'])
+    for (c_ID, p_dtstamp, p_randomstring, data) in proof['Links']:
+        hashdata = ''.join([p_dtstamp, p_randomstring, current, data])
+        current = multiHash(bytes(hashdata, 'utf-8'))
+    a_checkpoint = anchor.get('Checkpoint')
+    if a_checkpoint is None:
+        rdat['AnchorChain'] = current == anchor['BlockHash']
+    else:
+        cp_hash = checkpoint.checkpointHash(a_checkpoint['ParentHash'],
+                                            a_checkpoint['StartID'],
+                                            a_checkpoint['EndID'],
+                                            a_checkpoint['Accumulator'])
+        rdat['AnchorChain'] = \
+            (a_checkpoint['StartID'] <= block['ID'] <=
+             a_checkpoint['EndID']) and \
+            merkle.verifyMerkleProof(current, a_checkpoint['Path'],
+                                     a_checkpoint['Accumulator']) and \
+            (cp_hash == anchor['BlockHash'])
+    if anchor['Record'] is None:
+        rdat['AnchorRecord'] = None
+    else:
+        a_record = anchor['Record']
+        a_hash = multiHash(bytes(a_record['dtstamp'], 'utf-8') +
+                           bytes(a_record['data'], 'utf-8') +
+                           bytes(a_record['description'], 'utf-8'))
+        if proof['Links']:
+            a_data = proof['Links'][-1][3]
+        else:
+            a_data = block['data']
+        rdat['AnchorRecord'] = a_hash == a_data
+    rdat['Verified'] = all([rdat[k] is not False for k in rdat])
+    return rdat
+
+def writeProof(proof, filepath):
+    '''!
+    Function to write a proof into a JSON file.
+
+    @param proof Dictionary: Proof from generateProof() function.
+    @param filepath String: Path of proof file.
+    @return: Absolute path of proof file.
+    '''
+    filepath = serebo_api.absolutePath(filepath)
+    with open(filepath, 'w') as f:
+        json.dump(proof, f, indent=1)
+    return filepath
+
+def readProof(filepath):
+    '''!
+    Function to read a proof from a JSON file.
+
+    @param filepath String: Path of proof file.
+    @return: Dictionary of proof.
+    '''
+    with open(serebo_api.absolutePath(filepath), 'r') as f:
+        proof = json.load(f)
+    if proof.get('Format') != proofFormat:
+        raise ValueError('Not a SEREBO record proof file')
+    return proof
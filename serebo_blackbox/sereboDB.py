@@ -20,31 +20,251 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program. If not, see <http://www.gnu.org/licenses/>.
 '''
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import hashlib
+import queue
 import random
 import os
-import secrets
 import sqlite3
-import string
+import threading
 import time
 
+from . import checkpoint
+from . import merkle
+from . import storage
+from . import tokens
+
+def multiHash(data):
+    '''!
+    Function to generate a series of 12 hashes for a given data 
+    string, in the format of <MD5>:<SHA1>:<SHA224>:<SHA3 
+    244>:<SHA256>:<SHA3 256>:<SHA384>:<SHA3 384>:<SHA512>:<SHA3 
+    215>:<Blake 2b>:<Blake 2s>. This is used by SereboDB.hash() 
+    method, and is available without SEREBO database object for 
+    offline verification.
+
+    @param data String: Data string to generate hash.
+    @return: Hash
+    '''
+    data = str(data)
+    data = bytes(data, 'utf-8')
+    x = [hashlib.md5(data).hexdigest(),
+         hashlib.sha1(data).hexdigest(), 
+         hashlib.sha224(data).hexdigest(),
+         hashlib.sha3_224(data).hexdigest(),
+         hashlib.sha256(data).hexdigest(), 
+         hashlib.sha3_256(data).hexdigest(),
+         hashlib.sha384(data).hexdigest(),
+         hashlib.sha3_384(data).hexdigest(), 
+         hashlib.sha512(data).hexdigest(), 
+         hashlib.sha3_512(data).hexdigest(), 
+         hashlib.blake2b(data).hexdigest(), 
+         hashlib.blake2s(data).hexdigest()]
+    return ':'.join(x)
+
+## Hash functions of multiHash, in order
+_hashFunctions = (hashlib.md5, hashlib.sha1, hashlib.sha224, 
+                  hashlib.sha3_224, hashlib.sha256, hashlib.sha3_256,
+                  hashlib.sha384, hashlib.sha3_384, hashlib.sha512, 
+                  hashlib.sha3_512, hashlib.blake2b, hashlib.blake2s)
+
+def _hashChunk(payloads):
+    '''!
+    Private function - generates the hashes of a list of data (as 
+    multiHash function) in the calling process.
+    '''
+    functions = _hashFunctions
+    results = []
+    append = results.append
+    for data in payloads:
+        data = str(data).encode('utf-8')
+        append(':'.join([f(data).hexdigest() for f in functions]))
+    return results
+
+def hashBatch(payloads, workers=None, chunksize=512):
+    '''!
+    Function to generate the hashes of a list of data - each hash is 
+    identical to that from multiHash function for the same data. For 
+    large lists, the hashing can be spread over a pool of processes.
+
+    @param payloads List: List of data to generate hashes.
+    @param workers Integer: Number of processes to use. Default = 
+    None (hashing in the calling process).
+    @param chunksize Integer: Number of data hashed by a process at a 
+    time. The pool of processes is only used when there is more than 
+    one chunk of data. Default = 512.
+    @return: List of hashes, in the order of payloads.
+    '''
+    payloads = list(payloads)
+    chunksize = max(1, int(chunksize))
+    if not workers or int(workers) <= 1 or len(payloads) <= chunksize:
+        return _hashChunk(payloads)
+    chunks = [payloads[i:i+chunksize] 
+              for i in range(0, len(payloads), chunksize)]
+    results = []
+    with ProcessPoolExecutor(int(workers)) as executor:
+        for hashes in executor.map(_hashChunk, chunks):
+            results.extend(hashes)
+    return results
+
+## Event type codes in eventlog_ref table (lean eventlog)
+eventInsert = 1
+eventBatch = 2
+
+class Durable(threading.Event):
+    '''!
+    Class representing the durability of a data insertion event in 
+    group commit mode - an event which is set once the data insertion 
+    event is committed, or rolled back by a failed append or commit in 
+    the same group.
+    '''
+    def __init__(self):
+        '''!
+        Initiation method - creates an unset event with no error.
+        '''
+        threading.Event.__init__(self)
+        ## Exception which rolled back the data insertion event, or 
+        ## None if the data insertion event is (or will be) committed
+        self.error = None
+
 class SereboDB(object):
     '''!
     Class representing SEREBO database - the recorder black box.
     '''
-    def __init__(self, dbpath):
+    def __init__(self, dbpath, commit_size=1, commit_interval=100,
+                 threadsafe=False, busy_timeout=1000, busy_retries=8,
+                 checkpoint_interval=10000, storage=1, eventlog=None):
         '''!
         Initiation method - connects to SEREBO database. If SEREBO 
         database does not exist, this function will create the 
         database with the necessary data tables.
 
+        By default, every data insertion is committed immediately. 
+        When commit_size is more than 1, SEREBO database runs in 
+        group commit mode - inserts (which may come from multiple 
+        threads) are chained in arrival order but are only committed 
+        together when either commit_size records or commit_interval 
+        milliseconds have accumulated, trading latency of durability 
+        for insertion throughput. Pending inserts are lost if the 
+        process ends before they are committed; hence, flush() or 
+        close() method should be called before exiting.
+
+        By default, the SQLite connection (conn) and cursor (cur) 
+        are shared by all operations and SEREBO database object 
+        should only be used by one thread. In thread-safe mode, a 
+        dedicated writer thread, with its own connection, carries out 
+        all data insertions in arrival order; hence, it owns the tip 
+        of the blockchain. Each other thread is given its own 
+        connection and cursor (as conn and cur attributes) for 
+        reading. Data preparation and hashing (Step 1 of insertData 
+        method) are carried out in the calling threads.
+
+        Each append to the blockchain is carried out within an 
+        immediate transaction, which takes the write lock of SEREBO 
+        database before the latest block is read as parent. Hence, 
+        multiple processes writing to the same SEREBO database cannot 
+        fork the blockchain. If SEREBO database is locked by another 
+        process for more than busy_timeout milliseconds, the attempt 
+        is retried with exponential backoff for up to busy_retries 
+        times. Contention is recorded in contention attribute (see 
+        contentionStats() method).
+
         @param bbpath String: Path to SEREBO black box.
+        @param commit_size Integer: Number of inserted records to 
+        accumulate before committing them together. Default = 1 
+        (every insert is committed immediately).
+        @param commit_interval Float: Maximum number of milliseconds 
+        that an insert can wait to be committed in group commit mode. 
+        Default = 100.
+        @param threadsafe Boolean: Flag to use thread-safe mode. 
+        Default = False.
+        @param busy_timeout Integer: Number of milliseconds to wait 
+        for a lock on SEREBO database before retrying. Default = 1000.
+        @param busy_retries Integer: Maximum number of retries (with 
+        exponential backoff) for a lock on SEREBO database. 
+        Default = 8.
+        @param checkpoint_interval Integer: Number of blocks covered 
+        by each checkpoint (see Step 5A of insertData). Default = 
+        10000 (0 to disable checkpoints).
+        @param storage Integer: Storage version of a new SEREBO 
+        database - 1 (hashes and date time stamps as text) or 2 
+        (compact storage; see storage module). The storage version of 
+        an existing SEREBO database is read from its metadata. 
+        Default = 1.
+        @param eventlog String: Event log mode of a new SEREBO 
+        database - 'full' (each data insertion event is recorded in 
+        eventlog table with its description, and in eventlog_datamap 
+        table with its data hash, parent hash and block hash) or 
+        'lean' (each data insertion event is recorded in eventlog_ref 
+        table as an event type code with the IDs of its record and 
+        block only; eventlog and eventlog_datamap are views which 
+        reconstruct the full event log from datalog and blockchain). 
+        The event log mode of an existing SEREBO database is read from 
+        its metadata. Default = None ('lean' for storage version 2 and 
+        'full' for storage version 1).
         '''
         self.path = dbpath
-        self.conn = sqlite3.connect(self.path)
-        self.cur = self.conn.cursor()
+        self.commit_size = int(commit_size)
+        self.commit_interval = float(commit_interval)
+        self.threadsafe = bool(threadsafe)
+        self.busy_timeout = float(busy_timeout)
+        self.busy_retries = int(busy_retries)
+        self.checkpoint_interval = int(checkpoint_interval)
+        self.storage = int(storage)
+        self.eventlog = eventlog
+        self.contention = {'Transactions': 0,
+                           'ContendedTransactions': 0,
+                           'Retries': 0,
+                           'Failures': 0,
+                           'WaitSeconds': 0.0,
+                           'MaxWaitSeconds': 0.0}
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._pending = []
+        self._deadline = None
+        self._timer = None
+        self._writer = None
+        if not self.threadsafe:
+            self._conn = sqlite3.connect(self.path, 
+                timeout=self.busy_timeout / 1000,
+                check_same_thread=(self.commit_size <= 1))
+            self._cur = self._conn.cursor()
         self._createTables()
+        self._migrateTables()
+        self._initStats()
+        if self.threadsafe:
+            self._queue = queue.Queue()
+            self._writer = threading.Thread(target=self._writeLoop,
+                                            name='SereboDB-writer',
+                                            daemon=True)
+            self._writer.start()
+
+    @property
+    def conn(self):
+        '''!
+        SQLite connection to SEREBO database - in thread-safe mode, 
+        this is the calling thread's own connection.
+        '''
+        if not self.threadsafe:
+            return self._conn
+        if getattr(self._local, 'conn', None) is None:
+            self._local.conn = sqlite3.connect(self.path,
+                timeout=self.busy_timeout / 1000)
+            self._local.cur = self._local.conn.cursor()
+        return self._local.conn
+
+    @property
+    def cur(self):
+        '''!
+        SQLite cursor of SEREBO database - in thread-safe mode, this 
+        is the cursor of the calling thread's own connection.
+        '''
+        if not self.threadsafe:
+            return self._cur
+        self.conn
+        return self._local.cur
 
     def dtStamp(self):
         '''!
@@ -66,17 +286,15 @@ class SereboDB(object):
         Method to generate a random string, which can contain 80 
         possible characters - abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNO
         PQRSTUVWXYZ0123456789~!@#$%^&*()<>=+[]?. Hence, the possible 
-        number of strings is 80**length.
+        number of strings is 80**length. The random string is taken 
+        from the pool of random characters drawn from os.urandom (see 
+        tokens module).
 
         @param length Integer: Length of random string to generate. 
         Default = 64.
         @return: Random string
         '''
-        choices = string.ascii_letters + \
-                  string.digits + \
-                  '~!@#$%^&*()<>=+[]?'
-        x = random.choices(choices, k=int(length))
-        return ''.join(x)
+        return tokens.randomToken(length)
 
     def hash(self, data):
         '''!
@@ -88,21 +306,7 @@ class SereboDB(object):
         @param data String: Data string to generate hash.
         @return: Hash
         '''
-        data = str(data)
-        data = bytes(data, 'utf-8')
-        x = [hashlib.md5(data).hexdigest(),
-             hashlib.sha1(data).hexdigest(), 
-             hashlib.sha224(data).hexdigest(),
-             hashlib.sha3_224(data).hexdigest(),
-             hashlib.sha256(data).hexdigest(), 
-             hashlib.sha3_256(data).hexdigest(),
-             hashlib.sha384(data).hexdigest(),
-             hashlib.sha3_384(data).hexdigest(), 
-             hashlib.sha512(data).hexdigest(), 
-             hashlib.sha3_512(data).hexdigest(), 
-             hashlib.blake2b(data).hexdigest(), 
-             hashlib.blake2s(data).hexdigest()]
-        return ':'.join(x)
+        return multiHash(data)
 
     def _createTables(self):
         '''!
@@ -121,8 +325,6 @@ class SereboDB(object):
         sql_metadata_insert2 = '''
         insert into metadata (key, value) values 
             ('creation_secondstamp', '%s');''' % str(time.time())
-        sql_metadata_insert3 = '''
-        insert into metadata (key, value) values ('blackboxID', '%s');''' % (self.randomString(512))
         sql_notary_create = '''
         create table if not exists notary (
             ID integer primary key autoincrement,
@@ -147,7 +349,8 @@ class SereboDB(object):
             dtstamp text not null,
             hash text not null,
             data blob,
-            description blob not null);'''
+            description blob not null,
+            dtstamp_us integer);'''
         sql_datalog_unique = '''
         create unique index if not exists datalog_unique on datalog (
             dtstamp, hash);'''
@@ -162,7 +365,8 @@ class SereboDB(object):
             p_dtstamp text not null,
             p_randomstring text not null,
             p_hash text not null,
-            data text not null);'''
+            data text not null,
+            c_dtstamp_us integer);'''
         # Event log table
         sql_eventlog_create1 = '''
         create table if not exists eventlog (
@@ -176,26 +380,275 @@ class SereboDB(object):
             fID text not null,
             key text not null,
             value text not null);'''
+        # Lean event log table and views
+        sql_eventlog_ref_create = '''
+        create table if not exists eventlog_ref (
+            ID integer primary key autoincrement,
+            type integer not null,
+            DL_ID integer not null,
+            c_ID integer not null);'''
+        sql_eventlog_view1 = '''
+        create view if not exists eventlog as select
+            e.ID as ID,
+            b.c_dtstamp as dtstamp,
+            cast(e.ID as text) as fID,
+            case when e.type = %s then 
+                'Merkle batch of ' || (m.end_ID - m.start_ID + 1) || 
+                ' records (' || m.start_ID || ' to ' || m.end_ID || ')'
+                else d.description end as description
+        from eventlog_ref e 
+            join blockchain b on b.c_ID = e.c_ID
+            left join datalog d on d.ID = e.DL_ID
+            left join merkleblock m on m.c_ID = e.c_ID;''' % \
+            str(eventBatch)
+        sql_eventlog_view2 = '''
+        create view if not exists eventlog_datamap as select
+            b.c_dtstamp as dtstamp,
+            cast(e.ID as text) as fID,
+            k.key as key,
+            case k.n when 1 then b.data 
+                when 2 then b.p_hash 
+                else b.c_hash end as value
+        from eventlog_ref e 
+            join blockchain b on b.c_ID = e.c_ID
+            join (select 1 as n, 'DataHash' as key union all 
+                  select 2, 'ParentHash' union all 
+                  select 3, 'BlockHash') k
+        order by e.ID, k.n;'''
+        # Merkle block table
+        sql_merkleblock_create = '''
+        create table if not exists merkleblock (
+            c_ID integer primary key,
+            start_ID integer not null,
+            end_ID integer not null,
+            root text not null);'''
+        sql_merkleblock_index = '''
+        create index if not exists merkleblock_start on merkleblock (
+            start_ID);'''
+        # Checkpoint table
+        sql_checkpoint_create = '''
+        create table if not exists checkpoint (
+            ID integer primary key autoincrement,
+            dtstamp text not null,
+            start_cID integer not null,
+            end_cID integer not null,
+            accumulator text not null,
+            p_hash text not null,
+            hash text not null);'''
+        # Statistics table
+        sql_stats_create = '''
+        create table if not exists stats (
+            name text primary key,
+            records integer not null,
+            first_ID integer,
+            last_ID integer,
+            last_dtstamp text,
+            last_hash text);'''
+        # Storage version - existing SEREBO databases without storage 
+        # version are in storage version 1
+        sqlstmt = '''select name from sqlite_master where type in 
+            ('table', 'view')'''
+        names = [row[0] for row in self.cur.execute(sqlstmt)]
+        if 'datalog' in names:
+            self.storage = 1
+            sqlstmt = '''select value from metadata where 
+                key='storage_version' '''
+            if 'metadata' in names:
+                for row in self.cur.execute(sqlstmt):
+                    self.storage = int(row[0])
+        if self.storage not in (1, 2):
+            raise ValueError('Unknown storage version: %s' % 
+                             str(self.storage))
+        # Event log mode - existing SEREBO databases without event 
+        # log mode have full event log
+        if 'eventlog' in names:
+            self.eventlog = 'full'
+            sqlstmt = '''select value from metadata where 
+                key='eventlog_mode' '''
+            if 'metadata' in names:
+                for row in self.cur.execute(sqlstmt):
+                    self.eventlog = str(row[0])
+        elif self.eventlog is None:
+            self.eventlog = {1: 'full', 2: 'lean'}[self.storage]
+        if self.eventlog not in ('full', 'lean'):
+            raise ValueError('Unknown event log mode: %s' % 
+                             str(self.eventlog))
+        sql_metadata_insert4 = '''
+        insert into metadata (key, value) values 
+            ('storage_version', '%s');''' % str(self.storage)
+        sql_metadata_insert5 = '''
+        insert into metadata (key, value) values 
+            ('eventlog_mode', '%s');''' % str(self.eventlog)
+        if self.storage == 2:
+            sql_datalog = storage.createStatements(self.eventlog)
+        else:
+            sql_datalog = [sql_datalog_create,
+                           sql_datalog_unique,
+                           sql_blockchain_create]
+        if self.eventlog == 'lean':
+            sql_eventlog = [sql_eventlog_ref_create,
+                            sql_eventlog_view1,
+                            sql_eventlog_view2]
+        elif self.storage == 2:
+            sql_eventlog = [sql_eventlog_create1]
+        else:
+            sql_eventlog = [sql_eventlog_create1,
+                            sql_eventlog_create2]
         # SQL execution
         sqlstmt = [sql_metadata_create, 
                    sql_metadata_insert1,
                    sql_metadata_insert2,
-                   sql_metadata_insert3,
+                   sql_metadata_insert4,
+                   sql_metadata_insert5,
                    sql_notary_create,
-                   sql_systemdata_create,
-                   sql_datalog_create,
-                   sql_datalog_unique,
-                   sql_blockchain_create,
-                   sql_eventlog_create1,
-                   sql_eventlog_create2]
+                   sql_systemdata_create] + \
+                  sql_datalog + \
+                  [sql_merkleblock_create,
+                   sql_merkleblock_index] + \
+                  sql_eventlog + \
+                  [sql_checkpoint_create,
+                   sql_stats_create]
         for statement in sqlstmt:
             try:
-                self.cur.execute(statement)
-                self.conn.commit()
+                self._retryBusy(self.cur.execute, statement)
+                self._retryBusy(self.conn.commit)
+            except sqlite3.IntegrityError:
+                pass
+        # Black box ID is only generated for new SEREBO database
+        sqlstmt = "select count(*) from metadata where key='blackboxID'"
+        if [row for row in self.cur.execute(sqlstmt)][0][0] == 0:
+            sqlstmt = '''insert into metadata (key, value) values 
+                ('blackboxID', ?)'''
+            try:
+                self._retryBusy(self.cur.execute, sqlstmt, 
+                                (self.randomString(512),))
+                self._retryBusy(self.conn.commit)
             except sqlite3.IntegrityError:
                 pass
+        sqlstmt = '''select value from metadata where 
+            key='storage_version' '''
+        self.storage = int([row for row in 
+                            self.cur.execute(sqlstmt)][0][0])
+        sqlstmt = '''select value from metadata where 
+            key='eventlog_mode' '''
+        self.eventlog = str([row for row in 
+                             self.cur.execute(sqlstmt)][0][0])
+
+    def _migrateTables(self):
+        '''!
+        Private method - used by initialization method to migrate data 
+        tables of existing SEREBO database. Integer microsecond date 
+        time stamps (dtstamp_us column in datalog table and 
+        c_dtstamp_us column in blockchain table) are added, indexed 
+        and backfilled from the date time stamp strings, which are 
+        kept unchanged as they are used in hashes.
+        '''
+        if self.storage == 2:
+            sqlstmt = 'pragma table_info(datalog)'
+            columns = [row[1] for row in self.cur.execute(sqlstmt)]
+            if 'dtstamp_us' not in columns:
+                for view in ('datalog', 'blockchain'):
+                    self._retryBusy(self.cur.execute, 
+                                    'drop view if exists %s' % view)
+                for statement in storage.createStatements(self.eventlog):
+                    self._retryBusy(self.cur.execute, statement)
+                self._retryBusy(self.conn.commit)
+            return
+        for (table, ID, dtstamp) in (('datalog', 'ID', 'dtstamp'),
+                                     ('blockchain', 'c_ID', 
+                                      'c_dtstamp')):
+            sqlstmt = 'pragma table_info(%s)' % table
+            columns = [row[1] for row in self.cur.execute(sqlstmt)]
+            if dtstamp + '_us' not in columns:
+                try:
+                    self._retryBusy(self.cur.execute, 
+                        'alter table %s add column %s_us integer' % 
+                        (table, dtstamp))
+                except sqlite3.OperationalError:
+                    # Added by another process
+                    pass
+            self._retryBusy(self.cur.execute, 
+                '''create index if not exists %s_dtstamp_us on %s (
+                %s_us)''' % (table, table, dtstamp))
+            self._retryBusy(self.conn.commit)
+            sqlstmt = '''select %s, %s from %s where %s_us is null 
+                limit 10000''' % (ID, dtstamp, table, dtstamp)
+            update = 'update %s set %s_us=? where %s=?' % \
+                     (table, dtstamp, ID)
+            while True:
+                rows = [row for row in self.cur.execute(sqlstmt)]
+                if not rows:
+                    break
+                sqldata = [(storage.packStamp(row[1]), row[0]) 
+                           for row in rows]
+                self._retryBusy(self.cur.executemany, update, sqldata)
+                self._retryBusy(self.conn.commit)
 
-    def _insertData1A(self, data, description):
+    def _initStats(self):
+        '''!
+        Private method - used by initialization method to fill the 
+        stats table (for new SEREBO database, or existing SEREBO 
+        database without stats table) from datalog, blockchain and 
+        eventlog tables. Thereafter, stats table is maintained by 
+        Step 6A of insert data into SEREBO black box.
+        '''
+        sqlstmt = 'select count(*) from stats'
+        if [row for row in self.cur.execute(sqlstmt)][0][0] >= 3:
+            return
+        # Take the write lock so that no append is missed
+        self._retryBusy(self.cur.execute, 'begin immediate')
+        sqldata = []
+        for (name, ID, dtstamp, hashfield) in \
+            (('datalog', 'ID', 'dtstamp', 'hash'),
+             ('blockchain', 'c_ID', 'c_dtstamp', 'c_hash'),
+             ('eventlog', 'ID', 'dtstamp', None)):
+            sqlstmt = 'select count(*), min(%s), max(%s) from %s' % \
+                      (ID, ID, name)
+            (records, first_ID, last_ID) = \
+                [row for row in self.cur.execute(sqlstmt)][0]
+            last_dtstamp = None
+            last_hash = None
+            if last_ID is not None:
+                sqlstmt = 'select %s, %s from %s where %s=?' % \
+                          (dtstamp, hashfield or 'null', name, ID)
+                (last_dtstamp, last_hash) = \
+                    [row for row in self.cur.execute(sqlstmt, 
+                                                     (last_ID,))][0]
+            sqldata.append((name, records, first_ID, last_ID, 
+                            last_dtstamp, last_hash))
+        sqlstmt = '''insert or replace into stats (name, records, 
+            first_ID, last_ID, last_dtstamp, last_hash) values 
+            (?,?,?,?,?,?)'''
+        self.cur.executemany(sqlstmt, sqldata)
+        self._retryBusy(self.conn.commit)
+
+    def stats(self):
+        '''!
+        Method to get the statistics of SEREBO database from stats 
+        table, which is updated within each data insertion event; 
+        hence, this does not read datalog, blockchain or eventlog 
+        tables.
+
+        A dictionary will be returned with datalog, blockchain and 
+        eventlog as keys, and each value is a dictionary with the 
+        following keys - Records (number of records), FirstID, LastID, 
+        LastDateTimeStamp and LastHash (hash of the last record; None 
+        for eventlog).
+
+        @return: Dictionary of statistics.
+        '''
+        sqlstmt = '''select name, records, first_ID, last_ID, 
+            last_dtstamp, last_hash from stats'''
+        rdat = {}
+        for row in self.cur.execute(sqlstmt):
+            rdat[str(row[0])] = {'Records': int(row[1]),
+                                 'FirstID': row[2],
+                                 'LastID': row[3],
+                                 'LastDateTimeStamp': row[4],
+                                 'LastHash': row[5]}
+        return rdat
+
+    def _insertData1A(self, data, description, hashing=True):
         '''!
         Private method - Step 1 of insert data into SEREBO black box. 
         Called by insertData method. Step 1 (1) gets a UTC date time 
@@ -208,7 +661,9 @@ class SereboDB(object):
         methods is that _insertData1A() method will suffix the 
         description with a 10-character random string before using it 
         to generate the hash whereas _insertData1B() method uses the 
-        original (un-suffixed) description in hash generation.
+        original (un-suffixed) description in hash generation. If 
+        hashing is False, the data to hash is returned instead of the 
+        hash (for hashing a batch of data together).
         '''
         dtstamp = self.dtStamp()
         DL_data = str(data)
@@ -217,12 +672,15 @@ class SereboDB(object):
         else:
             description = str(description) + ':' + \
                           self.randomString(10)
-        DL_hash = self.hash(bytes(dtstamp, 'utf-8') + \
-                            bytes(DL_data, 'utf-8') + \
-                            bytes(description, 'utf-8'))
+        hashdata = bytes(dtstamp, 'utf-8') + \
+                   bytes(DL_data, 'utf-8') + \
+                   bytes(description, 'utf-8')
+        if not hashing:
+            return (dtstamp, DL_data, description, hashdata)
+        DL_hash = self.hash(hashdata)
         return (dtstamp, DL_data, description, DL_hash)
 
-    def _insertData1B(self, data, description):
+    def _insertData1B(self, data, description, hashing=True):
         '''!
         Private method - Step 1 of insert data into SEREBO black box. 
         Called by insertData method. Step 1 (1) gets a UTC date time 
@@ -234,14 +692,19 @@ class SereboDB(object):
         methods is that _insertData1A() method will suffix the 
         description with a 10-character random string before using it 
         to generate the hash whereas _insertData1B() method uses the 
-        original (un-suffixed) description in hash generation.
+        original (un-suffixed) description in hash generation. If 
+        hashing is False, the data to hash is returned instead of the 
+        hash (for hashing a batch of data together).
         '''
         dtstamp = self.dtStamp()
         DL_data = str(data)
         description = str(description)
-        DL_hash = self.hash(bytes(dtstamp, 'utf-8') + \
-                            bytes(DL_data, 'utf-8') + \
-                            bytes(description, 'utf-8'))
+        hashdata = bytes(dtstamp, 'utf-8') + \
+                   bytes(DL_data, 'utf-8') + \
+                   bytes(description, 'utf-8')
+        if not hashing:
+            return (dtstamp, DL_data, description, hashdata)
+        DL_hash = self.hash(hashdata)
         return (dtstamp, DL_data, description, DL_hash)
 
     def _insertData2(self, dtstamp, DL_data, description, 
@@ -252,9 +715,15 @@ class SereboDB(object):
         Step 1 into datalog table.
         '''
         sqlstmt = '''insert into datalog (dtstamp, hash, data, 
-            description) values (?,?,?,?)'''
+            description, dtstamp_us) values (?,?,?,?,?)'''
         sqldata = (str(dtstamp), str(DL_hash), str(DL_data), 
-                   str(description))
+                   str(description), storage.packStamp(dtstamp))
+        if self.storage == 2:
+            sqlstmt = '''insert into datalog2 (dtstamp, hash, data, 
+                description) values (?,?,?,?)'''
+            sqldata = (storage.packStamp(dtstamp), 
+                       storage.packHash(DL_hash), str(DL_data), 
+                       str(description))
         self.cur.execute(sqlstmt, sqldata)
         if debug:
             print('Step 1&2: Inserted Data into Data Log ...')
@@ -318,10 +787,18 @@ class SereboDB(object):
         '''
         sqldata = (str(dtstamp), str(BC_rstr), str(BC_hash), str(p_ID),
                    str(p_dtstamp), str(p_randomstring), str(p_hash), 
-                   str(DL_hash))
+                   str(DL_hash), storage.packStamp(dtstamp))
         sqlstmt = '''insert into blockchain (c_dtstamp, 
             c_randomstring, c_hash, p_ID, p_dtstamp, p_randomstring, 
-            p_hash, data) values (?,?,?,?,?,?,?,?)'''
+            p_hash, data, c_dtstamp_us) values (?,?,?,?,?,?,?,?,?)'''
+        if self.storage == 2:
+            # Parent block is referenced by p_ID
+            sqldata = (storage.packStamp(dtstamp), str(BC_rstr), 
+                       storage.packHash(BC_hash), int(p_ID), 
+                       storage.packHash(DL_hash))
+            sqlstmt = '''insert into blockchain2 (c_dtstamp, 
+                c_randomstring, c_hash, p_ID, data) values 
+                (?,?,?,?,?)'''
         self.cur.execute(sqlstmt, sqldata)
         if debug:
             print('Step 5: Insert Data into Blockchain (New Block) ...')
@@ -329,26 +806,368 @@ class SereboDB(object):
             print('New Block Hash: %s' % BC_hash)
             print('')
 
+    def _insertData5A(self, dtstamp, c_ID, debug):
+        '''!
+        Private method - Step 5A of insert data into SEREBO black box. 
+        Called by insertData method. Step 5A records a checkpoint when 
+        checkpoint_interval blocks have been added since the last 
+        checkpoint. A checkpoint records the Merkle root of the hashes 
+        of the blocks it covers (accumulator), and is chained to the 
+        previous checkpoint by hash; hence, a range of blocks can be 
+        verified from the checkpoints without walking every block 
+        (see checkpoint.verifyRange() function).
+        '''
+        if self.checkpoint_interval <= 0:
+            return
+        sqlstmt = '''select end_cID, hash from checkpoint order by ID 
+            desc limit 1'''
+        result = [row for row in self.cur.execute(sqlstmt)]
+        if result:
+            start_cID = int(result[0][0]) + 1
+            p_hash = str(result[0][1])
+        else:
+            start_cID = 1
+            p_hash = checkpoint.genesisHash
+        end_cID = start_cID + self.checkpoint_interval - 1
+        if int(c_ID) < end_cID:
+            return
+        CP_acc = checkpoint.accumulator(self, start_cID, end_cID)
+        CP_hash = checkpoint.checkpointHash(p_hash, start_cID, 
+                                            end_cID, CP_acc)
+        sqlstmt = '''insert into checkpoint (dtstamp, start_cID, 
+            end_cID, accumulator, p_hash, hash) values 
+            (?,?,?,?,?,?)'''
+        self.cur.execute(sqlstmt, (str(dtstamp), start_cID, end_cID, 
+                                   CP_acc, p_hash, CP_hash))
+        if debug:
+            print('Step 5A: Insert Checkpoint ...')
+            print('Checkpoint Blocks: %s to %s' % (start_cID, end_cID))
+            print('Checkpoint Hash: %s' % CP_hash)
+            print('')
+
     def _insertData6(self, dtstamp, description, 
-                     DL_hash, p_hash, BC_hash):
+                     DL_hash, p_hash, BC_hash, DL_ID, c_ID, 
+                     etype=eventInsert):
         '''!
         Private method - Step 6 of insert data into SEREBO black box. 
         Called by insertData method. Step 6 records the current data 
         insertion event into eventlog tables by recording the date 
         time stamp, parent block hash, data hash, and current block 
-        hash.
+        hash. In lean event log mode, only the event type code, the 
+        datalog ID and the block ID are recorded (in eventlog_ref 
+        table), as the rest are in datalog and blockchain.
         '''
+        if self.eventlog == 'lean':
+            sqlstmt = '''insert into eventlog_ref (type, DL_ID, c_ID) 
+                values (?,?,?)'''
+            self.cur.execute(sqlstmt, (int(etype), int(DL_ID), 
+                                       int(c_ID)))
+            return self.cur.lastrowid
         fID = self.randomString(10)
         sqlstmt = '''insert into eventlog (dtstamp, fID, description) 
         values (?,?,?)'''
         sqldata = (str(dtstamp), str(fID), str(description))
         self.cur.execute(sqlstmt, sqldata)
+        E_ID = self.cur.lastrowid
         sqlstmt = '''insert into eventlog_datamap (dtstamp, fID, key, 
             value) values (?,?,?,?)'''
         sqldata = [(str(dtstamp), str(fID), 'DataHash', str(DL_hash)),
                    (str(dtstamp), str(fID), 'ParentHash', str(p_hash)),
                    (str(dtstamp), str(fID), 'BlockHash', str(BC_hash))]
+        if self.storage == 2:
+            sqlstmt = sqlstmt.replace('eventlog_datamap', 
+                                      'eventlog_datamap2')
+            sqldata = [(storage.packStamp(x[0]), x[1], x[2], 
+                        storage.packValue(x[3])) for x in sqldata]
         self.cur.executemany(sqlstmt, sqldata)
+        return E_ID
+
+    def _insertData6A(self, DL_IDs, DL_dtstamp, DL_hash, c_ID, 
+                      dtstamp, BC_hash, E_ID):
+        '''!
+        Private method - Step 6A of insert data into SEREBO black box. 
+        Called by insertData method. Step 6A updates stats table 
+        (number of records, first and last IDs, and the last date 
+        time stamps and hashes) of datalog, blockchain and eventlog 
+        tables in the same transaction as the data insertion event. 
+        Hence, the number of records and the tip of blockchain can be 
+        read from stats table without reading the tables (see stats() 
+        method).
+        '''
+        sqlstmt = '''update stats set records=records+?, 
+            first_ID=coalesce(first_ID, ?), last_ID=?, last_dtstamp=?, 
+            last_hash=? where name=?'''
+        sqldata = [(len(DL_IDs), DL_IDs[0], DL_IDs[-1], str(DL_dtstamp),
+                    str(DL_hash), 'datalog'),
+                   (1, c_ID, c_ID, str(dtstamp), str(BC_hash), 
+                    'blockchain'),
+                   (1, E_ID, E_ID, str(dtstamp), None, 'eventlog')]
+        self.cur.executemany(sqlstmt, sqldata)
+
+    def _insertData7(self):
+        '''!
+        Private method - Step 7 of insert data into SEREBO black box. 
+        Called by insertData method. Step 7 commits the current data 
+        insertion event, either immediately or as part of a group 
+        commit (see flush() method). In group commit mode, a Durable 
+        event is returned, which will be set once the data insertion 
+        event is committed; otherwise, None is returned.
+        '''
+        if self.commit_size <= 1:
+            self._retryBusy(self.conn.commit)
+            return None
+        durable = Durable()
+        self._pending.append(durable)
+        if len(self._pending) >= self.commit_size:
+            self._flush()
+        elif len(self._pending) == 1:
+            self._deadline = time.monotonic() + \
+                             self.commit_interval / 1000
+            if not self.threadsafe:
+                self._timer = threading.Timer(
+                    self.commit_interval / 1000, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return durable
+
+    def _flush(self):
+        '''!
+        Private method - commits all pending data insertion events and 
+        notifies the inserting callers. Must be called by the thread 
+        owning the writing connection.
+        '''
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        try:
+            self._retryBusy(self.conn.commit)
+        except Exception as e:
+            self._rollback(e)
+            raise
+        for durable in self._pending:
+            durable.set()
+        self._pending = []
+        self._deadline = None
+
+    def _rollback(self, error):
+        '''!
+        Private method - rolls back the current transaction after a 
+        failed append or commit, releasing the write lock of SEREBO 
+        database. In group commit mode, the pending data insertion 
+        events are in the same transaction and are rolled back too - 
+        their Durable events are set with the exception as error 
+        attribute. Must be called by the thread owning the writing 
+        connection.
+        '''
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        try:
+            self.conn.rollback()
+        except sqlite3.Error:
+            pass
+        for durable in self._pending:
+            durable.error = error
+            durable.set()
+        self._pending = []
+        self._deadline = None
+
+    def _submit(self, task, args=()):
+        '''!
+        Private method - passes a task to the writer thread (in 
+        thread-safe mode) and waits for its result.
+        '''
+        future = Future()
+        self._queue.put((task, args, future))
+        return future.result()
+
+    def _writeLoop(self):
+        '''!
+        Private method - the writer thread in thread-safe mode. Takes 
+        tasks from the queue in arrival order and carries them out 
+        using the writer thread's own connection. In group commit 
+        mode, pending data insertion events are committed when 
+        commit_interval milliseconds have passed without reaching 
+        commit_size records.
+        '''
+        while True:
+            timeout = None
+            if self._deadline is not None:
+                timeout = max(0, self._deadline - time.monotonic())
+            try:
+                (task, args, future) = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush()
+                continue
+            try:
+                if task == 'insert':
+                    future.set_result(self._appendData(*args))
+                elif task == 'batch':
+                    future.set_result(self._appendBatch(*args))
+                elif task == 'flush':
+                    self._flush()
+                    future.set_result(None)
+                elif task == 'close':
+                    self._flush()
+                    self.conn.close()
+                    self._local.conn = None
+                    future.set_result(None)
+                    return
+            except Exception as e:
+                future.set_exception(e)
+
+    def flush(self):
+        '''!
+        Method to commit all pending data insertion events in group 
+        commit mode, and to notify the inserting callers that their 
+        blocks are durable. This is called automatically when either 
+        commit_size records or commit_interval milliseconds have 
+        accumulated.
+        '''
+        if self.threadsafe and \
+            threading.current_thread() is not self._writer:
+            return self._submit('flush')
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        '''!
+        Method to commit all pending data insertion events and close 
+        SEREBO database. In thread-safe mode, the writer thread is 
+        stopped and only the calling thread's own connection is 
+        closed.
+        '''
+        if not self.threadsafe:
+            self.flush()
+            self.conn.close()
+            return
+        if self._writer.is_alive():
+            self._submit('close')
+            self._writer.join()
+        if getattr(self._local, 'conn', None) is not None:
+            self._local.conn.close()
+            self._local.conn = None
+
+    def _retryBusy(self, function, *args):
+        '''!
+        Private method - calls the given function, retrying with 
+        exponential backoff (with random jitter) while SEREBO database 
+        is locked by another connection or process, and records the 
+        contention in contention attribute.
+        '''
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                result = function(*args)
+                break
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) and 'busy' not in str(e):
+                    raise
+                if attempt >= self.busy_retries:
+                    self.contention['Failures'] = \
+                        self.contention['Failures'] + 1
+                    raise
+                attempt = attempt + 1
+                self.contention['Retries'] = \
+                    self.contention['Retries'] + 1
+                backoff = min(1.0, 0.005 * (2 ** attempt))
+                time.sleep(backoff * random.uniform(0.5, 1.0))
+        wait = time.monotonic() - start
+        self.contention['WaitSeconds'] = \
+            self.contention['WaitSeconds'] + wait
+        if wait > self.contention['MaxWaitSeconds']:
+            self.contention['MaxWaitSeconds'] = wait
+        if attempt > 0:
+            self.contention['ContendedTransactions'] = \
+                self.contention['ContendedTransactions'] + 1
+        return result
+
+    def _beginAppend(self):
+        '''!
+        Private method - starts an immediate transaction (taking the 
+        write lock of SEREBO database) for appending to the 
+        blockchain, unless a transaction is already in progress (such 
+        as in group commit mode).
+        '''
+        if self.conn.in_transaction:
+            return
+        self._retryBusy(self.cur.execute, 'begin immediate')
+        self.contention['Transactions'] = \
+            self.contention['Transactions'] + 1
+
+    def contentionStats(self):
+        '''!
+        Method to get the lock contention metrics of this SEREBO 
+        database object - Transactions is the number of immediate 
+        transactions started for blockchain appends, 
+        ContendedTransactions is the number of locking attempts which 
+        needed at least one retry, Retries is the total number of 
+        retries, Failures is the number of locking attempts which 
+        failed after all retries, WaitSeconds is the total time spent 
+        on locking, and MaxWaitSeconds is the longest time spent on 
+        a single locking attempt.
+
+        @return: Dictionary of contention metrics.
+        '''
+        return dict(self.contention)
+
+    def _appendData(self, data, dtstamp, DL_data, description, 
+                    DL_hash, debug):
+        '''!
+        Private method - Steps 2 to 8 of insert data into SEREBO black 
+        box, which append prepared data (from Step 1) to the 
+        blockchain. Called by insertData method, or by the writer 
+        thread in thread-safe mode.
+        '''
+        # Take the write lock before reading the latest block
+        self._beginAppend()
+        try:
+            # Step 2: Insert data into datalog
+            self._insertData2(dtstamp, DL_data, description, 
+                              DL_hash, debug)
+            DL_ID = self.cur.lastrowid
+            # Step 3: Get latest block in blockchain
+            (p_ID, p_dtstamp, p_randomstring, p_hash) = \
+                self._insertData3(debug)
+            # Step 4: Prepare data for blockchain insertion
+            (BC_rstr, BC_hash) = self._insertData4(p_dtstamp, 
+                                                   p_randomstring, 
+                                                   p_hash, 
+                                                   DL_hash)
+            # Step 5: Insert data into blockchain
+            self._insertData5(dtstamp, BC_rstr, BC_hash, p_ID,
+                              p_dtstamp, p_randomstring, p_hash, 
+                              DL_hash, debug)
+            c_ID = self.cur.lastrowid
+            # Step 5A: Insert checkpoint (if due)
+            self._insertData5A(dtstamp, c_ID, debug)
+            # Step 6: Insert event into eventlog
+            E_ID = self._insertData6(dtstamp, description, 
+                                     DL_hash, p_hash, BC_hash, 
+                                     DL_ID, c_ID)
+            # Step 6A: Update statistics
+            self._insertData6A([DL_ID], dtstamp, DL_hash, c_ID, 
+                               dtstamp, BC_hash, E_ID)
+            # Step 7: Commit (immediately or as group commit)
+            durable = self._insertData7()
+        except Exception as e:
+            self._rollback(e)
+            raise
+        # Step 8: Return data
+        result = {'DateTimeStamp': dtstamp,
+                  'Data': data,
+                  'UserDescription': description,
+                  'DataHash': DL_hash,
+                  'ParentBlockID': p_ID,
+                  'ParentDateTimeStamp': p_dtstamp,
+                  'ParentRandomString': p_randomstring,
+                  'ParentHash': p_hash,
+                  'BlockRandomString': BC_rstr,
+                  'BlockHash': BC_hash}
+        if durable is not None:
+            result['Durable'] = durable
+        return result
 
     def insertData(self, data, description='NA', mode='text', 
                    debug=False):
@@ -372,7 +1191,10 @@ class SereboDB(object):
         parent block in blockchain, (9) BlockRandomString is the 
         random string generated for current insertion event, and (10) 
         BlockHash is the block hash of current insertion event in 
-        blockchain.
+        blockchain. In group commit mode, (11) Durable is a Durable 
+        event which is set when this insertion event is committed - 
+        its error attribute is None, or the exception if the event is 
+        rolled back by a failed append or commit in the same group.
 
         @param data String: Data to be inserted.
         @param description String: Explanation string for this entry 
@@ -395,34 +1217,143 @@ class SereboDB(object):
         elif mode.lower() == 'ftext':
             (dtstamp, DL_data, description, DL_hash) = \
                 self._insertData1B(data, description)
-        # Step 2: Insert data into datalog
-        self._insertData2(dtstamp, DL_data, description, 
-                          DL_hash, debug)
-        # Step 3: Get latest block in blockchain
-        (p_ID, p_dtstamp, p_randomstring, p_hash) = \
-            self._insertData3(debug)
-        # Step 4: Prepare data for blockchain insertion
-        (BC_rstr, BC_hash) = self._insertData4(p_dtstamp, 
-                                               p_randomstring, 
-                                               p_hash, 
-                                               DL_hash)
-        # Step 5: Insert data into blockchain
-        self._insertData5(dtstamp, BC_rstr, BC_hash, p_ID,
-                          p_dtstamp, p_randomstring, p_hash, 
-                          DL_hash, debug)
-        # Step 6: Insert event into eventlog
-        self._insertData6(dtstamp, description, 
-                          DL_hash, p_hash, BC_hash)
-        # Step 7: Commit 
-        self.conn.commit()
+        # Steps 2 to 8: Append to blockchain
+        if self.threadsafe:
+            return self._submit('insert', (data, dtstamp, DL_data,
+                                           description, DL_hash, 
+                                           debug))
+        with self._lock:
+            return self._appendData(data, dtstamp, DL_data, 
+                                    description, DL_hash, debug)
+
+    def _appendBatch(self, prepared, debug):
+        '''!
+        Private method - appends a batch of prepared data (from Step 1 
+        of insert data) to the blockchain as a single block, which 
+        commits to the Merkle root of the data hashes. Called by 
+        insertBatch method, or by the writer thread in thread-safe 
+        mode.
+        '''
+        # Take the write lock before reading the latest block
+        self._beginAppend()
+        try:
+            # Step 2: Insert data into datalog
+            IDs = []
+            for (data, dtstamp, DL_data, description, DL_hash) in \
+                    prepared:
+                self._insertData2(dtstamp, DL_data, description, 
+                                  DL_hash, debug)
+                IDs.append(self.cur.lastrowid)
+            DL_hashes = [x[4] for x in prepared]
+            root = merkle.merkleRoot(DL_hashes)
+            dtstamp = self.dtStamp()
+            # Step 3: Get latest block in blockchain
+            (p_ID, p_dtstamp, p_randomstring, p_hash) = \
+                self._insertData3(debug)
+            # Step 4: Prepare data for blockchain insertion
+            (BC_rstr, BC_hash) = self._insertData4(p_dtstamp, 
+                                                   p_randomstring, 
+                                                   p_hash, root)
+            # Step 5: Insert data into blockchain and merkleblock
+            self._insertData5(dtstamp, BC_rstr, BC_hash, p_ID,
+                              p_dtstamp, p_randomstring, p_hash, 
+                              root, debug)
+            c_ID = self.cur.lastrowid
+            sqlstmt = '''insert into merkleblock (c_ID, start_ID, 
+                end_ID, root) values (?,?,?,?)'''
+            self.cur.execute(sqlstmt, (c_ID, IDs[0], IDs[-1], root))
+            # Step 5A: Insert checkpoint (if due)
+            self._insertData5A(dtstamp, c_ID, debug)
+            # Step 6: Insert event into eventlog
+            description = 'Merkle batch of %s records (%s to %s)' % \
+                (str(len(IDs)), str(IDs[0]), str(IDs[-1]))
+            E_ID = self._insertData6(dtstamp, description, 
+                                     root, p_hash, BC_hash, 
+                                     IDs[0], c_ID, eventBatch)
+            # Step 6A: Update statistics
+            self._insertData6A(IDs, prepared[-1][1], prepared[-1][4], 
+                               c_ID, dtstamp, BC_hash, E_ID)
+            # Step 7: Commit (immediately or as group commit)
+            durable = self._insertData7()
+        except Exception as e:
+            self._rollback(e)
+            raise
         # Step 8: Return data
-        return {'DateTimeStamp': dtstamp,
-                'Data': data,
-                'UserDescription': description,
-                'DataHash': DL_hash,
-                'ParentBlockID': p_ID,
-                'ParentDateTimeStamp': p_dtstamp,
-                'ParentRandomString': p_randomstring,
-                'ParentHash': p_hash,
-                'BlockRandomString': BC_rstr,
-                'BlockHash': BC_hash}
+        result = {'DateTimeStamp': dtstamp,
+                  'Data': [x[0] for x in prepared],
+                  'UserDescription': [x[3] for x in prepared],
+                  'DataHash': DL_hashes,
+                  'DataID': IDs,
+                  'MerkleRoot': root,
+                  'BlockID': c_ID,
+                  'ParentBlockID': p_ID,
+                  'ParentDateTimeStamp': p_dtstamp,
+                  'ParentRandomString': p_randomstring,
+                  'ParentHash': p_hash,
+                  'BlockRandomString': BC_rstr,
+                  'BlockHash': BC_hash}
+        if durable is not None:
+            result['Durable'] = durable
+        return result
+
+    def insertBatch(self, data, description='NA', mode='text', 
+                    debug=False, workers=None):
+        '''!
+        Method to insert a batch of data into SEREBO database as a 
+        single block. Each data will be recorded in datalog table 
+        together with its hash, as in insertData method. However, 
+        only one block is added to blockchain table for the whole 
+        batch - the data of the block is the Merkle root of the data 
+        hashes of the batch (in order of datalog ID), and the block 
+        is mapped to the range of datalog IDs in merkleblock table. 
+        Hence, the inclusion of a single record in the blockchain can 
+        be verified by an inclusion proof of log2(batch size) hashes 
+        (see merkleProof() function in serebo_api).
+
+        A dictionary of items generated will be returned with the 
+        same keys as insertData method, except that Data, 
+        UserDescription and DataHash are lists (in the order of the 
+        given data), and with the following additional keys: (1) 
+        DataID is the list of datalog IDs of the batch, (2) 
+        MerkleRoot is the Merkle root of the data hashes, and (3) 
+        BlockID is the ID of the block in blockchain.
+
+        @param data List: List of data to be inserted.
+        @param description String or List: Explanation string for all 
+        data, or list of explanation strings (one for each data). 
+        Default = NA.
+        @param mode String: Type of data to insert - 'text', 'ftext' 
+        or 'file' (see insertData method). Default = 'text'.
+        @param debug Boolean: Flag to print out debugging statements.
+        @param workers Integer: Number of processes to hash the batch 
+        of data (see hashBatch() function). Default = None (hashing in 
+        the calling thread).
+        @return: Dictionary of data generated from this event.
+        '''
+        data = list(data)
+        if not data:
+            raise ValueError('Batch of data to insert is empty')
+        if isinstance(description, (list, tuple)):
+            description = list(description)
+        else:
+            description = [description] * len(data)
+        # Step 1: Preparing data - random strings for the batch are 
+        # drawn into the pool at once
+        tokens.pool.fill(len(data) * 10 + 64)
+        prepared = []
+        for (d, desc) in zip(data, description):
+            if mode.lower() == 'text':
+                (dtstamp, DL_data, desc, hashdata) = \
+                    self._insertData1A(d, desc, hashing=False)
+            else:
+                (dtstamp, DL_data, desc, hashdata) = \
+                    self._insertData1B(d, desc, hashing=False)
+            prepared.append((d, dtstamp, DL_data, desc, hashdata))
+        DL_hashes = hashBatch([x[4] for x in prepared], workers)
+        prepared = [x[0:4] + (DL_hash,) 
+                    for (x, DL_hash) in zip(prepared, DL_hashes)]
+        # Steps 2 to 8: Append to blockchain as one block
+        if self.threadsafe:
+            return self._submit('batch', (prepared, debug))
+        with self._lock:
+            return self._appendBatch(prepared, debug)
@@ -26,19 +26,50 @@ import secrets
 import os.path
 import time
 
+from . import chunks
+from . import hashers
+from . import merkle
 from . import sereboDB
+from . import storage
 from .sereboDB import SereboDB
 
-def connectDB(bbpath='serebo_blackbox\\blackbox.sdb'):
+def connectDB(bbpath='serebo_blackbox\\blackbox.sdb', commit_size=1,
+              commit_interval=100, threadsafe=False, busy_timeout=1000,
+              busy_retries=8, checkpoint_interval=10000, storage=1,
+              eventlog=None):
     '''!
     Function to connect to SEREBO database - the recorder box.
 
     @param bbpath String: Path to SEREBO black box. Default = 
     'serebo_blackbox\\blackbox.sdb'.
+    @param commit_size Integer: Number of inserted records to 
+    accumulate before committing them together (group commit). 
+    Default = 1 (every insert is committed immediately).
+    @param commit_interval Float: Maximum number of milliseconds 
+    that an insert can wait to be committed in group commit mode. 
+    Default = 100.
+    @param threadsafe Boolean: Flag to use thread-safe mode, where a 
+    dedicated writer thread carries out all data insertions and each 
+    other thread reads using its own connection. Default = False.
+    @param busy_timeout Integer: Number of milliseconds to wait for a 
+    lock on SEREBO database before retrying. Default = 1000.
+    @param busy_retries Integer: Maximum number of retries (with 
+    exponential backoff) for a lock on SEREBO database. Default = 8.
+    @param checkpoint_interval Integer: Number of blocks covered by 
+    each checkpoint. Default = 10000 (0 to disable checkpoints).
+    @param storage Integer: Storage version of a new SEREBO black box 
+    - 1 (text) or 2 (compact; hashes as BLOBs and date time stamps 
+    as integers). Default = 1.
+    @param eventlog String: Event log mode of a new SEREBO black box 
+    - 'full' or 'lean' (only IDs and event type are recorded for each 
+    event; see eventlogEntry() function). Default = None ('lean' for 
+    storage version 2 and 'full' for storage version 1).
     @return: SEREBO database object
     '''
     bbpath = os.path.abspath(bbpath)
-    db = SereboDB(bbpath)
+    db = SereboDB(bbpath, commit_size, commit_interval, threadsafe,
+                  busy_timeout, busy_retries, checkpoint_interval, 
+                  storage, eventlog)
     return db
 
 def systemData():
@@ -145,6 +176,116 @@ def insertFText(sdb_object, text, description='NA'):
     rdata = sdb_object.insertData(text, description, 'ftext')
     return rdata
 
+def insertBatch(sdb_object, texts, description='NA', mode='text',
+                workers=None):
+    '''!
+    Function to insert a batch of text strings into SEREBO database as 
+    a single block, which commits to the Merkle root of the data 
+    hashes of the batch. See SereboDB.insertBatch() for the returned 
+    dictionary.
+
+    @param sdb_object Object: SEREBO database object.
+    @param texts List: List of text strings to be inserted.
+    @param description String or List: Explanation string for all 
+    text strings, or list of explanation strings (one for each text 
+    string). Default = NA.
+    @param mode String: Type of data to insert. Allowable modes are 
+    'text' (description text is suffixed with a 10-character random 
+    string) and 'ftext' (description text is not suffixed). Default = 
+    'text'.
+    @param workers Integer: Number of processes to hash the text 
+    strings. Default = None (hashing in the calling thread).
+    @return: Dictionary of data generated from this event.
+    '''
+    rdata = sdb_object.insertBatch(texts, description, mode, 
+                                   workers=workers)
+    return rdata
+
+def merkleProof(sdb_object, ID):
+    '''!
+    Function to generate the inclusion proof of a datalog record in 
+    the Merkle root of its block - for records inserted by 
+    insertBatch() function.
+
+    A dictionary of items generated will be returned with the 
+    following keys: (1) ID is the datalog ID of the record, (2) 
+    DataHash is the hash of the record, (3) BlockID is the ID of the 
+    block in blockchain, (4) MerkleRoot is the Merkle root of the 
+    block, and (5) Proof is the inclusion proof (see 
+    merkle.merkleProof()).
+
+    @param sdb_object Object: SEREBO database object.
+    @param ID Integer: Datalog ID of the record.
+    @return: Dictionary of inclusion proof, or None if the record is 
+    not in a Merkle batch.
+    '''
+    ID = int(ID)
+    sqlstmt = '''select c_ID, start_ID, end_ID, root from merkleblock 
+        where start_ID <= ? order by start_ID desc limit 1'''
+    result = [row for row in sdb_object.cur.execute(sqlstmt, (ID,))]
+    if not result or int(result[0][2]) < ID:
+        return None
+    (c_ID, start_ID, end_ID, root) = result[0]
+    sqlstmt = '''select hash from datalog where ID >= ? and ID <= ? 
+        order by ID'''
+    leaves = [str(row[0]) for row in 
+              sdb_object.cur.execute(sqlstmt, (start_ID, end_ID))]
+    index = ID - int(start_ID)
+    return {'ID': ID,
+            'DataHash': leaves[index],
+            'BlockID': int(c_ID),
+            'MerkleRoot': str(root),
+            'Proof': merkle.merkleProof(leaves, index)}
+
+def eventlogEntry(sdb_object, ID):
+    '''!
+    Function to get an event from the event log, with the key/value 
+    data of the event (DataHash, ParentHash and BlockHash) - in lean 
+    event log mode, the event is reconstructed from its record in 
+    datalog and its block in blockchain.
+
+    A dictionary will be returned with the following keys - ID, 
+    DateTimeStamp, fID, Description, DataHash, ParentHash and 
+    BlockHash.
+
+    @param sdb_object Object: SEREBO database object.
+    @param ID Integer: Event log ID.
+    @return: Dictionary of event, or None if the event is not found.
+    '''
+    ID = int(ID)
+    if sdb_object.eventlog == 'lean':
+        sqlstmt = 'select c_ID from eventlog_ref where ID=?'
+        result = [row for row in sdb_object.cur.execute(sqlstmt, (ID,))]
+        if not result:
+            return None
+        sqlstmt = '''select c_dtstamp, data, p_hash, c_hash from 
+            blockchain where c_ID=?'''
+        block = [row for row in 
+                 sdb_object.cur.execute(sqlstmt, (result[0][0],))][0]
+        sqlstmt = 'select description from eventlog where ID=?'
+        description = [row for row in 
+                       sdb_object.cur.execute(sqlstmt, (ID,))][0][0]
+        return {'ID': ID,
+                'DateTimeStamp': str(block[0]),
+                'fID': str(ID),
+                'Description': str(description),
+                'DataHash': str(block[1]),
+                'ParentHash': str(block[2]),
+                'BlockHash': str(block[3])}
+    sqlstmt = 'select dtstamp, fID, description from eventlog where ID=?'
+    result = [row for row in sdb_object.cur.execute(sqlstmt, (ID,))]
+    if not result:
+        return None
+    rdat = {'ID': ID,
+            'DateTimeStamp': str(result[0][0]),
+            'fID': str(result[0][1]),
+            'Description': str(result[0][2])}
+    sqlstmt = '''select key, value from eventlog_datamap where 
+        dtstamp=? and fID=?'''
+    for row in sdb_object.cur.execute(sqlstmt, result[0][0:2]):
+        rdat[str(row[0])] = str(row[1])
+    return rdat
+
 def absolutePath(filepath):
     '''!
     Function to convert file path (absolute or relative file path) 
@@ -155,61 +296,113 @@ def absolutePath(filepath):
     '''
     return os.path.abspath(filepath)
 
-def fileHash(filepath):
+def fileHash(filepath, backend=None, cache=None, rehash=False, 
+             chunksize=None, workers=None):
     '''!
-    Function to generate a series of 12 hashes for a given file, in 
-    the format of <MD5>:<SHA1>:<SHA224>:<SHA3 244>:<SHA256>:<SHA3 
-    256>:<SHA384>:<SHA3 384>:<SHA512>:<SHA3 215>:<Blake 2b>:<Blake 
-    2s>.
+    Function to generate the hash of a given file. By default, this 
+    is a series of 12 hashes in the format of <MD5>:<SHA1>:<SHA224>:
+    <SHA3 244>:<SHA256>:<SHA3 256>:<SHA384>:<SHA3 384>:<SHA512>:<SHA3 
+    215>:<Blake 2b>:<Blake 2s>. Other hash backends (see hashers 
+    module) give a single hash prefixed by the name of backend, such 
+    as blake3:<BLAKE3>. In chunked mode, the file is hashed in 
+    chunks of chunksize bytes and the hash is in the format of 
+    chunks:<backend>:<chunk size>:<Merkle root of chunk hashes> (see 
+    chunks module).
 
     @param filepath String: Path of file for hash generation.
+    @param backend String: Name of hash backend. Default = None 
+    (serebo12 - the series of 12 hashes).
+    @param cache Object: File hash cache (hashcache.HashCache 
+    object) - the cached hash is used if the file had not changed 
+    since it was hashed. Default = None (no cache).
+    @param rehash Boolean: Flag to hash the file even if it is in 
+    the cache, and to refresh the cache. Default = False.
+    @param chunksize Integer: Chunk size for chunked mode, which does 
+    not use the file hash cache. Default = None (not chunked).
+    @param workers Integer: Number of threads for hashing chunks. 
+    Default = None (uses ThreadPoolExecutor default).
     @return: Hash
     '''
     absPath = absolutePath(filepath)
-    md5 = hashlib.md5()
-    sha1 = hashlib.sha1()
-    sha224 = hashlib.sha224()
-    sha3_224 = hashlib.sha3_224()
-    sha256 = hashlib.sha256()
-    sha3_256 = hashlib.sha3_256()
-    sha384 = hashlib.sha384()
-    sha3_384 = hashlib.sha3_384()
-    sha512 = hashlib.sha512()
-    sha3_512 =  hashlib.sha3_512() 
-    blake2b = hashlib.blake2b()
-    blake2s = hashlib.blake2s()
-    with open(absPath, 'rb') as f:
-        while True:
-            data = f.read(65536)
-            if not data:
-                break
-            md5.update(data)
-            sha1.update(data)
-            sha224.update(data)
-            sha3_224.update(data)
-            sha256.update(data)
-            sha3_256.update(data)
-            sha384.update(data)
-            sha3_384.update(data)
-            sha512.update(data)
-            sha3_512.update(data)
-            blake2b.update(data)
-            blake2s.update(data)
-    x = [md5.hexdigest(),
-         sha1.hexdigest(), 
-         sha224.hexdigest(),
-         sha3_224.hexdigest(),
-         sha256.hexdigest(), 
-         sha3_256.hexdigest(),
-         sha384.hexdigest(),
-         sha3_384.hexdigest(), 
-         sha512.hexdigest(), 
-         sha3_512.hexdigest(), 
-         blake2b.hexdigest(), 
-         blake2s.hexdigest()]
-    return ':'.join(x)
-
-def logFile(sdb_object, filepath, description='NA'):
+    if chunksize is not None:
+        return chunks.chunkFile(absPath, backend, chunksize, 
+                                workers)[0]
+    if cache is not None:
+        return cache.fileHash(absPath, backend, rehash)
+    return hashers.getBackend(backend).fileHash(absPath)
+
+def fileHashAs(filepath, recorded, cache=None, rehash=False, 
+               workers=None):
+    '''!
+    Function to generate the hash of a given file in the same way as 
+    a recorded file hash - with the hash backend (and chunk size for 
+    chunked file hashes) identified from the recorded file hash.
+
+    @param filepath String: Path of file for hash generation.
+    @param recorded String: Recorded file hash.
+    @param cache Object: File hash cache (see fileHash()). Default = 
+    None (no cache).
+    @param rehash Boolean: Flag to hash the file even if it is in 
+    the cache. Default = False.
+    @param workers Integer: Number of threads for hashing chunks. 
+    Default = None (uses ThreadPoolExecutor default).
+    @return: Hash
+    '''
+    if chunks.isChunked(recorded):
+        (backend, chunksize, root) = chunks.parseChunked(recorded)
+        return fileHash(filepath, backend, chunksize=chunksize, 
+                        workers=workers)
+    return fileHash(filepath, hashers.backendOf(recorded), cache, 
+                    rehash)
+
+def fileDescription(filepath, description='NA', backend=None):
+    '''!
+    Function to generate the description string used when logging a 
+    file into SEREBO database - consisting of the user given file 
+    path, the absolute file path, the user given description, and 
+    the hash backend (if not the default backend).
+
+    @param filepath String: Path of file to log in SEREBO black box.
+    @param description String: Explanation string for this entry 
+    event. Default = NA.
+    @param backend String: Name of hash backend. Default = None 
+    (serebo12).
+    @return: Description string
+    '''
+    absPath = absolutePath(filepath)
+    if description == 'NA':
+        description = ['UserGivenPath:>%s' % str(filepath),
+                       'AbsolutePath:>%s' % str(absPath)]
+        if backend not in (None, hashers.defaultBackend):
+            description.append('HashBackend:>%s' % str(backend))
+    else:
+        description = ['UserGivenPath :> %s' % str(filepath),
+                       'AbsolutePath :> %s' % str(absPath),
+                       'UserDescription :> %s' % str(description)]
+        if backend not in (None, hashers.defaultBackend):
+            description.append('HashBackend :> %s' % str(backend))
+    return ' >> '.join(description)
+
+def parseFileDescription(description):
+    '''!
+    Function to parse the description string of a file logging event 
+    (see fileDescription() function) into a dictionary with 
+    UserGivenPath, AbsolutePath, UserDescription (if given) and 
+    HashBackend (if not the default backend) as keys.
+
+    @param description String: Description string.
+    @return: Dictionary of description.
+    '''
+    rdat = {}
+    for item in str(description).split(' >> '):
+        if ':>' in item:
+            (key, value) = item.split(':>', 1)
+            rdat[key.strip()] = value.strip()
+    return rdat
+
+def logFile(sdb_object, filepath, description='NA', backend=None, 
+            cache=None, rehash=False, chunksize=None, workers=None, 
+            append=False):
     '''!
     Function to logging a file into SEREBO database.
 
@@ -226,49 +419,432 @@ def logFile(sdb_object, filepath, description='NA'):
     parent block in blockchain, (9) BlockRandomString is the 
     random string generated for current insertion event, and (10) 
     BlockHash is the block hash of current insertion event in 
-    blockchain.
+    blockchain. Extends (datalog ID of the previous file logging 
+    record extended in append mode, or None) is an additional key.
+
+    In append mode (for files which only grow, such as instrument 
+    logs), the file is hashed in chunked mode, and the chunks of the 
+    previous file logging record of the same absolute path are 
+    reused - only the last previous chunk (to check that the file 
+    still extends it) and the appended bytes are hashed. The bytes 
+    before the last previous chunk are not read again; verifyFile() 
+    checks them. The new record is described as extending the 
+    previous record (Extends in the description). If the file does 
+    not extend the previous record, it is hashed in full.
 
     @param sdb_object Object: SEREBO database object.
     @param fileapth String: Path of file to log in SEREBO black box.
     @param description String: Explanation string for this entry 
     event. Default = NA.
+    @param backend String: Name of hash backend (see hashers 
+    module), which is recorded in the description and as the prefix 
+    of the file hash. Default = None (serebo12).
+    @param cache Object: File hash cache (see fileHash()). Default = 
+    None (no cache).
+    @param rehash Boolean: Flag to hash the file even if it is in 
+    the cache. Default = False.
+    @param chunksize Integer: Chunk size for chunked mode (see 
+    fileHash()) - the hash of each chunk is kept in the black box 
+    for verification by chunks (see verifyFile()). Default = None 
+    (not chunked).
+    @param workers Integer: Number of threads for hashing chunks. 
+    Default = None (uses ThreadPoolExecutor default).
+    @param append Boolean: Flag for append mode. The hash backend 
+    and chunk size of the previous record are used if chunksize is 
+    not given (default chunk size if the previous record is not 
+    chunked). Default = False.
     @return: Dictionary of data generated from this event.
     '''
     absPath = absolutePath(filepath)
+    extends = None
+    reuse = None
+    if append:
+        (extends, reuse, backend, chunksize) = \
+            _appendBase(sdb_object, absPath, backend, chunksize)
+    userDescription = description
+    description = fileDescription(filepath, description, backend)
+    if extends is not None:
+        sep = ':>' if userDescription == 'NA' else ' :> '
+        description = description + ' >> Extends%s%s' % (sep, 
+                                                        str(extends))
+    if chunksize is None:
+        fHash = fileHash(absPath, backend, cache, rehash)
+    else:
+        (fHash, chunklist) = chunks.chunkFile(absPath, backend, 
+                                              chunksize, workers, 
+                                              reuse)
+        chunks.storeChunks(sdb_object, fHash, chunklist)
+    rdata = sdb_object.insertData(fHash, description, 'file')
+    rdata['Extends'] = extends
+    return rdata
+
+def _appendBase(sdb_object, absPath, backend, chunksize):
+    '''!
+    Private function - finds the previous file logging record of a 
+    file for logFile() in append mode, and checks that the file 
+    extends it (its last chunk is unchanged).
+
+    @return: (datalog ID of previous record or None, chunks of 
+    previous record to reuse or None, hash backend, chunk size)
+    '''
+    # Local import - fileindex module imports this module
+    from . import fileindex
+    fileindex.updateIndex(sdb_object)
+    entry = fileindex.lookupFile(sdb_object, absPath)
+    previous = None
+    if entry is not None and chunks.isChunked(entry['FileHash']):
+        previous = chunks.parseChunked(entry['FileHash'])
+        if chunksize is None:
+            (backend, chunksize) = previous[:2]
+    if chunksize is None:
+        chunksize = chunks.defaultChunkSize
+    backend = hashers.getBackend(backend).name
+    if previous is None or previous[:2] != (backend, int(chunksize)):
+        return (None, None, backend, chunksize)
+    chunklist = chunks.loadChunks(sdb_object, entry['FileHash'])
+    if not chunklist:
+        return (None, None, backend, chunksize)
+    (offset, length, digest) = chunklist[-1]
+    if os.path.getsize(absPath) < offset + length or \
+            chunks.chunkDigest(absPath, offset, length, 
+                               backend) != digest:
+        return (None, None, backend, chunksize)
+    return (entry['ID'], chunklist, backend, chunksize)
+
+def logStream(sdb_object, stream, description='NA', backend=None, 
+              output=None, source='stdin'):
+    '''!
+    Function to log the data read from a binary stream (such as 
+    standard input or a named pipe) into SEREBO database - the data 
+    is hashed as it is read (without being written to disk and read 
+    again), and the hash is logged as a file hash. The data can be 
+    written to an output file as it is hashed; the output file is 
+    then logged as a file (see logFile()) and can be searched or 
+    verified as a logged file.
+
+    A dictionary of items generated will be returned with the same 
+    keys as logFile(), and with Bytes (number of bytes read) and 
+    OutputPath (absolute path of output file, or None) as additional 
+    keys.
+
+    @param sdb_object Object: SEREBO database object.
+    @param stream Object: Binary file object to read from.
+    @param description String: Explanation string for this entry 
+    event. Default = NA.
+    @param backend String: Name of hash backend. Default = None 
+    (serebo12).
+    @param output String: Path of output file to write the data to. 
+    Default = None (data is not written).
+    @param source String: Name of the stream, which is recorded in 
+    the description. Default = stdin.
+    @return: Dictionary of data generated from this event.
+    '''
+    hasher = hashers.getBackend(backend)
+    if output is None:
+        (fHash, size) = hasher.streamHash(stream)
+    else:
+        with open(output, 'wb') as tee:
+            (fHash, size) = hasher.streamHash(stream, tee)
+    # Same form of description as fileDescription()
     if description == 'NA':
-        description = ['UserGivenPath:>%s' % str(filepath),
-                       'AbsolutePath:>%s' % str(absPath)]
+        sep = ':>'
+        items = []
     else:
-        description = ['UserGivenPath :> %s' % str(filepath),
-                       'AbsolutePath :> %s' % str(absPath),
-                       'UserDescription :> %s' % str(description)]
-    description = ' >> '.join(description)
-    fHash = fileHash(absPath)
+        sep = ' :> '
+        items = ['UserDescription :> %s' % str(description)]
+    items = ['StreamSource%s%s' % (sep, str(source)),
+             'Bytes%s%s' % (sep, str(size))] + items
+    if backend not in (None, hashers.defaultBackend):
+        items.append('HashBackend%s%s' % (sep, str(backend)))
+    if output is None:
+        description = ' >> '.join(items)
+    else:
+        description = fileDescription(output, description, backend) + \
+            ' >> ' + ' >> '.join(items[:2])
     rdata = sdb_object.insertData(fHash, description, 'file')
+    rdata['Bytes'] = size
+    rdata['OutputPath'] = None if output is None else absolutePath(output)
     return rdata
 
-def searchDatalog(sdb_object, term, field, mode='like'):
+def verifyFile(sdb_object, ID, filepath=None, workers=None):
+    '''!
+    Function to verify a file against its file logging record in 
+    datalog - the file hash is recomputed with the hash backend of 
+    the record (identified from the recorded file hash) and compared 
+    with the recorded file hash. A file logged in chunked mode is 
+    verified chunk by chunk in parallel against the chunk hashes 
+    kept in the black box, stopping at the first changed chunk.
+
+    A dictionary will be returned with the following keys - ID, 
+    FilePath, HashBackend, RecordedHash, FileHash (None if 
+    verification stopped at a changed chunk), Verified, and 
+    BadChunk (None, or (chunk number, offset, length) of the first 
+    changed chunk found; see chunks.verifyChunks()).
+
+    @param sdb_object Object: SEREBO database object.
+    @param ID Integer: Datalog ID of the file logging record.
+    @param filepath String: Path of file to verify. Default = None 
+    (the absolute path in the description of the record).
+    @param workers Integer: Number of threads for hashing chunks. 
+    Default = None (uses ThreadPoolExecutor default).
+    @return: Dictionary of verification results, or None if the 
+    record is not found.
+    '''
+    sqlstmt = 'select data, description from datalog where ID=?'
+    result = [row for row in sdb_object.cur.execute(sqlstmt, 
+                                                    (int(ID),))]
+    if not result:
+        return None
+    recorded = str(result[0][0])
+    if filepath is None:
+        filepath = parseFileDescription(result[0][1]).get(
+            'AbsolutePath')
+    backend = hashers.backendOf(recorded)
+    rdat = {'ID': int(ID),
+            'FilePath': filepath,
+            'HashBackend': backend,
+            'RecordedHash': recorded,
+            'FileHash': None,
+            'Verified': False,
+            'BadChunk': None}
+    if filepath is None or not os.path.isfile(filepath):
+        return rdat
+    chunklist = None
+    if chunks.isChunked(recorded):
+        chunklist = chunks.loadChunks(sdb_object, recorded)
+    if chunklist is not None:
+        result = chunks.verifyChunks(filepath, recorded, chunklist, 
+                                     workers)
+        rdat['Verified'] = result['Verified']
+        rdat['BadChunk'] = result['BadChunk']
+        if result['Verified']:
+            rdat['FileHash'] = recorded
+    else:
+        rdat['FileHash'] = fileHashAs(filepath, recorded, 
+                                      workers=workers)
+        rdat['Verified'] = rdat['FileHash'] == recorded
+    return rdat
+
+## Fields of datalog table which can be searched
+searchFields = ['ID', 'dtstamp', 'hash', 'data', 'description']
+
+def _searchCondition(term, field, mode, since, until):
     '''!
-    Function to search datalog table.
+    Private function - generates the SQL condition (and its list of 
+    parameters) of a search on datalog table, after checking the 
+    search field and mode.
+    '''
+    field = str(field)
+    if field not in searchFields:
+        raise ValueError('Unknown search field: %s' % field)
+    clauses = []
+    sqldata = []
+    if term is not None:
+        if str(mode).lower() == 'exact':
+            clauses.append('%s = ?' % field)
+        elif str(mode).lower() == 'like':
+            clauses.append('%s like ?' % field)
+        else:
+            raise ValueError('Unknown search mode: %s' % str(mode))
+        sqldata.append(str(term))
+    (clause, scopedata) = scopeClause(since=since, until=until)
+    clauses.append(clause)
+    return (' and '.join(clauses), sqldata + scopedata)
+
+def _searchProjection(fields):
+    '''!
+    Private function - checks the fields to return from a search on 
+    datalog table, given as a list or a comma-separated string, and 
+    returns them as a list.
+    '''
+    if fields is None:
+        return list(searchFields)
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    fields = [str(f).strip() for f in fields if str(f).strip()]
+    if not fields:
+        raise ValueError('No field to return')
+    for f in fields:
+        if f not in searchFields:
+            raise ValueError('Unknown search field: %s' % f)
+    return fields
+
+def countDatalog(sdb_object, term=None, field='data', mode='like',
+                 since=None, until=None, after_id=None):
+    '''!
+    Function to count the records in datalog table matching a search, 
+    without fetching the records. The count is done by the database 
+    (select count(*)); hence, no data or description is read out of 
+    the database.
+
+    @param sdb_object Object: SEREBO database object.
+    @param term String: Case sensitive search term. If None, all 
+    records (within since and until) are counted. Default = None.
+    @param field String: Field name to search - one of searchFields. 
+    Default = 'data'.
+    @param mode String: Mode of search. Allowable modes are 'like' and 
+    'exact'. Default = 'like'.
+    @param since Object: Earliest time (inclusive) of records to 
+    count. Default = None.
+    @param until Object: Latest time (exclusive) of records to count. 
+    Default = None.
+    @param after_id Integer: Count only records with ID larger than 
+    after_id. Default = None.
+    @return: Number of matching records.
+    '''
+    (clause, sqldata) = _searchCondition(term, field, mode, since, 
+                                         until)
+    sqlstmt = 'select count(*) from datalog where %s and ID > ?' % clause
+    result = sdb_object.cur.execute(sqlstmt, 
+                                    sqldata + [int(after_id or 0)])
+    return int(result.fetchone()[0])
+
+def streamDatalog(sdb_object, term=None, field='data', mode='like',
+                  since=None, until=None, after_id=None, limit=None,
+                  pagesize=1000, fields=None):
+    '''!
+    Generator function to search datalog table, yielding matching rows 
+    in the order of ID. Rows are fetched in pages of pagesize rows by 
+    keyset pagination (rows with ID larger than the last row 
+    fetched); hence, memory use does not grow with the number of 
+    matching rows, and no database cursor is held between pages. To 
+    continue a search, use the ID of the last row received as 
+    after_id.
 
     @param sdb_object Object: SEREBO database object.
-    @param term String: Case sensitive search term.
+    @param term String: Case sensitive search term. If None, all 
+    records (within since and until) are returned. Default = None.
+    @param field String: Field name to search - one of searchFields. 
+    Default = 'data'.
+    @param mode String: Mode of search. Allowable modes are 'like' and 
+    'exact'. If mode is 'like', wildcards such as '_' (matches any 
+    single character) and '%' (matches any number of characters). 
+    Default = 'like'.
+    @param since Object: Earliest time (inclusive) of records to 
+    return - seconds since epoch, SEREBO date time stamp or ISO 8601 
+    date time (see storage.parseTime() function). Default = None.
+    @param until Object: Latest time (exclusive) of records to 
+    return. Default = None.
+    @param after_id Integer: Return only records with ID larger than 
+    after_id. Default = None.
+    @param limit Integer: Maximum number of records to return. 
+    Default = None (no limit).
+    @param pagesize Integer: Number of rows fetched per query. 
+    Default = 1000.
+    @param fields Object: Fields to return (list or comma-separated 
+    string of searchFields), in the given order. Only these fields 
+    are read from the database; for example, ['ID', 'dtstamp'] does 
+    not read data and description. Default = None (all of 
+    searchFields).
+    @return: Generator of datalog rows: (ID, dtstamp, hash, data, 
+    description), or the fields given.
+    '''
+    fields = _searchProjection(fields)
+    (clause, sqldata) = _searchCondition(term, field, mode, since, 
+                                         until)
+    # ID is needed for keyset pagination
+    if fields[0] == 'ID':
+        columns = fields
+        skip = 0
+    else:
+        columns = ['ID'] + fields
+        skip = 1
+    sqlstmt = """select %s from datalog where %s and ID > ? order by ID limit ?""" % (', '.join(columns), clause)
+    last = int(after_id or 0)
+    count = 0
+    pagesize = max(1, int(pagesize))
+    while limit is None or count < int(limit):
+        size = pagesize
+        if limit is not None:
+            size = min(pagesize, int(limit) - count)
+        page = sdb_object.cur.execute(sqlstmt, 
+                                      sqldata + [last, size]).fetchall()
+        for row in page:
+            yield row[skip:]
+        count = count + len(page)
+        if len(page) < size:
+            break
+        last = page[-1][0]
+
+def searchDatalog(sdb_object, term, field, mode='like', since=None,
+                  until=None, after_id=None, limit=None, fields=None,
+                  count=False):
+    '''!
+    Function to search datalog table. See streamDatalog() function, 
+    which returns the rows as they are fetched, for details.
+
+    @param sdb_object Object: SEREBO database object.
+    @param term String: Case sensitive search term. If None, all 
+    records (within since and until) are returned.
     @param field String: Field name to search.
     @param mode String: Mode of search. Allowable modes are 'like' and 
     'exact'. If mode is 'like', wildcards such as '_' (matches any 
     single character) and '%' (matches any number of characters). 
     Default = 'like'.
+    @param since Object: Earliest time (inclusive) of records to 
+    return. Default = None.
+    @param until Object: Latest time (exclusive) of records to 
+    return. Default = None.
+    @param after_id Integer: Return only records with ID larger than 
+    after_id. Default = None.
+    @param limit Integer: Maximum number of records to return. 
+    Default = None (no limit).
+    @param fields Object: Fields to return (list or comma-separated 
+    string of searchFields). Default = None (all of searchFields).
+    @param count Boolean: Flag to return only the number of matching 
+    records (see countDatalog() function). Default = False.
     @return: List of datalog rows: [ID, dtstamp, hash, data, 
-    description]
+    description], or the fields given; or number of matching records 
+    if count is True.
     '''
-    term = str(term)
-    field = str(field)
-    if mode.lower() == 'exact':
-        sqlstmt = """select ID, dtstamp, hash, data, description from datalog where %s='%s'""" % (field, term)
-    if mode.lower() == 'like':
-        sqlstmt = """select ID, dtstamp, hash, data, description from datalog where %s like '%s'""" % (field, term)
-    result = [row for row in sdb_object.cur.execute(sqlstmt)]
-    return result
+    if count:
+        matches = countDatalog(sdb_object, term, field, mode, since, 
+                               until, after_id)
+        if limit is not None:
+            matches = min(matches, int(limit))
+        return matches
+    return [row for row in streamDatalog(sdb_object, term, field, mode,
+                                         since, until, after_id, 
+                                         limit, fields=fields)]
+
+def scopeClause(IDfield='ID', timefield='dtstamp_us', from_id=None,
+                to_id=None, since=None, until=None):
+    '''!
+    Function to generate the SQL condition to scope a query (such as 
+    an audit) to a range of IDs and/or a range of time. Both ranges 
+    use indices - ID fields are primary keys and timefield is an 
+    indexed integer microsecond date time stamp field (dtstamp_us in 
+    datalog table or c_dtstamp_us in blockchain table).
+
+    @param IDfield String: Name of ID field. Default = 'ID'.
+    @param timefield String: Name of integer microsecond date time 
+    stamp field. Default = 'dtstamp_us'.
+    @param from_id Integer: Smallest ID (inclusive). Default = None.
+    @param to_id Integer: Largest ID (inclusive). Default = None.
+    @param since Object: Earliest time (inclusive) - seconds since 
+    epoch, SEREBO date time stamp or ISO 8601 date time (see 
+    storage.parseTime() function). Default = None.
+    @param until Object: Latest time (exclusive). Default = None.
+    @return: (SQL condition, list of parameters) - SQL condition is 
+    '1' if not scoped.
+    '''
+    clauses = []
+    sqldata = []
+    if from_id is not None:
+        clauses.append('%s >= ?' % IDfield)
+        sqldata.append(int(from_id))
+    if to_id is not None:
+        clauses.append('%s <= ?' % IDfield)
+        sqldata.append(int(to_id))
+    if since is not None:
+        clauses.append('%s >= ?' % timefield)
+        sqldata.append(storage.parseTime(since))
+    if until is not None:
+        clauses.append('%s < ?' % timefield)
+        sqldata.append(storage.parseTime(until))
+    if not clauses:
+        return ('1', sqldata)
+    return (' and '.join(clauses), sqldata)
 
 def dateTime(sdb_object):
     '''!
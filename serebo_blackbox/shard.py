@@ -0,0 +1,249 @@
+'''!
+Secured Recorder Box (SEREBO) Sharded Black Boxes
+
+Date created: 19th October 2026
+
+License: GNU General Public License version 3 for academic or
+not-for-profit use only
+
+
+SEREBO is free software: you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+'''
+import hashlib
+import itertools
+import os
+import sqlite3
+import threading
+
+from . import serebo_api
+from .sereboDB import SereboDB
+
+class ShardedSerebo(object):
+    '''!
+    Class representing a set of sharded SEREBO black boxes. Each
+    shard is an independent SEREBO black box with its own blockchain,
+    so appends to different shards do not serialise on a common
+    blockchain tip. Records are routed to shards by key (hash of key
+    modulo number of shards) or in round-robin.
+
+    A root SEREBO black box acts as coordinator. Anchoring (see
+    anchor() method) records the hash of the latest block of each
+    shard into the blockchain of root black box; hence, tampering of
+    any shard up to its last anchored block can be detected from the
+    root blockchain (see auditAnchors() method).
+
+    The shards are kept in a folder as shard_<number>.sdb files, and
+    the root black box as root.sdb file.
+    '''
+    def __init__(self, folder, shards=4, anchor_interval=0,
+                 commit_size=1, commit_interval=100):
+        '''!
+        Initiation method - opens (or creates) the shards and root
+        black box. The number of shards is fixed when the folder is
+        first created; thereafter, the recorded number of shards is
+        used.
+
+        @param folder String: Folder for shards and root black box.
+        @param shards Integer: Number of shards. Default = 4.
+        @param anchor_interval Float: Number of seconds between
+        automatic anchoring of shards into root black box. Default =
+        0 (no automatic anchoring).
+        @param commit_size Integer: Number of inserted records to
+        accumulate before committing them together (group commit) in
+        each shard. Default = 1.
+        @param commit_interval Float: Maximum number of milliseconds
+        that an insert can wait to be committed in group commit mode.
+        Default = 100.
+        '''
+        self.folder = os.path.abspath(folder)
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+        self.root = SereboDB(os.sep.join([self.folder, 'root.sdb']),
+                             threadsafe=True)
+        try:
+            self.root.cur.execute('''insert into metadata (key, value)
+                values ('shard_count', ?)''', (str(int(shards)),))
+            self.root.conn.commit()
+        except sqlite3.IntegrityError:
+            self.root.conn.rollback()
+        sqlstmt = "select value from metadata where key='shard_count'"
+        self.count = int([row for row in
+                          self.root.cur.execute(sqlstmt)][0][0])
+        self.shards = [SereboDB(self.shardPath(i), commit_size,
+                                commit_interval, threadsafe=True)
+                       for i in range(self.count)]
+        self._roundrobin = itertools.count()
+        self._anchored = {}
+        sqlstmt = '''select description from datalog where
+            description like 'Shard anchor |%' order by ID'''
+        for row in self.root.cur.execute(sqlstmt):
+            description = [x.strip() for x in str(row[0]).split('|')]
+            self._anchored[int(description[1].split(': ')[1])] = \
+                int(description[2].split(': ')[1])
+        self._anchorlock = threading.Lock()
+        self._stop = threading.Event()
+        self._anchorer = None
+        if float(anchor_interval) > 0:
+            self._anchorer = threading.Thread(
+                target=self._anchorLoop, args=(float(anchor_interval),),
+                name='SereboShard-anchor', daemon=True)
+            self._anchorer.start()
+
+    def shardPath(self, index):
+        '''!
+        Method to get the path of a shard.
+
+        @param index Integer: Shard number.
+        @return: Absolute path of shard.
+        '''
+        return os.sep.join([self.folder, 'shard_%03d.sdb' % int(index)])
+
+    def route(self, key=None):
+        '''!
+        Method to select a shard for a record.
+
+        @param key String: Routing key - records of the same key are
+        always routed to the same shard. Default = None (round-robin).
+        @return: Shard number.
+        '''
+        if key is None:
+            return next(self._roundrobin) % self.count
+        digest = hashlib.sha256(bytes(str(key), 'utf-8')).digest()
+        return int.from_bytes(digest[:8], 'big') % self.count
+
+    def insertData(self, data, description='NA', mode='text',
+                   key=None):
+        '''!
+        Method to insert data into a shard. See SereboDB.insertData()
+        for the returned dictionary; Shard is added as the shard
+        number used.
+
+        @param data String: Data to be inserted.
+        @param description String: Explanation string for this entry
+        event. Default = NA.
+        @param mode String: Type of data to insert - 'text', 'ftext'
+        or 'file'. Default = 'text'.
+        @param key String: Routing key. Default = None (round-robin).
+        @return: Dictionary of data generated from this event.
+        '''
+        index = self.route(key)
+        rdata = self.shards[index].insertData(data, description, mode)
+        rdata['Shard'] = index
+        return rdata
+
+    def logFile(self, filepath, description='NA', key=None):
+        '''!
+        Method to log a file into a shard. See serebo_api.logFile()
+        for the returned dictionary; Shard is added as the shard
+        number used.
+
+        @param filepath String: Path of file to log.
+        @param description String: Explanation string for this entry
+        event. Default = NA.
+        @param key String: Routing key. Default = None (round-robin).
+        @return: Dictionary of data generated from this event.
+        '''
+        index = self.route(key)
+        rdata = serebo_api.logFile(self.shards[index], filepath,
+                                   description)
+        rdata['Shard'] = index
+        return rdata
+
+    def shardTip(self, index):
+        '''!
+        Method to get the latest committed block of a shard.
+
+        @param index Integer: Shard number.
+        @return: (block ID, block hash) or None if the shard is empty.
+        '''
+        sqlstmt = '''select c_ID, c_hash from blockchain where
+            c_ID = (select max(c_ID) from blockchain)'''
+        result = [row for row in
+                  self.shards[int(index)].cur.execute(sqlstmt)]
+        if not result:
+            return None
+        return (int(result[0][0]), str(result[0][1]))
+
+    def anchor(self):
+        '''!
+        Method to anchor the shards - the hash of the latest committed
+        block of each shard which has changed since its last anchoring
+        is recorded into root black box.
+
+        @return: List of (shard number, block ID, block hash) anchored.
+        '''
+        anchored = []
+        with self._anchorlock:
+            for index in range(self.count):
+                tip = self.shardTip(index)
+                if tip is None or self._anchored.get(index) == tip[0]:
+                    continue
+                description = ['Shard anchor',
+                               'Shard: %s' % str(index),
+                               'Block ID: %s' % str(tip[0]),
+                               'Shard Path: %s' % self.shardPath(index)]
+                self.root.insertData(tip[1], ' | '.join(description),
+                                     'ftext')
+                self._anchored[index] = tip[0]
+                anchored.append((index, tip[0], tip[1]))
+        return anchored
+
+    def _anchorLoop(self, interval):
+        '''!
+        Private method - anchors the shards every given number of
+        seconds until the shards are closed.
+        '''
+        while not self._stop.wait(interval):
+            self.anchor()
+
+    def auditAnchors(self):
+        '''!
+        Method to check that each anchor in root black box matches the
+        block hash in the shard.
+
+        @return: Dictionary of audit results - Verified is the number
+        of verified anchors and Errors is the list of (shard number,
+        block ID) failing the audit.
+        '''
+        sqlstmt = '''select data, description from datalog where
+            description like 'Shard anchor |%' '''
+        rdat = {'Verified': 0, 'Errors': []}
+        for row in [row for row in self.root.cur.execute(sqlstmt)]:
+            description = [x.strip() for x in str(row[1]).split('|')]
+            index = int(description[1].split(': ')[1])
+            blockID = int(description[2].split(': ')[1])
+            sqlstmt = 'select c_hash from blockchain where c_ID=?'
+            result = [r for r in
+                      self.shards[index].cur.execute(sqlstmt,
+                                                     (blockID,))]
+            if result and str(result[0][0]) == str(row[0]):
+                rdat['Verified'] = rdat['Verified'] + 1
+            else:
+                rdat['Errors'].append((index, blockID))
+        return rdat
+
+    def close(self):
+        '''!
+        Method to stop automatic anchoring, anchor the shards for the
+        last time, and close the shards and root black box.
+        '''
+        self._stop.set()
+        if self._anchorer is not None:
+            self._anchorer.join()
+        for shard in self.shards:
+            shard.flush()
+        self.anchor()
+        for shard in self.shards:
+            shard.close()
+        self.root.close()
@@ -0,0 +1,288 @@
+'''!
+Secured Recorder Box (SEREBO) Compact Storage (Version 2)
+
+Date created: 19th October 2026
+
+License: GNU General Public License version 3 for academic or
+not-for-profit use only
+
+
+SEREBO is free software: you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+In storage version 1, hashes are stored as text of 12 hexadecimal
+digests joined by ':', date time stamps are stored as text, and each
+block in blockchain repeats the date time stamp, random string and
+hash of its parent block.
+
+In storage version 2, datalog and blockchain data are kept in
+datalog2 and blockchain2 tables, where hashes are stored as
+fixed-width BLOBs of the 12 digests (476 bytes instead of 963
+characters), date time stamps as integer microseconds since epoch
+(UTC), and the parent of each block is referenced by its ID. The
+hashes in eventlog are kept in eventlog_datamap2 table in the same
+way. The text forms of version 1 are reconstructed by datalog,
+blockchain and eventlog_datamap views; hence, audits, searches and
+dumps reading these tables work with either storage version.
+
+In lean event log mode (the default for storage version 2; see
+sereboDB.SereboDB), eventlog_datamap2 table is not used as the hashes
+of each event are not recorded in event log.
+
+In both storage versions, datalog and blockchain have indexed
+integer microsecond date time stamps (dtstamp_us and c_dtstamp_us
+columns) for time range queries.
+'''
+import calendar
+from datetime import datetime
+from datetime import timezone
+
+## Width (in bytes) of each of the 12 digests in SEREBO hash - MD5,
+## SHA1, SHA224, SHA3 224, SHA256, SHA3 256, SHA384, SHA3 384,
+## SHA512, SHA3 512, Blake 2b, Blake 2s
+digestWidths = [16, 20, 28, 28, 32, 32, 48, 48, 64, 64, 64, 32]
+
+genesisBlock = ('0', 'GenesisBlock:SEREBO_MauriceHTLing',
+                'TheWord:OmAhHum')
+
+def packHash(hexhash):
+    '''!
+    Function to convert a SEREBO hash (12 hexadecimal digests joined
+    by ':') into a fixed-width BLOB.
+
+    @param hexhash String: SEREBO hash.
+    @return: Bytes of 476 bytes.
+    '''
+    digests = str(hexhash).split(':')
+    if [len(x) // 2 for x in digests] != digestWidths:
+        raise ValueError('Not a SEREBO hash: %s' % str(hexhash)[:64])
+    return bytes.fromhex(''.join(digests))
+
+def unpackHash(blob):
+    '''!
+    Function to convert a fixed-width BLOB into SEREBO hash (12
+    hexadecimal digests joined by ':').
+
+    @param blob Bytes: BLOB from packHash() function.
+    @return: SEREBO hash.
+    '''
+    digests = []
+    start = 0
+    for width in digestWidths:
+        digests.append(bytes(blob[start:start+width]).hex())
+        start = start + width
+    return ':'.join(digests)
+
+def packValue(value):
+    '''!
+    Function to convert a value into BLOB - SEREBO hash is converted
+    into fixed-width BLOB, and other values are kept as text.
+
+    @param value String: Value.
+    @return: Bytes or String.
+    '''
+    try:
+        return packHash(value)
+    except ValueError:
+        return str(value)
+
+def packStamp(dtstamp):
+    '''!
+    Function to convert a SEREBO date time stamp string (<year>:
+    <month>:<day>:<hour>:<minute>:<second>:<microsecond>, in UTC)
+    into integer microseconds since epoch.
+
+    @param dtstamp String: SEREBO date time stamp.
+    @return: Integer microseconds since epoch.
+    '''
+    x = [int(i) for i in str(dtstamp).split(':')]
+    if len(x) != 7:
+        raise ValueError('Not a SEREBO date time stamp: %s' %
+                         str(dtstamp))
+    seconds = calendar.timegm((x[0], x[1], x[2], x[3], x[4], x[5]))
+    return seconds * 1000000 + x[6]
+
+def unpackStamp(microseconds):
+    '''!
+    Function to convert integer microseconds since epoch into SEREBO
+    date time stamp string.
+
+    @param microseconds Integer: Microseconds since epoch.
+    @return: SEREBO date time stamp string.
+    '''
+    (seconds, microsecond) = divmod(int(microseconds), 1000000)
+    now = datetime.utcfromtimestamp(seconds)
+    now = [str(now.year), str(now.month), str(now.day),
+           str(now.hour), str(now.minute), str(now.second),
+           str(microsecond)]
+    return ':'.join(now)
+
+def parseTime(value):
+    '''!
+    Function to convert a time into integer microseconds since epoch
+    (UTC), for range queries on dtstamp_us columns. The time can be
+    given as (1) number of seconds since epoch, (2) SEREBO date time
+    stamp string, or (3) ISO 8601 date or date time string, such as
+    '2026-10-19', '2026-10-19T08:30:00' or '2026-10-19 08:30:00+08:00'
+    (date time without time zone is taken as UTC).
+
+    @param value Object: Time.
+    @return: Integer microseconds since epoch.
+    '''
+    if isinstance(value, (int, float)):
+        return int(round(value * 1000000))
+    value = str(value).strip()
+    if value.count(':') == 6 and '-' not in value:
+        return packStamp(value)
+    if value.endswith('Z') or value.endswith('z'):
+        value = value[:-1] + '+00:00'
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            return int(round(float(value) * 1000000))
+        except ValueError:
+            raise ValueError('Unknown time format: %s' % value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    delta = moment - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86400 + delta.seconds) * 1000000 + \
+           delta.microseconds
+
+def isoTime(microseconds):
+    '''!
+    Function to convert integer microseconds since epoch into ISO 8601
+    date time string (UTC).
+
+    @param microseconds Integer: Microseconds since epoch.
+    @return: ISO 8601 date time string.
+    '''
+    (seconds, microsecond) = divmod(int(microseconds), 1000000)
+    moment = datetime.fromtimestamp(seconds, timezone.utc)
+    return moment.replace(microsecond=microsecond).isoformat()
+
+def sqlHash(column):
+    '''!
+    Function to generate the SQL expression reconstructing SEREBO
+    hash text from a BLOB column.
+
+    @param column String: Name of BLOB column.
+    @return: SQL expression.
+    '''
+    parts = []
+    start = 1
+    for width in digestWidths:
+        parts.append('lower(hex(substr(%s, %s, %s)))' %
+                     (column, str(start), str(width)))
+        start = start + width
+    return " || ':' || ".join(parts)
+
+def sqlStamp(column):
+    '''!
+    Function to generate the SQL expression reconstructing SEREBO
+    date time stamp text from an integer microseconds column.
+
+    @param column String: Name of integer column.
+    @return: SQL expression.
+    '''
+    seconds = '%s / 1000000' % column
+    parts = ["cast(strftime('%s', %s, 'unixepoch') as integer)" %
+             (field, seconds)
+             for field in ['%Y', '%m', '%d', '%H', '%M', '%S']]
+    parts.append('(%s %% 1000000)' % column)
+    return " || ':' || ".join(parts)
+
+def createStatements(eventlog='full'):
+    '''!
+    Function to generate the SQL statements to create the tables,
+    indices and views of storage version 2.
+
+    @param eventlog String: Event log mode - 'full' or 'lean'
+    (eventlog_datamap2 table and eventlog_datamap view are not
+    created). Default = 'full'.
+    @return: List of SQL statements.
+    '''
+    sql_datalog2_create = '''
+    create table if not exists datalog2 (
+        ID integer primary key autoincrement,
+        dtstamp integer not null,
+        hash blob not null,
+        data blob,
+        description blob not null);'''
+    sql_datalog2_unique = '''
+    create unique index if not exists datalog2_unique on datalog2 (
+        dtstamp, hash);'''
+    sql_blockchain2_create = '''
+    create table if not exists blockchain2 (
+        c_ID integer primary key autoincrement,
+        c_dtstamp integer not null,
+        c_randomstring text not null,
+        c_hash blob not null,
+        p_ID integer not null,
+        data blob not null);'''
+    sql_blockchain2_index = '''
+    create index if not exists blockchain2_dtstamp on blockchain2 (
+        c_dtstamp);'''
+    sql_datalog_view = '''
+    create view if not exists datalog as select
+        ID,
+        %s as dtstamp,
+        %s as hash,
+        data,
+        description,
+        dtstamp as dtstamp_us
+    from datalog2;''' % (sqlStamp('dtstamp'), sqlHash('hash'))
+    sql_blockchain_view = '''
+    create view if not exists blockchain as select
+        c.c_ID as c_ID,
+        %s as c_dtstamp,
+        c.c_randomstring as c_randomstring,
+        %s as c_hash,
+        c.p_ID as p_ID,
+        case when c.p_ID = 0 then '%s' else %s end as p_dtstamp,
+        case when c.p_ID = 0 then '%s' else p.c_randomstring end
+            as p_randomstring,
+        case when c.p_ID = 0 then '%s' else %s end as p_hash,
+        %s as data,
+        c.c_dtstamp as c_dtstamp_us
+    from blockchain2 c left join blockchain2 p on p.c_ID = c.p_ID;
+    ''' % (sqlStamp('c.c_dtstamp'), sqlHash('c.c_hash'),
+           genesisBlock[0], sqlStamp('p.c_dtstamp'),
+           genesisBlock[1], genesisBlock[2], sqlHash('p.c_hash'),
+           sqlHash('c.data'))
+    sql_eventlog_datamap2_create = '''
+    create table if not exists eventlog_datamap2 (
+        dtstamp integer not null,
+        fID text not null,
+        key text not null,
+        value blob not null);'''
+    sql_eventlog_datamap_view = '''
+    create view if not exists eventlog_datamap as select
+        %s as dtstamp,
+        fID,
+        key,
+        case when typeof(value) = 'blob' and length(value) = %s
+            then %s else value end as value
+    from eventlog_datamap2;''' % (sqlStamp('dtstamp'),
+                                  str(sum(digestWidths)),
+                                  sqlHash('value'))
+    statements = [sql_datalog2_create,
+                  sql_datalog2_unique,
+                  sql_blockchain2_create,
+                  sql_blockchain2_index,
+                  sql_datalog_view,
+                  sql_blockchain_view]
+    if eventlog == 'full':
+        statements = statements + [sql_eventlog_datamap2_create,
+                                   sql_eventlog_datamap_view]
+    return statements
@@ -0,0 +1,154 @@
+'''!
+Secured Recorder Box (SEREBO) Random Tokens
+
+Date created: 19th October 2026
+
+License: GNU General Public License version 3 for academic or
+not-for-profit use only
+
+
+SEREBO is free software: you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+Random strings (such as description suffixes, block random strings
+and black box IDs) are drawn from the operating system's
+cryptographically secure random source (os.urandom) in bulk, and
+mapped to the 80-character alphabet by a translation table - each
+random byte below 240 (3 x 80) is mapped to one character and bytes
+from 240 to 255 are discarded, so that every character is equally
+likely. The mapped characters are kept in a pool, and each random
+string is taken from the pool. A forked child process discards the
+pools inherited from its parent, so that parent and child never take
+the same random strings.
+'''
+import os
+import string
+import threading
+import weakref
+
+## The 80 characters of SEREBO random strings
+alphabet = string.ascii_letters + string.digits + '~!@#$%^&*()<>=+[]?'
+
+## Translation table mapping random bytes (0 to 239) to alphabet
+_table = bytes([ord(alphabet[i % len(alphabet)]) for i in range(256)])
+
+## Random bytes discarded to keep the characters equally likely
+_discard = bytes(range(240, 256))
+
+def randomChars(length):
+    '''!
+    Function to generate a random string from os.urandom, without
+    pooling.
+
+    @param length Integer: Length of random string to generate.
+    @return: Random string
+    '''
+    length = int(length)
+    chars = b''
+    while len(chars) < length:
+        # 1/16 of random bytes are discarded
+        size = (length - len(chars)) * 17 // 16 + 16
+        chars = chars + os.urandom(size).translate(_table, _discard)
+    return chars[:length].decode('ascii')
+
+## All pools of random characters in this process
+_pools = weakref.WeakSet()
+
+class TokenPool(object):
+    '''!
+    Class representing a pool of random characters, which is refilled
+    from os.urandom in blocks of at least poolsize characters. Random
+    strings are taken from the pool; hence, the system call and
+    mapping are carried out once per block instead of once per random
+    string. The pool can be used by multiple threads.
+    '''
+    def __init__(self, poolsize=4096):
+        '''!
+        Initiation method.
+
+        @param poolsize Integer: Minimum number of random characters
+        generated for each refill. Default = 4096.
+        '''
+        self.poolsize = int(poolsize)
+        self._reset()
+        _pools.add(self)
+
+    def _reset(self):
+        '''!
+        Private method - empties the pool, with a new lock (the lock
+        inherited by a forked child may be held by a thread which does
+        not exist in the child).
+        '''
+        self._pool = ''
+        self._position = 0
+        self._lock = threading.Lock()
+
+    def fill(self, count):
+        '''!
+        Method to ensure that at least count random characters are in
+        the pool, such as before a batch of data insertions.
+
+        @param count Integer: Number of random characters needed.
+        '''
+        with self._lock:
+            self._fill(int(count))
+
+    def _fill(self, count):
+        '''!
+        Private method - refills the pool if it has less than count
+        random characters. Must be called with the lock held.
+        '''
+        remaining = len(self._pool) - self._position
+        if remaining >= count:
+            return
+        self._pool = self._pool[self._position:] + \
+            randomChars(max(self.poolsize, count - remaining))
+        self._position = 0
+
+    def take(self, length):
+        '''!
+        Method to take a random string from the pool.
+
+        @param length Integer: Length of random string.
+        @return: Random string
+        '''
+        length = int(length)
+        with self._lock:
+            self._fill(length)
+            token = self._pool[self._position:self._position+length]
+            self._position = self._position + length
+        return token
+
+## Default pool of random characters
+pool = TokenPool()
+
+def _afterFork():
+    '''!
+    Private function - called in a forked child process to discard
+    the pools of random characters inherited from the parent.
+    '''
+    for tokenpool in list(_pools):
+        tokenpool._reset()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_afterFork)
+
+def randomToken(length=64):
+    '''!
+    Function to generate a random string from the default pool.
+
+    @param length Integer: Length of random string to generate.
+    Default = 64.
+    @return: Random string
+    '''
+    return pool.take(length)
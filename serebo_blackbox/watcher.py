@@ -0,0 +1,379 @@
+'''!
+Secured Recorder Box (SEREBO) Directory Watcher
+
+Date created: 19th October 2026
+
+License: GNU General Public License version 3 for academic or
+not-for-profit use only
+
+
+SEREBO is free software: you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation, either version 3 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+The directory watcher logs new and modified files under a directory
+into SEREBO black box as they are written. On Linux, file events are
+received from the kernel by inotify (through ctypes, without other
+packages); hence, the watcher sleeps until files are changed. On
+other platforms (or if inotify is not available), the directory is
+scanned every interval seconds for files with changed size or
+modification time.
+
+A file is only logged when it is settled - closed after writing (or
+moved into the directory) with no further change for debounce
+seconds under inotify, or unchanged in size and modification time for
+debounce seconds when polling. Hence, a burst of writes to a file is
+logged once. Settled files are hashed in a pool of threads and
+appended to the blockchain in batches (as Merkle batches; see
+sereboDB.SereboDB.insertBatch method). A file whose content is the
+same as when it was last logged by the watcher is not logged again.
+'''
+import ctypes
+import ctypes.util
+import os
+import select
+import stat
+import struct
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import serebo_api
+
+## inotify event masks (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+## Size of inotify event header - wd, mask, cookie, len
+_eventHeader = struct.calcsize('iIII')
+
+class _Inotify(object):
+    '''!
+    Private class - inotify instance (Linux only) watching
+    directories for written, moved in and created files.
+    '''
+    mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6',
+                           use_errno=True)
+        self._addWatch = libc.inotify_add_watch
+        self._addWatch.argtypes = [ctypes.c_int, ctypes.c_char_p,
+                                   ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self.directories = {}
+
+    def addWatch(self, directory):
+        '''!
+        Method to watch a directory.
+
+        @param directory String: Absolute path of directory.
+        '''
+        wd = self._addWatch(self.fd, os.fsencode(directory), self.mask)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), directory)
+        self.directories[wd] = directory
+
+    def read(self, timeout):
+        '''!
+        Method to wait for file events.
+
+        @param timeout Float: Maximum number of seconds to wait.
+        @return: List of (mask, absolute path) of file events.
+        '''
+        (readable, _, _) = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return []
+        events = []
+        position = 0
+        while position + _eventHeader <= len(data):
+            (wd, mask, cookie, length) = struct.unpack_from(
+                'iIII', data, position)
+            position = position + _eventHeader
+            name = data[position:position+length].rstrip(b'\0')
+            position = position + length
+            if mask & IN_IGNORED:
+                self.directories.pop(wd, None)
+                continue
+            directory = self.directories.get(wd)
+            if mask & IN_Q_OVERFLOW or directory is None:
+                events.append((mask, None))
+            else:
+                events.append((mask, os.path.join(directory,
+                                                  os.fsdecode(name))))
+        return events
+
+    def close(self):
+        '''!
+        Method to close the inotify instance.
+        '''
+        os.close(self.fd)
+
+class DirectoryWatcher(object):
+    '''!
+    Class representing a watcher logging new and modified files under
+    a directory into SEREBO black box.
+
+    Usage:
+
+        watcher = DirectoryWatcher(sdb, 'instrument_output')
+        for result in watcher.watch():
+            print(result['Files'])
+    '''
+    def __init__(self, sdb_object, root, description='NA',
+                 backend=None, cache=None, workers=None, debounce=1.0,
+                 interval=2.0, batchsize=100, poll=False):
+        '''!
+        Initiation method.
+
+        @param sdb_object Object: SEREBO database object.
+        @param root String: Path of directory to watch (including its
+        subdirectories).
+        @param description String: Explanation string for the logged
+        files. Default = NA.
+        @param backend String: Name of hash backend. Default = None
+        (serebo12).
+        @param cache Object: File hash cache (hashcache.HashCache
+        object). Default = None (no cache).
+        @param workers Integer: Number of threads for file hashing.
+        Default = None (uses ThreadPoolExecutor default).
+        @param debounce Float: Number of seconds without change for a
+        file to be settled. Default = 1.0.
+        @param interval Float: Number of seconds between scans when
+        polling. Default = 2.0.
+        @param batchsize Integer: Maximum number of files appended to
+        the blockchain as one block. Default = 100.
+        @param poll Boolean: Flag to scan the directory instead of
+        using inotify. Default = False (inotify if available).
+        '''
+        self.sdb = sdb_object
+        self.root = serebo_api.absolutePath(root)
+        self.description = description
+        self.backend = backend
+        self.cache = cache
+        self.workers = workers
+        self.debounce = float(debounce)
+        self.interval = float(interval)
+        self.batchsize = int(batchsize)
+        self.poll = bool(poll)
+        self.running = False
+        # SEREBO black box and its sidecar files are not logged
+        self._excluded = serebo_api.absolutePath(str(sdb_object.path))
+        self._inotify = None
+        self._seen = {}
+        self._pending = {}
+        self._logged = {}
+
+    def stop(self):
+        '''!
+        Method to stop watching (from another thread or a callback),
+        after the current batch.
+        '''
+        self.running = False
+
+    def _statKey(self, absPath):
+        '''!
+        Private method - gets (size, modification time, inode) of a
+        regular file, or None if it is not a regular file.
+        '''
+        try:
+            st = os.stat(absPath)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+    def _scan(self, directory):
+        '''!
+        Private method - gets the stat keys of the files under a
+        directory (and adds inotify watches for its subdirectories).
+        '''
+        found = {}
+        for (dirpath, dirnames, filenames) in os.walk(directory):
+            if self._inotify is not None:
+                try:
+                    self._inotify.addWatch(dirpath)
+                except OSError:
+                    pass
+            for filename in filenames:
+                absPath = os.path.join(dirpath, filename)
+                if absPath.startswith(self._excluded):
+                    continue
+                key = self._statKey(absPath)
+                if key is not None:
+                    found[absPath] = key
+        return found
+
+    def _rescan(self, now):
+        '''!
+        Private method - scans the directory for files changed since
+        the last scan, which become pending.
+        '''
+        found = self._scan(self.root)
+        for absPath in found:
+            if found[absPath] != self._seen.get(absPath):
+                self._change(absPath, now, found[absPath], True)
+        self._seen = found
+
+    def _change(self, absPath, now, key, closed):
+        '''!
+        Private method - marks a file as changed (with its stat key
+        when scanned, or None for inotify events). A pending file is
+        settled once it is closed and has not changed for debounce
+        seconds.
+        '''
+        previous = self._pending.get(absPath)
+        if key is not None and previous is not None and \
+                previous[1] == key:
+            return
+        self._pending[absPath] = (now, key, closed)
+
+    def _events(self, timeout):
+        '''!
+        Private method - waits for file events (inotify) or for the
+        next scan (polling), and updates pending files.
+        '''
+        if self._inotify is None:
+            time.sleep(timeout)
+            self._rescan(time.time())
+            return
+        events = self._inotify.read(timeout)
+        now = time.time()
+        for (mask, absPath) in events:
+            if absPath is None:
+                # Queue overflow - events were lost
+                self._rescan(now)
+            elif mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may be written before the directory is
+                    # watched
+                    for (path, key) in self._scan(absPath).items():
+                        self._change(path, now, key, True)
+            elif not absPath.startswith(self._excluded):
+                closed = bool(mask & (IN_CLOSE_WRITE | IN_MOVED_TO))
+                if closed or mask & IN_MODIFY:
+                    self._change(absPath, now, None, closed)
+
+    def _settled(self, now):
+        '''!
+        Private method - takes the settled files from pending files.
+        '''
+        settled = []
+        for absPath in list(self._pending):
+            (changed, key, closed) = self._pending[absPath]
+            if now - changed < self.debounce:
+                continue
+            key = self._statKey(absPath)
+            if key is None:
+                # Deleted before settling
+                del self._pending[absPath]
+            elif closed:
+                del self._pending[absPath]
+                self._seen[absPath] = key
+                settled.append(absPath)
+        return sorted(settled)
+
+    def _hash(self, absPath):
+        '''!
+        Private method - hashes a settled file (in the hashing
+        threads), or None if the file no longer exists.
+        '''
+        try:
+            return serebo_api.fileHash(absPath, self.backend,
+                                       self.cache)
+        except OSError:
+            return None
+
+    def _append(self, hashed):
+        '''!
+        Private method - appends a batch of hashed files to the
+        blockchain as one block.
+        '''
+        descriptions = [serebo_api.fileDescription(absPath,
+                                                   self.description,
+                                                   self.backend)
+                        for (absPath, fHash) in hashed]
+        rdata = self.sdb.insertBatch([fHash for (absPath, fHash)
+                                      in hashed], descriptions, 'file')
+        for (absPath, fHash) in hashed:
+            self._logged[absPath] = fHash
+        return {'Files': [absPath for (absPath, fHash) in hashed],
+                'FileHash': [fHash for (absPath, fHash) in hashed],
+                'DataID': rdata['DataID'],
+                'BlockID': rdata['BlockID'],
+                'DateTimeStamp': rdata['DateTimeStamp']}
+
+    def watch(self, timeout=None):
+        '''!
+        Method to watch the directory and log new and modified files,
+        as a generator of logged batches. Files existing when
+        watching starts are not logged unless they are modified.
+
+        Each logged batch is a dictionary with the following keys -
+        Files (list of absolute paths of logged files), FileHash
+        (list of file hashes), DataID (list of datalog IDs), BlockID
+        and DateTimeStamp (of the block).
+
+        @param timeout Float: Number of seconds to watch. Default =
+        None (until stop() method is called).
+        @return: Generator of logged batches.
+        '''
+        if not self.poll and sys.platform.startswith('linux'):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError):
+                self._inotify = None
+        if self._inotify is None:
+            self.poll = True
+        self._seen = self._scan(self.root)
+        deadline = None if timeout is None else time.time() + timeout
+        self.running = True
+        try:
+            with ThreadPoolExecutor(self.workers) as executor:
+                while self.running:
+                    now = time.time()
+                    if deadline is not None and now >= deadline:
+                        break
+                    wait = self.interval
+                    if self._pending and not self.poll:
+                        wait = min(wait, self.debounce / 2)
+                    if deadline is not None:
+                        wait = max(0, min(wait, deadline - now))
+                    self._events(wait)
+                    settled = self._settled(time.time())
+                    hashed = [(absPath, fHash) for (absPath, fHash) in
+                              zip(settled, executor.map(self._hash,
+                                                        settled))
+                              if fHash is not None and
+                              self._logged.get(absPath) != fHash]
+                    for start in range(0, len(hashed), self.batchsize):
+                        yield self._append(
+                            hashed[start:start+self.batchsize])
+        finally:
+            self.running = False
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
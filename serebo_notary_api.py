@@ -19,14 +19,168 @@ GNU General Public License for more details.
 
 You should have received a copy of the GNU General Public License
 along with this program. If not, see <http://www.gnu.org/licenses/>.
-'''
 
+Communications with each SEREBO Notary go through a NotaryClient 
+shared within the process (see getClient()), which keeps its HTTP 
+connection alive between calls (instead of a new TCP and TLS 
+connection for each call), with a timeout for each call and retries 
+of read-only calls on network errors.
+'''
+import http.client
+import threading
+import time
+from xmlrpc.client import Fault
+from xmlrpc.client import ProtocolError
+from xmlrpc.client import SafeTransport
 from xmlrpc.client import ServerProxy
+from xmlrpc.client import Transport
+
+## Default URL for SEREBO Notary web service
+defaultNotaryURL = 'https://mauricelab.pythonanywhere.com/serebo_notary/services/call/xmlrpc'
+
+class _TimeoutTransport(Transport):
+    '''!
+    Private class - XML-RPC transport (HTTP) with a socket timeout. 
+    The HTTP connection is kept alive between calls.
+    '''
+    def __init__(self, timeout):
+        Transport.__init__(self)
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        conn = Transport.make_connection(self, host)
+        conn.timeout = self.timeout
+        return conn
+
+class _TimeoutSafeTransport(SafeTransport):
+    '''!
+    Private class - XML-RPC transport (HTTPS) with a socket timeout. 
+    The HTTPS connection is kept alive between calls.
+    '''
+    def __init__(self, timeout):
+        SafeTransport.__init__(self)
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        conn = SafeTransport.make_connection(self, host)
+        conn.timeout = self.timeout
+        return conn
+
+class NotaryClient(object):
+    '''!
+    Class representing a client of a SEREBO Notary web service, 
+    keeping its connection alive between calls. A client can be 
+    shared by multiple threads (each thread has its own connection).
+
+    Usage:
+
+        client = getClient(notaryURL)
+        value = client.call('checkBlackBoxRegistration', blackboxID, 
+                            notaryAuthorization)
+    '''
+    def __init__(self, notaryURL=defaultNotaryURL, timeout=30.0, 
+                 retries=2, backoff=0.5):
+        '''!
+        Initiation method.
+
+        @param notaryURL String: URL for SEREBO Notary web service. 
+        Default = defaultNotaryURL.
+        @param timeout Float: Number of seconds to wait for each 
+        connection or response. Default = 30.0.
+        @param retries Integer: Number of retries of a read-only call 
+        after a network error. Default = 2.
+        @param backoff Float: Number of seconds to wait before the 
+        first retry, doubled for each retry. Default = 0.5.
+        '''
+        self.notaryURL = str(notaryURL)
+        self.timeout = float(timeout)
+        self.retries = int(retries)
+        self.backoff = float(backoff)
+        self._local = threading.local()
+
+    def _proxy(self):
+        '''!
+        Private method - gets the XML-RPC proxy (and its connection) 
+        of the current thread.
+        '''
+        proxy = getattr(self._local, 'proxy', None)
+        if proxy is None:
+            if self.notaryURL.lower().startswith('https:'):
+                transport = _TimeoutSafeTransport(self.timeout)
+            else:
+                transport = _TimeoutTransport(self.timeout)
+            proxy = ServerProxy(self.notaryURL, transport=transport)
+            self._local.proxy = proxy
+        return proxy
+
+    def close(self):
+        '''!
+        Method to close the connection of the current thread (a new 
+        connection is made at the next call).
+        '''
+        proxy = getattr(self._local, 'proxy', None)
+        self._local.proxy = None
+        if proxy is not None:
+            proxy('close')()
+
+    def call(self, method, *args, **kwargs):
+        '''!
+        Method to call a SEREBO Notary web service method. A call 
+        failing with a network error (not a fault returned by SEREBO 
+        Notary) is retried on a new connection if the call is 
+        read-only.
+
+        @param method String: Name of web service method.
+        @param args: Arguments of web service method.
+        @param readonly Boolean (keyword only): Flag to allow retries 
+        - calls which change SEREBO Notary (such as registration and 
+        notarization) are not retried as they may have taken effect. 
+        Default = True.
+        @return: Value returned by web service method.
+        '''
+        readonly = kwargs.pop('readonly', True)
+        retries = self.retries if readonly else 0
+        attempt = 0
+        while True:
+            try:
+                return getattr(self._proxy(), method)(*args)
+            except Fault:
+                raise
+            except (OSError, http.client.HTTPException, 
+                    ProtocolError) as e:
+                if isinstance(e, ProtocolError) and e.errcode < 500:
+                    raise
+                self.close()
+                if attempt >= retries:
+                    raise
+                time.sleep(self.backoff * (2 ** attempt))
+                attempt = attempt + 1
+
+## NotaryClient objects shared within the process, by notary URL
+_clients = {}
+_clientsLock = threading.Lock()
+
+def getClient(notaryURL=defaultNotaryURL):
+    '''!
+    Function to get the NotaryClient of a SEREBO Notary shared within 
+    the process (created at the first call).
+
+    @param notaryURL String: URL for SEREBO Notary web service. 
+    Default = defaultNotaryURL.
+    @return: NotaryClient object.
+    '''
+    notaryURL = str(notaryURL)
+    with _clientsLock:
+        client = _clients.get(notaryURL)
+        if client is None:
+            client = NotaryClient(notaryURL)
+            _clients[notaryURL] = client
+    return client
 
 def registerBlackbox(blackboxID, owner, email, 
                      architecture, machine, node, 
                      platform, processor, 
-                     notaryURL='https://mauricelab.pythonanywhere.com/serebo_notary/services/call/xmlrpc'):
+                     notaryURL=defaultNotaryURL):
     '''!
     Function to communicate with SEREBO Notary to register SEREBO 
     Black Box with SEREBO Notary.
@@ -50,15 +204,15 @@ def registerBlackbox(blackboxID, owner, email,
     @returns: (URL of SEREBO Notary, Notary authorization code, Date 
     time stamp from SEREBO Notary)
     '''
-    serv = ServerProxy(notaryURL)
     (notaryAuthorization, dtstamp) = \
-        serv.register_blackbox(blackboxID, owner, email, 
-                               architecture, machine, node, 
-                               platform, processor)
+        getClient(notaryURL).call('register_blackbox', blackboxID, 
+                                  owner, email, architecture, 
+                                  machine, node, platform, processor, 
+                                  readonly=False)
     return (notaryURL, str(notaryAuthorization), str(dtstamp))
 
 def notarizeBB(blackboxID, notaryAuthorization, dtstampBB, codeBB,
-              notaryURL='https://mauricelab.pythonanywhere.com/serebo_notary/services/call/xmlrpc'):
+              notaryURL=defaultNotaryURL):
     '''!
     Function to communicate with SEREBO Notary to notarize SEREBO 
     Black Box with SEREBO Notary.
@@ -76,14 +230,14 @@ def notarizeBB(blackboxID, notaryAuthorization, dtstampBB, codeBB,
     Notary, Notarization code from SEREBO Notary, Cross-Signing code 
     from SEREBO Notary)
     '''
-    serv = ServerProxy(notaryURL)
     (dtstampNS, codeNS, codeCommon) = \
-        serv.notarizeSereboBB(blackboxID, notaryAuthorization, 
-                              dtstampBB, codeBB)
+        getClient(notaryURL).call('notarizeSereboBB', blackboxID, 
+                                  notaryAuthorization, dtstampBB, 
+                                  codeBB, readonly=False)
     return (notaryURL, str(dtstampNS), str(codeNS), str(codeCommon))
 
 def checkRegistration(blackboxID, notaryAuthorization, 
-                      notaryURL='https://mauricelab.pythonanywhere.com/serebo_notary/services/call/xmlrpc'):
+                      notaryURL=defaultNotaryURL):
     '''!
     Function to communicate with SEREBO Notary to check for SEREBO 
     Black Box registration record.
@@ -99,9 +253,8 @@ def checkRegistration(blackboxID, notaryAuthorization,
     is found in SEREBO Notary. False if SEREBO Black Box registration 
     is not found in SEREBO Notary.
     '''
-    serv = ServerProxy(notaryURL)
-    value = serv.checkBlackBoxRegistration(blackboxID, 
-                                           notaryAuthorization)
+    value = getClient(notaryURL).call('checkBlackBoxRegistration', 
+                                      blackboxID, notaryAuthorization)
     if value or value == 'True':
         return True
     elif not value or value == 'False':
@@ -109,7 +262,7 @@ def checkRegistration(blackboxID, notaryAuthorization,
 
 def checkNotarization(blackboxID, notaryAuthorization, 
                       BBCode, NCode, CommonCode,
-                      notaryURL='https://mauricelab.pythonanywhere.com/serebo_notary/services/call/xmlrpc'):
+                      notaryURL=defaultNotaryURL):
     '''!
     Function to communicate with SEREBO Notary to check for SEREBO 
     Black Box notarization record.
@@ -128,10 +281,9 @@ def checkNotarization(blackboxID, notaryAuthorization,
     is found in SEREBO Notary. False if SEREBO Black Box notarization 
     is not found in SEREBO Notary.
     '''
-    serv = ServerProxy(notaryURL)
-    value = serv.checkNotarizeSereboBB(blackboxID, 
-                                       notaryAuthorization, 
-                                       BBCode, NCode, CommonCode)
+    value = getClient(notaryURL).call('checkNotarizeSereboBB', 
+                                      blackboxID, notaryAuthorization, 
+                                      BBCode, NCode, CommonCode)
     if value or value == 'True':
         return 'True'
     elif not value or value == 'False':
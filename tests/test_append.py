@@ -0,0 +1,73 @@
+'''!
+Append mode of file logging - a file which has only been appended to
+is logged as extending its previous record, with the same file hash
+as hashing the whole file.
+'''
+import os
+
+import pytest
+
+import serebo_blackbox as bb
+from serebo_blackbox import chunks
+from serebo_blackbox import fileindex
+
+chunksize = 1024
+
+def _append(path, size):
+    '''!
+    Private function - appends random bytes to a file.
+    '''
+    with open(path, 'ab') as f:
+        f.write(os.urandom(size))
+
+@pytest.fixture
+def loggedFile(tmp_path):
+    '''!
+    Fixture - SEREBO black box with a file logged in chunked mode.
+    '''
+    db = bb.connectDB(str(tmp_path / 'blackbox.sdb'))
+    path = str(tmp_path / 'instrument.log')
+    _append(path, chunksize * 3 + 200)
+    bb.logFile(db, path, 'Instrument log', 'blake2b',
+               chunksize=chunksize)
+    fileindex.updateIndex(db)
+    previousID = fileindex.lookupFile(db, path)['ID']
+    yield (db, path, previousID)
+    db.close()
+
+def test_append(loggedFile):
+    (db, path, previousID) = loggedFile
+    _append(path, chunksize * 2 + 50)
+    rdata = bb.logFile(db, path, 'Instrument log', append=True)
+    assert rdata['Extends'] == previousID
+    assert 'Extends :> %s' % previousID in rdata['UserDescription']
+    # Same hash backend and chunk size as the previous record
+    (fHash, chunklist) = chunks.chunkFile(path, 'blake2b', chunksize)
+    assert rdata['Data'] == fHash
+    assert chunks.loadChunks(db, fHash) == chunklist
+    fileindex.updateIndex(db)
+    newID = fileindex.lookupFile(db, path)['ID']
+    assert bb.verifyFile(db, newID)['Verified']
+
+def test_append_changed(loggedFile):
+    (db, path, previousID) = loggedFile
+    # The last logged chunk is changed - the file is hashed in full
+    with open(path, 'r+b') as f:
+        f.seek(chunksize * 3 + 10)
+        f.write(b'changed')
+    _append(path, 100)
+    rdata = bb.logFile(db, path, 'Instrument log', append=True)
+    assert rdata['Extends'] is None
+    assert 'Extends' not in rdata['UserDescription']
+    assert rdata['Data'] == chunks.chunkFile(path, 'blake2b',
+                                             chunksize)[0]
+
+def test_append_first(tmp_path):
+    db = bb.connectDB(str(tmp_path / 'blackbox.sdb'))
+    path = str(tmp_path / 'instrument.log')
+    _append(path, 5000)
+    rdata = bb.logFile(db, path, append=True)
+    assert rdata['Extends'] is None
+    assert rdata['Data'] == \
+        chunks.chunkFile(path, None, chunks.defaultChunkSize)[0]
+    db.close()
@@ -0,0 +1,87 @@
+'''!
+Regression run of the audits on a SEREBO black box written by the
+directory watcher - the watcher appends files as Merkle batches (one
+block for each batch), between records inserted one block each.
+'''
+import os
+
+import pytest
+
+import serebo_blackbox as bb
+from serebo_blackbox import audit
+from serebo_blackbox import watcher
+
+audits = [audit.auditTimestamps, audit.auditDatahash,
+          audit.auditDataBlockchain, audit.auditBlockchainHash,
+          audit.auditBlockchainFlow, audit.auditMerkle]
+
+def _writeFiles(directory, count):
+    '''!
+    Private function - writes files into the watched directory.
+    '''
+    for n in range(count):
+        with open(os.path.join(directory, 'data%s.txt' % n), 'w') as f:
+            f.write('instrument reading %s' % n)
+
+@pytest.fixture(scope='module', params=[1, 2])
+def watchedBox(request, tmp_path_factory):
+    '''!
+    Fixture - SEREBO black box (in storage version 1 or 2) with
+    records inserted before, between and after the watcher batches.
+    '''
+    tmp_path = tmp_path_factory.mktemp('storage%s' % request.param)
+    directory = tmp_path / 'watched'
+    directory.mkdir()
+    db = bb.connectDB(str(tmp_path / 'blackbox.sdb'),
+                      storage=request.param)
+    for n in range(3):
+        bb.insertText(db, 'before %s' % n, 'text')
+    # The watcher steps are driven with explicit times (as in
+    # DirectoryWatcher.watch()), so that the batches do not depend on
+    # the timing of the test run
+    dw = watcher.DirectoryWatcher(db, str(directory), batchsize=4,
+                                  debounce=1.0, poll=True)
+    dw._seen = dw._scan(dw.root)
+    _writeFiles(str(directory), 7)
+    dw._rescan(100.0)
+    assert dw._settled(100.5) == []
+    settled = dw._settled(101.0)
+    hashed = [(absPath, dw._hash(absPath)) for absPath in settled]
+    batches = [dw._append(hashed[start:start+4])
+               for start in range(0, len(hashed), 4)]
+    for n in range(2):
+        bb.insertText(db, 'after %s' % n, 'text')
+    yield (db, batches)
+    db.close()
+
+def test_watcher_batches(watchedBox):
+    (db, batches) = watchedBox
+    assert [len(batch['Files']) for batch in batches] == [4, 3]
+    assert [batch['DataID'] for batch in batches] == \
+        [[4, 5, 6, 7], [8, 9, 10]]
+
+@pytest.mark.parametrize('function', audits)
+def test_audits(watchedBox, function):
+    (db, batches) = watchedBox
+    results = audit.summarize(function(db))
+    assert results['Errors'] == []
+    assert results['Verified'] > 0
+
+def test_audit_counts(watchedBox):
+    (db, batches) = watchedBox
+    counts = audit.countRecords(db)
+    assert counts['Datalog'] == 12
+    assert counts['Blockchain'] == counts['Datalog']
+    assert counts['Blocks'] == 7
+    assert counts['StatsDatalog'] == counts['Datalog']
+    assert counts['StatsBlockchain'] == counts['Blocks']
+
+def test_scoped_audits(watchedBox):
+    (db, batches) = watchedBox
+    # Scoped to start and end within the first batch
+    (from_id, to_id) = (2, batches[0]['DataID'][-1] + 1)
+    counts = audit.countRecords(db, from_id, to_id)
+    assert counts['Blockchain'] == counts['Datalog'] == to_id - 1
+    results = audit.summarize(audit.auditDataBlockchain(db, from_id,
+                                                        to_id))
+    assert results == {'Verified': to_id - 1, 'Errors': []}
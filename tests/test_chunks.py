@@ -0,0 +1,70 @@
+'''!
+Chunked file hashing - verification by chunks locates the first
+changed chunk of a file.
+'''
+import os
+
+import pytest
+
+from serebo_blackbox import chunks
+
+chunksize = 1024
+
+@pytest.fixture
+def chunkedFile(tmp_path):
+    '''!
+    Fixture - file of 10 chunks (the last chunk is partial), with its
+    chunked file hash and chunks.
+    '''
+    path = str(tmp_path / 'instrument.raw')
+    with open(path, 'wb') as f:
+        f.write(os.urandom(chunksize * 9 + 100))
+    (fHash, chunklist) = chunks.chunkFile(path, 'blake2b', chunksize,
+                                          workers=4)
+    return (path, fHash, chunklist)
+
+def _overwrite(path, offset):
+    '''!
+    Private function - changes a byte of a file at offset.
+    '''
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        byte = f.read(1)
+        f.seek(offset)
+        f.write(bytes([byte[0] ^ 0xff]))
+
+def test_chunkFile(chunkedFile):
+    (path, fHash, chunklist) = chunkedFile
+    assert chunks.isChunked(fHash)
+    assert chunks.parseChunked(fHash)[0:2] == ('blake2b', chunksize)
+    assert [(offset, length) for (offset, length, digest)
+            in chunklist] == \
+        [(n * chunksize, chunksize) for n in range(9)] + \
+        [(9 * chunksize, 100)]
+    assert chunks.chunkFile(path, 'blake2b', chunksize,
+                            workers=1) == (fHash, chunklist)
+
+def test_verify_unchanged(chunkedFile):
+    (path, fHash, chunklist) = chunkedFile
+    result = chunks.verifyChunks(path, fHash, chunklist, workers=4)
+    assert result['Verified']
+    assert result['BadChunk'] is None
+    assert result['ChunksChecked'] == 10
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_verify_first_bad_chunk(chunkedFile, workers):
+    (path, fHash, chunklist) = chunkedFile
+    _overwrite(path, 7 * chunksize + 5)
+    _overwrite(path, 3 * chunksize + 10)
+    result = chunks.verifyChunks(path, fHash, chunklist, workers)
+    assert not result['Verified']
+    assert result['BadChunk'] == (3, 3 * chunksize, chunksize)
+
+def test_verify_truncated(chunkedFile):
+    (path, fHash, chunklist) = chunkedFile
+    with open(path, 'r+b') as f:
+        f.truncate(5 * chunksize)
+    result = chunks.verifyChunks(path, fHash, chunklist)
+    assert not result['Verified']
+    assert result['BadChunk'] == (None, 5 * chunksize, None)
+    assert result['ChunksChecked'] == 5
@@ -0,0 +1,62 @@
+'''!
+Durability of data insertion events - Durable events are only given
+in group commit mode, and are set (without error) once the data
+insertion events are committed.
+'''
+import threading
+
+import serebo_blackbox as bb
+from serebo_blackbox import audit
+from serebo_blackbox.sereboDB import Durable
+
+def test_no_durable_without_group_commit(tmp_path):
+    db = bb.connectDB(str(tmp_path / 'blackbox.sdb'))
+    rdata = bb.insertText(db, 'reading', 'text')
+    assert 'Durable' not in rdata
+    rdata = bb.insertBatch(db, ['a', 'b', 'c'], 'batch')
+    assert 'Durable' not in rdata
+    db.close()
+
+def test_group_commit(tmp_path):
+    db = bb.connectDB(str(tmp_path / 'blackbox.sdb'), commit_size=4,
+                      commit_interval=60000)
+    results = [bb.insertText(db, 'reading %s' % n, 'text')
+               for n in range(3)]
+    results.append(bb.insertBatch(db, ['a', 'b', 'c'], 'batch'))
+    results.append(bb.insertText(db, 'reading 3', 'text'))
+    durables = [rdata['Durable'] for rdata in results]
+    assert all(isinstance(durable, Durable) for durable in durables)
+    # The fourth insert fills the group, which is committed together
+    assert [durable.is_set() for durable in durables] == \
+        [True, True, True, True, False]
+    db.flush()
+    assert all(durable.is_set() for durable in durables)
+    assert all(durable.error is None for durable in durables)
+    db.close()
+    db = bb.connectDB(str(tmp_path / 'blackbox.sdb'))
+    assert audit.countRecords(db)['Datalog'] == 7
+    db.close()
+
+def test_threadsafe_group_commit(tmp_path):
+    db = bb.connectDB(str(tmp_path / 'blackbox.sdb'), commit_size=16,
+                      commit_interval=50, threadsafe=True)
+    results = []
+    def insert(thread):
+        for n in range(10):
+            results.append(bb.insertText(db, 'thread %s reading %s' %
+                                         (thread, n), 'text'))
+    threads = [threading.Thread(target=insert, args=(thread,))
+               for thread in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    durables = [rdata['Durable'] for rdata in results]
+    assert len(durables) == 80
+    assert all(durable.wait(5) for durable in durables)
+    assert all(durable.error is None for durable in durables)
+    db.close()
+    db = bb.connectDB(str(tmp_path / 'blackbox.sdb'))
+    assert audit.countRecords(db)['Datalog'] == 80
+    assert audit.summarize(audit.auditBlockchainFlow(db))['Errors'] == []
+    db.close()
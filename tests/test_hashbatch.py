@@ -0,0 +1,29 @@
+'''!
+Batch hashing - each hash from hashBatch() is identical to that of
+SereboDB.hash() for the same data, whether hashed in the calling
+process or by a pool of processes.
+'''
+import pytest
+
+import serebo_blackbox as bb
+
+payloads = ['reading %s' % n for n in range(20)] + \
+           [b'\x00\x01binary', 'température 25°C', '測定値', 42, '']
+
+@pytest.fixture(scope='module')
+def db(tmp_path_factory):
+    db = bb.connectDB(str(tmp_path_factory.mktemp('hashbatch') /
+                          'blackbox.sdb'))
+    yield db
+    db.close()
+
+def test_hashBatch(db):
+    assert bb.hashBatch(payloads) == [db.hash(x) for x in payloads]
+
+def test_hashBatch_workers(db):
+    assert bb.hashBatch(payloads, workers=2, chunksize=4) == \
+        [db.hash(x) for x in payloads]
+
+def test_hashBatch_empty():
+    assert bb.hashBatch([]) == []
+    assert bb.hashBatch([], workers=2) == []
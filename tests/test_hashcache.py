@@ -0,0 +1,64 @@
+'''!
+File hash cache - cached hashes are used for unchanged files, and
+files modified within the racy window are not cached.
+'''
+import os
+import time
+
+import serebo_blackbox as bb
+from serebo_blackbox import hashcache
+
+def _writeFile(path, text, age):
+    '''!
+    Private function - writes a file, last modified age seconds ago.
+    '''
+    with open(path, 'w') as f:
+        f.write(text)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+def test_hit_and_miss(tmp_path):
+    cache = bb.HashCache(hashcache.defaultCachePath(str(tmp_path /
+                                                        'blackbox.sdb')))
+    path = str(tmp_path / 'data.csv')
+    _writeFile(path, 'instrument reading 1', 60)
+    fHash = bb.fileHash(path)
+    assert cache.fileHash(path) == fHash
+    assert cache.fileHash(path) == fHash
+    assert cache.lookup(path) == fHash
+    stats = cache.stats()
+    assert (stats['Hits'], stats['Misses'], stats['Stored']) == (1, 1, 1)
+    assert stats['BytesSkipped'] == os.path.getsize(path)
+    # A changed file has a different key, and is hashed again
+    _writeFile(path, 'instrument reading 2', 30)
+    assert cache.lookup(path) is None
+    assert cache.fileHash(path) == bb.fileHash(path) != fHash
+    assert cache.stats()['Misses'] == 2
+    assert cache.prune() == 1
+    cache.close()
+
+def test_rehash(tmp_path):
+    cache = bb.HashCache(str(tmp_path / 'hashcache'))
+    path = str(tmp_path / 'data.csv')
+    _writeFile(path, 'instrument reading', 60)
+    cache.fileHash(path)
+    cache.fileHash(path, rehash=True)
+    stats = cache.stats()
+    assert (stats['Hits'], stats['Misses'], stats['Entries']) == (0, 2, 1)
+    cache.close()
+
+def test_racy_window(tmp_path):
+    cache = bb.HashCache(str(tmp_path / 'hashcache'), racywindow=2.0)
+    path = str(tmp_path / 'data.csv')
+    # Modified just before hashing - the hash is not cached
+    _writeFile(path, 'instrument reading', 0)
+    fHash = cache.fileHash(path)
+    assert cache.lookup(path) is None
+    assert cache.fileHash(path) == fHash
+    stats = cache.stats()
+    assert (stats['Hits'], stats['Misses'], stats['Stored']) == (0, 2, 0)
+    # Once outside the racy window, the hash is cached
+    _writeFile(path, 'instrument reading', 5)
+    assert cache.fileHash(path) == fHash
+    assert cache.lookup(path) == fHash
+    cache.close()
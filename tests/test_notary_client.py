@@ -0,0 +1,86 @@
+'''!
+SEREBO Notary client - read-only calls are retried after network
+errors and server errors, and calls which change SEREBO Notary are
+never retried.
+'''
+from xmlrpc.client import Fault
+from xmlrpc.client import ProtocolError
+
+import pytest
+
+import serebo_notary_api
+
+class _StubTransport(object):
+    '''!
+    Private class - XML-RPC transport giving scripted responses (a
+    value, or an exception to raise) instead of connecting.
+    '''
+    ## Scripted responses, shared by all connections
+    responses = []
+    ## Names of the web service methods called
+    calls = []
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+
+    def request(self, host, handler, request_body, verbose=False):
+        method = request_body.split(b'<methodName>')[1]
+        _StubTransport.calls.append(method.split(b'<')[0].decode())
+        response = _StubTransport.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return (response,)
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(serebo_notary_api, '_TimeoutTransport',
+                        _StubTransport)
+    _StubTransport.responses = []
+    _StubTransport.calls = []
+    return serebo_notary_api.NotaryClient('http://notary.invalid/xmlrpc',
+                                          retries=2, backoff=0)
+
+def _serverError(errcode=503):
+    return ProtocolError('notary.invalid/xmlrpc', errcode,
+                         'Service Unavailable', {})
+
+def test_call(client):
+    _StubTransport.responses = ['registered']
+    assert client.call('checkBlackBoxRegistration', 'ID', 'code') == \
+        'registered'
+    assert _StubTransport.calls == ['checkBlackBoxRegistration']
+
+def test_retry_server_error(client):
+    _StubTransport.responses = [_serverError(), ConnectionResetError(),
+                                'registered']
+    assert client.call('checkBlackBoxRegistration', 'ID', 'code') == \
+        'registered'
+    assert len(_StubTransport.calls) == 3
+
+def test_retries_exhausted(client):
+    _StubTransport.responses = [_serverError()] * 3
+    with pytest.raises(ProtocolError):
+        client.call('checkBlackBoxRegistration', 'ID', 'code')
+    assert len(_StubTransport.calls) == 3
+
+def test_no_retry_client_error(client):
+    _StubTransport.responses = [_serverError(404), 'registered']
+    with pytest.raises(ProtocolError):
+        client.call('checkBlackBoxRegistration', 'ID', 'code')
+    assert len(_StubTransport.calls) == 1
+
+def test_no_retry_fault(client):
+    _StubTransport.responses = [Fault(1, 'Not registered'), 'registered']
+    with pytest.raises(Fault):
+        client.call('checkBlackBoxRegistration', 'ID', 'code')
+    assert len(_StubTransport.calls) == 1
+
+@pytest.mark.parametrize('error', [_serverError(), ConnectionResetError()])
+def test_no_retry_not_readonly(client, error):
+    _StubTransport.responses = [error, 'notarized']
+    with pytest.raises(type(error)):
+        client.call('notarizeBlackBox', 'ID', 'code', readonly=False)
+    assert _StubTransport.calls == ['notarizeBlackBox']